@@ -4,9 +4,20 @@
 MODULES_LIST = [
     'liprojekt',
     'liprojekt.conversion',
+    'liprojekt.conversion.branching',
+    'liprojekt.conversion.cache',
+    'liprojekt.conversion.cdcl',
     'liprojekt.conversion.clauses',
+    'liprojekt.conversion.cnf',
+    'liprojekt.conversion.dimacs',
     'liprojekt.conversion.formatting',
     'liprojekt.conversion.formulas',
+    'liprojekt.conversion.literals',
+    'liprojekt.conversion.parallel',
+    'liprojekt.conversion.persistent',
+    'liprojekt.conversion.serialization',
+    'liprojekt.conversion.solvers',
+    'liprojekt.conversion.transposition',
     'liprojekt.conversion.verification',
     'liprojekt.interface',
     'liprojekt.interface.interface',
@@ -14,6 +25,8 @@ MODULES_LIST = [
     'liprojekt.parsing.alphabets',
     'liprojekt.parsing.myparsing',
     'liprojekt.parsing.parsers',
+    'liprojekt.parsing.pratt',
+    'liprojekt.parsing.streams',
     'liprojekt.tests',
     'liprojekt.tests.tests',
 ]
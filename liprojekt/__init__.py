@@ -13,17 +13,30 @@ logicznja jest tautologią
 Ad 1.
     liprojekt/
     ├── conversion
+    │   ├── branching.py
+    │   ├── cache.py
+    │   ├── cdcl.py
     │   ├── clauses.py
+    │   ├── cnf.py
+    │   ├── dimacs.py
     │   ├── formatting.py
     │   ├── formulas.py
+    │   ├── literals.py
+    │   ├── parallel.py
+    │   ├── persistent.py
     │   ├── recording.py
+    │   ├── serialization.py
+    │   ├── solvers.py
+    │   ├── transposition.py
     │   └── verification.py
     ├── interface
     │   └── interface.py
     ├── parsing
     │   ├── alphabets.py
     │   ├── myparsing.py
-    │   └── parsers.py
+    │   ├── parsers.py
+    │   ├── pratt.py
+    │   └── streams.py
     └── tests
         └── tests.py
 
@@ -38,10 +51,31 @@ Ad 2.
     * Aby przetestować program dostępną paczką testów, należy uruchomić program
       z parametrem test
       `liprojekt test` 
+    
+    * Aby zweryfikować wiele formuł z jednego pliku (domyślnie jedna formuła
+      w linii), należy uruchomić program z opcją -b, wynik każdej formuły
+      wypisywany jest w osobnej linii
+      `liprojekt -b formuly.txt`
+    
+    * Powtarzające się podformuły można nazwać definicją poprzedzającą formułę
+      (składnia definicji opisana jest w legendzie, opcja -l), nazwa oznacza
+      w dalszej części tekstu zdefiniowaną formułę
+      `liprojekt -a WORD -f "let x be p and q in x imp (x or r)"`
+      Duże formuły i klauzule drzewa konwersji (opcja -t) wypisywane są
+      z definicjami wspólnych podformuł, natomiast komunikaty DEBUG (opcja -d)
+      wypisują podformuły klauzul rozwinięte do drzewa, więc dla formuł
+      z wieloma zagnieżdżonymi definicjami mogą być bardzo długie.
       
-    usage: LIProjekt [-h] (-f FORMULA | -i INPUT | -l [{DEFAULT,WORD,SYMBOLIC}])
-                     [-a {DEFAULT,WORD,SYMBOLIC}] [-o OUTPUT | -O OUTPUT]
-                     [-g GRAPH | -t] [-v] [-d] [--log LOG]
+    usage: LIProjekt [-h]
+                     (-f FORMULA | -i INPUT | -b BATCH | -D DIMACS | -l [{DEFAULT,WORD,SYMBOLIC}])
+                     [-a {DEFAULT,WORD,SYMBOLIC}] [-e {TREE,DPLL,CDCL}]
+                     [-c {TREE,TSEITIN,PG}] [--strategy {BFS,DFS}]
+                     [--branching {ORDER,SIMPLE,SMALLEST,FREQUENT}]
+                     [--transpositions TRANSPOSITIONS] [-j JOBS]
+                     [-w WORKERS] [--cache [CACHE]] [--cache-size CACHE_SIZE]
+                     [--write-dimacs WRITE_DIMACS] [--write-binary WRITE_BINARY]
+                     [--separator SEPARATOR] [-s]
+                     [-o OUTPUT | -O OUTPUT] [-g GRAPH | -t] [-v] [-d] [--log LOG]
     
     optional arguments:
       -h, --help            show this help message and exit
@@ -49,7 +83,16 @@ Ad 2.
                             formuła do weryfikacji (jezeli zawiera spacje nalezy
                             umiescic ja w "") (default: None)
       -i INPUT, --input INPUT
-                            nazwa pliku z formula do weryfikacji (default: None)
+                            nazwa pliku z formula do weryfikacji (tekst albo
+                            format binarny z opcji --write-binary) (default: None)
+      -b BATCH, --batch BATCH
+                            nazwa pliku z wieloma formulami do weryfikacji, kazda
+                            weryfikowana jest osobno (`-` -> standardowe wejscie)
+                            (default: None)
+      -D DIMACS, --dimacs DIMACS
+                            nazwa pliku z formula w postaci CNF w formacie DIMACS
+                            (weryfikowana silnikiem SAT, przy -e TREE silnikiem
+                            CDCL) (default: None)
       -l [{DEFAULT,WORD,SYMBOLIC}], --legend [{DEFAULT,WORD,SYMBOLIC}]
                             legenda znakow alfabetu (default: None)
       -o OUTPUT, --output OUTPUT
@@ -69,6 +112,58 @@ Ad 2.
       -a {DEFAULT,WORD,SYMBOLIC}, --alphabet {DEFAULT,WORD,SYMBOLIC}
                             zestaw znaków na do reprezentowania formuł
                             logicznych (default: DEFAULT)
+      -e {TREE,DPLL,CDCL}, --engine {TREE,DPLL,CDCL}
+                            silnik weryfikacji: TREE -> drzewo konwersji, DPLL,
+                            CDCL -> silnik SAT na postaci CNF formuły (default:
+                            TREE)
+      -c {TREE,TSEITIN,PG}, --cnf {TREE,TSEITIN,PG}
+                            kodowanie CNF dla silnika SAT: TREE -> drzewo
+                            konwersji (rownowazna, wykladnicza), TSEITIN, PG ->
+                            kodowanie Tseitina / Plaisted-Greenbaum (liniowe)
+                            (default: TSEITIN)
+      --strategy {BFS,DFS}  kolejnosc rozwijania drzewa konwersji: BFS -> wszerz,
+                            DFS -> w glab (pamiec proporcjonalna do glebokosci
+                            drzewa) (default: BFS)
+      --branching {ORDER,SIMPLE,SMALLEST,FREQUENT}
+                            kolejnosc rozwijania podformul w drzewie konwersji:
+                            ORDER -> kolejnosc z formuly, SIMPLE -> najpierw
+                            podformuly nierozbijajace, SMALLEST -> najpierw
+                            najmniejsze, FREQUENT -> najpierw z najczestsza
+                            zmienna (default: ORDER)
+      --transpositions TRANSPOSITIONS
+                            maksymalna ilosc stanow klauzul w tablicy transpozycji
+                            drzewa konwersji (klauzula o stanie juz rozwijanym nie
+                            jest rozwijana ponownie), 0 -> bez tablicy (default:
+                            65536)
+      -j JOBS, --jobs JOBS  ilosc procesow, przy wiecej niz 1 spelnialnosc i
+                            tautologia sprawdzane sa rownolegle, domyslnie
+                            rownolegle tylko duze formuly (default: None)
+      -w WORKERS, --workers WORKERS
+                            ilosc procesow rownolegle rozwijajacych drzewo
+                            konwersji (bez zapisu drzewa, nie dziala z -t)
+                            (default: None)
+      --cache [CACHE]       plik pamieci podrecznej wynikow weryfikacji (formuly
+                            rozniace sie nazwami zmiennych i kolejnoscia
+                            argumentow operacji przemiennych nie sa weryfikowane
+                            ponownie) (default: None, bez nazwy pliku:
+                            ~/.liprojekt_cache.db)
+      --cache-size CACHE_SIZE
+                            maksymalna ilosc wpisow w pamieci podrecznej
+                            (default: 10000)
+      --write-dimacs WRITE_DIMACS
+                            zapisz postac CNF formuly (kodowanie z opcji -c) do
+                            pliku w formacie DIMACS zamiast weryfikowac formule
+                            (default: None)
+      --write-binary WRITE_BINARY
+                            zapisz formule do pliku w formacie binarnym (wczytywany
+                            opcja -i bez parsowania) zamiast weryfikowac formule
+                            (default: None)
+      --separator SEPARATOR
+                            separator formul w pliku z opcja -b (sekwencje \\n, \\t
+                            sa rozwijane) (default: \\n)
+      -s, --simplify        upraszczaj formule podczas parsowania (stale, podwojne
+                            negacje, powtorzone argumenty, x & ~x), raport
+                            zawiera tez formule wejsciowa (default: False)
     
       -v, --verbose         czy wypisywac dodatkowe informacje podczas dzialania
                             programu (default: False)
@@ -0,0 +1,139 @@
+# -*- coding: utf-8 -*-
+'''
+Moduł zawiera polityki wyboru podformuły rozwijanej w kolejnym kroku konwersji
+półproduktu clauses.Clause (Clause.convertStep).
+
+Bez polityki rozwijana jest podformuła ze szczytu stosu podformuł nieprzerobionych,
+czyli w kolejności w jakiej powstały z formuły. Polityka przegląda najwyżej WINDOW
+podformuł ze szczytu stosu i wybiera tę o najmniejszej ocenie. Podformuły, które
+nie rozbijają Clause (ocena 0), wybierane są zawsze przed rozbijającymi, więc
+Clause rozbijana jest jak najpóźniej, gdy ma już najwięcej literałów
+(patrz propagacja w Clause._split).
+
+* BranchingPolicy             -> najpierw podformuły nierozbijające, potem w kolejności
+* SmallestFirstPolicy         -> najpierw najmniejsza podformuła rozbijająca
+* FrequentVariableFirstPolicy -> najpierw podformuła rozbijająca z najczęstszą zmienną
+'''
+
+from itertools import islice
+
+from liprojekt.conversion.formulas import LogicVariable
+
+
+class BranchingPolicy(object):
+    '''
+    Polityka wyboru podformuły: najpierw podformuły nierozbijające Clause
+
+    Podformuły rozbijające wybierane są w kolejności ze stosu. Klasy pochodne
+    oceniają podformuły rozbijające metodą _score.
+    '''
+
+    NAME = 'SIMPLE'
+
+    WINDOW = 32
+    '''
+    ilość podformuł ze szczytu stosu przeglądanych przy wyborze
+    '''
+
+    def __init__(self, formula):
+        '''
+        formula to weryfikowana formuła (formulas.Formula), polityka tworzona
+        jest raz na weryfikację
+        '''
+        self.formula = formula
+
+    def select(self, clause):
+        '''
+        zwróć parę (wybrana podformuła, stos pozostałych podformuł nieprzerobionych
+        Clause clause), dla pustego stosu rzucany jest IndexError
+        '''
+        best, bestScore = 0, None
+        for index, formula in enumerate(islice(clause.uncFormulas, self.WINDOW)):
+            simple = formula.makeSimple()
+            if simple.__class__ is clause.BRANCHING:
+                score = self._score(simple)
+            else:
+                score = 0
+            if bestScore is None or score < bestScore:
+                best, bestScore = index, score
+                if score == 0:
+                    break
+        return clause.uncFormulas.take(best)
+
+    def _score(self, formula):
+        '''
+        ocena podformuły rozbijającej Clause, większa od 0 (mniejsza wybierana
+        jest wcześniej)
+        '''
+        return 1
+
+
+class SmallestFirstPolicy(BranchingPolicy):
+    '''
+    Polityka wyboru podformuły: najpierw najmniejsza podformuła rozbijająca
+
+    Rozmiar to ilość węzłów podformuły rozwiniętej do drzewa, liczona raz
+    dla każdego węzła DAG.
+    '''
+
+    NAME = 'SMALLEST'
+
+    def __init__(self, formula):
+        super(SmallestFirstPolicy, self).__init__(formula)
+        self.__sizes = {}
+
+    def _score(self, formula):
+        sizes = self.__sizes
+        stack = [formula]
+        while stack:
+            node = stack[-1]
+            if node in sizes:
+                stack.pop()
+                continue
+            pending = [f for f in node.subformulas if f not in sizes]
+            if pending:
+                stack.extend(pending)
+                continue
+            stack.pop()
+            sizes[node] = 1 + sum(sizes[f] for f in node.subformulas)
+        return sizes[formula]
+
+
+class FrequentVariableFirstPolicy(BranchingPolicy):
+    '''
+    Polityka wyboru podformuły: najpierw podformuła rozbijająca, której operandem
+    jest literał najczęstszej zmiennej
+
+    Częstość zmiennej to ilość jej wystąpień w weryfikowanej formule (liczona raz).
+    Wartości najczęstszych zmiennych ustalane są w ten sposób najwcześniej,
+    więc propagacja odcina najwięcej gałęzi.
+    '''
+
+    NAME = 'FREQUENT'
+
+    def __init__(self, formula):
+        super(FrequentVariableFirstPolicy, self).__init__(formula)
+        self.__scores = {}
+        self.__counts = {}
+        visited = set()
+        stack = [formula]
+        while stack:
+            node = stack.pop()
+            if node.__class__ is LogicVariable:
+                self.__counts[node.name] = self.__counts.get(node.name, 0) + 1
+            if node in visited:
+                continue
+            visited.add(node)
+            stack.extend(node.subformulas)
+
+    def _score(self, formula):
+        try:
+            return self.__scores[formula]
+        except KeyError:
+            count = 0
+            for operand in formula.subformulas:
+                operand = operand.makeSimple()
+                if operand.__class__ is LogicVariable:
+                    count = max(count, self.__counts.get(operand.name, 0))
+            score = self.__scores[formula] = 1.0 / (1 + count)
+            return score
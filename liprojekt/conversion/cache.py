@@ -0,0 +1,350 @@
+# -*- coding: utf-8 -*-
+'''
+Moduł zawiera trwałą (zapisywaną na dysku) pamięć podręczną wyników weryfikacji.
+
+Wyniki zapamiętywane są pod odciskiem (fingerprint) postaci kanonicznej formuły:
+* argumenty operacji przemiennych (AND, OR, EQU) są sortowane
+* zmienne są przemianowywane w kolejności pierwszego wystąpienia
+
+Dzięki temu formuły różniące się tylko nazwami zmiennych lub kolejnością
+argumentów operacji przemiennych mają ten sam odcisk. Razem z wynikiem
+zapamiętywane są wartościowania-świadkowie (spełniające formułę i falsyfikujące
+formułę), które przy odczycie są sprawdzane na formule (Formula.evaluate).
+
+Pamięć przechowywana jest w bazie sqlite3, ilość wpisów jest ograniczona,
+przy przepełnieniu usuwane są najdawniej używane wpisy (LRU).
+'''
+
+import os
+import hashlib
+import logging
+import sqlite3
+
+from liprojekt.conversion.formulas import LogicTruth, LogicFalse, LogicVariable, \
+    NotOperation, AndOperation, OrOperation, EquivalenceOperation, ImplicationOperation
+from liprojekt.conversion.verification import SatisfiabilityVerifier, ValidityVerifier
+
+
+OPERATORS = {
+    LogicTruth:             'T',
+    LogicFalse:             'F',
+    LogicVariable:          'v',
+    NotOperation:           '~',
+    AndOperation:           '&',
+    OrOperation:            '|',
+    EquivalenceOperation:   '=',
+    ImplicationOperation:   '>'
+}
+
+COMMUTATIVE = (AndOperation, OrOperation, EquivalenceOperation)
+
+REFINE_ROUNDS = 2
+'''
+ile razy klucze zmiennych są uściślane kontekstem ich wystąpień
+'''
+
+
+def _digest(*parts):
+    return hashlib.sha1(" ".join(parts)).hexdigest()
+
+def _postOrder(formula):
+    '''
+    węzły DAG formuły, każdy raz, podformuły przed formułami (bez rekurencji)
+    '''
+    order = []
+    visited = set()
+    stack = [(formula, False)]
+    while stack:
+        node, expanded = stack.pop()
+        if expanded:
+            order.append(node)
+            continue
+        if node in visited:
+            continue
+        visited.add(node)
+        stack.append((node, True))
+        stack.extend((f, False) for f in node.subformulas if f not in visited)
+    return order
+
+def _digests(order, variableKey):
+    '''
+    odciski węzłów formuły, argumenty operacji przemiennych są sortowane
+
+    variableKey(lvar) to część odcisku zmiennej (formulas.LogicVariable)
+    '''
+    digests = {}
+    for node in order:
+        nodeClass = node.__class__
+        if nodeClass is LogicVariable:
+            parts = [variableKey(node), '-' if node.isNegated else '+']
+        else:
+            parts = [digests[f] for f in node.subformulas]
+            if nodeClass in COMMUTATIVE:
+                parts.sort()
+        digests[node] = _digest(OPERATORS[nodeClass], *parts)
+    return digests
+
+def _refinedKeys(order, shapes):
+    '''
+    klucze zmiennych: odcisk posortowanych odcisków węzłów zawierających zmienną
+    '''
+    contexts = {}
+    for node in order:
+        if node.__class__ is LogicVariable:
+            contexts.setdefault(node.name, [])
+        for f in node.subformulas:
+            if f.__class__ is LogicVariable:
+                contexts.setdefault(f.name, []).append(shapes[node] + shapes[f])
+    return dict((name, _digest('v', *sorted(context)))
+                for name, context in contexts.iteritems())
+
+def fingerprint(formula):
+    '''
+    odcisk postaci kanonicznej formuły
+
+    Zwraca parę (odcisk, lista nazw zmiennych w kolejności kanonicznej).
+
+    1) liczone są odciski kształtu węzłów (bez nazw zmiennych), zmienne
+       rozróżniane są po kształtach węzłów, w których występują (REFINE_ROUNDS razy)
+    2) formuła przechodzona jest w głąb, argumenty operacji przemiennych
+       w kolejności odcisków kształtu, zmienne numerowane są w kolejności
+       pierwszego wystąpienia
+    3) liczony jest odcisk formuły z numerami zmiennych zamiast nazw
+
+    Formuły o tym samym odcisku są identyczne z dokładnością do nazw zmiennych
+    i kolejności argumentów operacji przemiennych.
+    '''
+    order = _postOrder(formula)
+    shapes = _digests(order, lambda lvar: 'v')
+    for _ in xrange(REFINE_ROUNDS):
+        keys = _refinedKeys(order, shapes)
+        shapes = _digests(order, lambda lvar: keys[lvar.name])
+
+    names = []
+    index = {}
+    visited = set()
+    stack = [formula]
+    while stack:
+        node = stack.pop()
+        if node in visited:
+            continue
+        visited.add(node)
+        if node.__class__ is LogicVariable:
+            if node.name not in index:
+                index[node.name] = len(names) + 1
+                names.append(node.name)
+            continue
+        subformulas = list(node.subformulas)
+        if node.__class__ in COMMUTATIVE:
+            subformulas.sort(key=lambda f: shapes[f])
+        stack.extend(reversed(subformulas))
+
+    digests = _digests(order, lambda lvar: str(index[lvar.name]))
+    return digests[formula], names
+
+
+class CachedResult(object):
+    '''
+    Wynik weryfikacji odczytany z pamięci podręcznej
+
+    * satisfiable, valid -> wyniki weryfikacji
+    * satValuation       -> wartościowanie spełniające formułę (albo None)
+    * falsValuation      -> wartościowanie falsyfikujące formułę (albo None)
+    '''
+
+    def __init__(self, satisfiable, valid, satValuation, falsValuation):
+        self.satisfiable = satisfiable
+        self.valid = valid
+        self.satValuation = satValuation
+        self.falsValuation = falsValuation
+
+    def isConsistent(self, formula):
+        '''
+        czy zapamiętani świadkowie potwierdzają wynik na formule formula
+
+        Formuła spełnialna musi mieć wartościowanie spełniające, a spełnialna
+        nie-tautologia także falsyfikujące. Dla formuł niespełnialnych i tautologii
+        nie ma krótkiego świadka, polegamy na odcisku formuły.
+        '''
+        if not self.satisfiable:
+            return not self.valid
+        if self.satValuation is None or not formula.evaluate(self.satValuation):
+            return False
+        if self.valid:
+            return True
+        return self.falsValuation is not None and not formula.evaluate(self.falsValuation)
+
+
+class ResultCache(object):
+    '''
+    Trwała pamięć podręczna wyników weryfikacji z usuwaniem LRU
+
+    Wpisy przechowywane są w bazie sqlite3 w pliku path. Każdy odczyt i zapis
+    oznacza wpis jako ostatnio używany, po zapisie usuwane są najdawniej używane
+    wpisy ponad limit maxEntries.
+    '''
+
+    DEFAULT_PATH = os.path.join("~", ".liprojekt_cache.db")
+    DEFAULT_MAX_ENTRIES = 10000
+
+    def __init__(self, path=DEFAULT_PATH, maxEntries=DEFAULT_MAX_ENTRIES):
+        self.path = os.path.expanduser(path)
+        self.maxEntries = maxEntries
+        self.connection = sqlite3.connect(self.path)
+        self.connection.execute(
+            "CREATE TABLE IF NOT EXISTS results ("
+            "fingerprint TEXT PRIMARY KEY, satisfiable INTEGER, valid INTEGER, "
+            "satWitness TEXT, falsWitness TEXT, used INTEGER)")
+        self.connection.execute(
+            "CREATE INDEX IF NOT EXISTS results_used ON results (used)")
+        self.connection.commit()
+
+    def lookup(self, formula):
+        '''
+        zwróć zapamiętany wynik dla formuły (CachedResult), albo None
+
+        Wpis, którego świadkowie nie potwierdzają wyniku, jest usuwany.
+        '''
+        key, names = fingerprint(formula)
+        row = self.connection.execute(
+            "SELECT satisfiable, valid, satWitness, falsWitness FROM results "
+            "WHERE fingerprint = ?", (key,)).fetchone()
+        if row is None:
+            logging.info("Brak formuły w pamięci podręcznej")
+            return None
+        result = CachedResult(bool(row[0]), bool(row[1]),
+                              self.__decodeWitness(row[2], names),
+                              self.__decodeWitness(row[3], names))
+        if not result.isConsistent(formula):
+            logging.warning("Wpis pamięci podręcznej nie zgadza się z formułą, jest usuwany")
+            self.connection.execute("DELETE FROM results WHERE fingerprint = ?", (key,))
+            self.connection.commit()
+            return None
+        self.connection.execute("UPDATE results SET used = ? WHERE fingerprint = ?",
+                                (self.__nextUsed(), key))
+        self.connection.commit()
+        logging.info("Wynik odczytany z pamięci podręcznej")
+        return result
+
+    def store(self, formula, satisfiable, valid, satValuation=None, falsValuation=None):
+        '''
+        zapamiętaj wynik weryfikacji formuły i wartościowania-świadków
+        (słowniki nazwa zmiennej -> True/False, patrz FormulaVerifier.valuation)
+        '''
+        key, names = fingerprint(formula)
+        index = dict((name, i + 1) for i, name in enumerate(names))
+        self.connection.execute(
+            "INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?, ?)",
+            (key, int(satisfiable), int(valid),
+             self.__encodeWitness(satValuation, index),
+             self.__encodeWitness(falsValuation, index), self.__nextUsed()))
+        self.__evict()
+        self.connection.commit()
+
+    def __len__(self):
+        return self.connection.execute("SELECT COUNT(*) FROM results").fetchone()[0]
+
+    def close(self):
+        self.connection.close()
+
+    def __nextUsed(self):
+        return self.connection.execute(
+            "SELECT COALESCE(MAX(used), 0) + 1 FROM results").fetchone()[0]
+
+    def __evict(self):
+        excess = len(self) - self.maxEntries
+        if excess > 0:
+            logging.debug("Usuwanie %d najdawniej używanych wpisów", excess)
+            self.connection.execute(
+                "DELETE FROM results WHERE fingerprint IN ("
+                "SELECT fingerprint FROM results ORDER BY used LIMIT ?)", (excess,))
+
+    def __encodeWitness(self, valuation, index):
+        '''
+        wartościowanie jako ciąg numerów kanonicznych zmiennych ze znakami
+        '''
+        if valuation is None:
+            return None
+        return " ".join(str(index[name] if value else -index[name])
+                        for name, value in sorted(valuation.items()) if name in index)
+
+    def __decodeWitness(self, witness, names):
+        if witness is None:
+            return None
+        valuation = {}
+        for lit in map(int, witness.split()):
+            valuation[names[abs(lit) - 1]] = lit > 0
+        return valuation
+
+
+def _valuation2str(valuation, fformatter):
+    return " , ".join(fformatter.formula2str(LogicVariable(name, not value))
+                      for name, value in sorted(valuation.items()))
+
+
+class CachedSatisfiabilityVerifier(SatisfiabilityVerifier):
+    '''
+    Weryfikacja spełnialności na podstawie wyniku z pamięci podręcznej (CachedResult)
+
+    Drzewo konwersji nie jest rozwijane, zawiera tylko korzeń.
+    '''
+
+    def __init__(self, formula, result, vtable=None):
+        super(CachedSatisfiabilityVerifier, self).__init__(formula, vtable)
+        self.cachedResult = result
+
+    def verifyFormula(self):
+        self._ifVerifiedAssert(False)
+        return self._setResult(self.cachedResult.satisfiable)
+
+    def valuation(self):
+        return self.cachedResult.satValuation
+
+    def _valuatoin2str(self, fformatter):
+        if self.success:
+            return "Formuła jest spełnialna przy wartościowaniu takim, że wszystkie literały i stałe: " +\
+                   _valuation2str(self.cachedResult.satValuation, fformatter) + "\n" +\
+                   "    są prawdziwe"
+        else:
+            return "Formuła nie jest spełnialna (wynik z pamięci podręcznej)"
+
+    def _proof2str(self, fformatter):
+        if self.success:
+            return "Wynik z pamięci podręcznej, zapamiętane wartościowanie spełnia formułę"
+        else:
+            return "Wynik z pamięci podręcznej"
+
+
+class CachedValidityVerifier(ValidityVerifier):
+    '''
+    Weryfikacja czy formuła jest tautologią na podstawie wyniku z pamięci
+    podręcznej (CachedResult)
+
+    Drzewo konwersji nie jest rozwijane, zawiera tylko korzeń.
+    '''
+
+    def __init__(self, formula, result, vtable=None):
+        super(CachedValidityVerifier, self).__init__(formula, vtable)
+        self.cachedResult = result
+
+    def verifyFormula(self):
+        self._ifVerifiedAssert(False)
+        return self._setResult(self.cachedResult.valid)
+
+    def valuation(self):
+        return self.cachedResult.falsValuation
+
+    def _valuatoin2str(self, fformatter):
+        if self.success:
+            return "Formuła jest tautologią więc jest prawdziwa dla każdego wartościowania"
+        else:
+            return "Formuła nie jest tautologią\n" +\
+                   "    nie jest prawdziwa dla wartościowania takiego że wszystkie literały i stałe: " +\
+                   _valuation2str(self.cachedResult.falsValuation, fformatter) + '\n' +\
+                   "    są prawdziwe"
+
+    def _proof2str(self, fformatter):
+        if self.success:
+            return "Wynik z pamięci podręcznej"
+        else:
+            return "Wynik z pamięci podręcznej, zapamiętane wartościowanie falsyfikuje formułę"
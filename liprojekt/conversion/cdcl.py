@@ -0,0 +1,376 @@
+# -*- coding: utf-8 -*-
+'''
+Moduł zawiera silnik SAT typu CDCL (conflict-driven clause learning).
+
+Silnik przyjmuje CNF w tej samej postaci co solvers.DPLLSolver i może być
+użyty przez verification.SolverSatisfiabilityVerifier oraz
+verification.SolverValidityVerifier (która sprawdza spełnialność ~F).
+
+Elementy silnika:
+* propagacja jednostkowa na dwóch obserwowanych literałach (two watched literals)
+* uczenie klauzul z konfliktów według pierwszego punktu dominacji (1-UIP)
+* niechronologiczny nawrót (backjumping) na poziom wynikający z nauczonej klauzuli
+* kolejność zmiennych według aktywności VSIDS, z zapamiętywaniem znaku (phase saving)
+* restarty według ciągu Luby'ego
+* usuwanie mało aktywnych nauczonych klauzul
+'''
+
+import logging
+from heapq import heappush, heappop, heapify
+
+from liprojekt.conversion.solvers import SatSolver
+
+
+def luby(i):
+    '''
+    i-ty (od zera) wyraz ciągu Luby'ego: 1, 1, 2, 1, 1, 2, 4, 1, 1, 2, ...
+    '''
+    size, seq = 1, 0
+    while size < i + 1:
+        seq += 1
+        size = 2 * size + 1
+    while size - 1 != i:
+        size = (size - 1) >> 1
+        seq -= 1
+        i = i % size
+    return 2 ** seq
+
+
+class CDCLClause(object):
+    '''
+    Klauzula silnika CDCL
+
+    lits to lista literałów w kodowaniu wewnętrznym silnika (2*id + znak),
+    pierwsze dwa literały są obserwowane. Jeżeli klauzula jest przyczyną
+    przypisania literału, to ten literał jest na pozycji 0.
+    '''
+
+    __slots__ = ('lits', 'learnt', 'activity', 'deleted')
+
+    def __init__(self, lits, learnt=False):
+        self.lits = lits
+        self.learnt = learnt
+        self.activity = 0.0
+        self.deleted = False
+
+
+class CDCLSolver(SatSolver):
+    '''
+    Silnik SAT typu CDCL
+
+    Literały kodowane są wewnętrznie jako 2*id dla zmiennej i 2*id+1 dla jej
+    negacji, więc negacja to c ^ 1. Wartość literału to 1 (prawda), 0 (fałsz)
+    albo UNKNOWN.
+    '''
+
+    NAME = "CDCL"
+
+    UNKNOWN = 2
+
+    VAR_DECAY = 0.95
+    CLAUSE_DECAY = 0.999
+    RESTART_BASE = 100
+    LEARNTS_FACTOR = 1.0 / 3
+    LEARNTS_GROWTH = 1.1
+
+    def __init__(self, clauses, numVars):
+        super(CDCLSolver, self).__init__(clauses, numVars)
+        n = numVars
+        self.__vals = [self.UNKNOWN] * (2 * n + 2)
+        self.__level = [0] * (n + 1)
+        self.__reason = [None] * (n + 1)
+        self.__phase = [1] * (n + 1)
+        self.__activity = [0.0] * (n + 1)
+        self.__varInc = 1.0
+        self.__claInc = 1.0
+        self.__seen = [False] * (n + 1)
+        self.__watches = [[] for _ in xrange(2 * n + 2)]
+        self.__trail = []
+        self.__trailLim = []
+        self.__qhead = 0
+        self.__learnts = []
+        self.__heap = [(0.0, v) for v in xrange(1, n + 1)]
+        self.stats = {'decisions': 0, 'propagations': 0, 'conflicts': 0,
+                      'learnedClauses': 0, 'deletedClauses': 0, 'restarts': 0}
+
+    @staticmethod
+    def _code(lit):
+        return 2 * lit if lit > 0 else -2 * lit + 1
+
+    @staticmethod
+    def _literal(code):
+        return -(code >> 1) if code & 1 else code >> 1
+
+    def solve(self):
+        if self.hasEmptyClause:
+            return False
+        if not self.__addClauses():
+            return False
+
+        maxLearnts = max(len(self.clauses) * self.LEARNTS_FACTOR, 100.0)
+        restartLimit = luby(0) * self.RESTART_BASE
+        conflictsSinceRestart = 0
+        while True:
+            conflict = self.__propagate()
+            if conflict is not None:
+                self.stats['conflicts'] += 1
+                conflictsSinceRestart += 1
+                if not self.__trailLim:
+                    return False
+                learnt, backLevel = self.__analyze(conflict)
+                self.__cancelUntil(backLevel)
+                if len(learnt) == 1:
+                    self.__enqueue(learnt[0], None)
+                else:
+                    clause = CDCLClause(learnt, True)
+                    self.__attach(clause)
+                    self.__learnts.append(clause)
+                    self.__bumpClause(clause)
+                    self.__enqueue(learnt[0], clause)
+                self.stats['learnedClauses'] += 1
+                self.__varInc /= self.VAR_DECAY
+                self.__claInc /= self.CLAUSE_DECAY
+                continue
+
+            if conflictsSinceRestart >= restartLimit:
+                self.stats['restarts'] += 1
+                conflictsSinceRestart = 0
+                restartLimit = luby(self.stats['restarts']) * self.RESTART_BASE
+                self.__cancelUntil(0)
+                continue
+
+            if len(self.__learnts) - len(self.__trail) >= maxLearnts:
+                self.__reduceLearnts()
+                maxLearnts *= self.LEARNTS_GROWTH
+
+            var = self.__pickBranchVariable()
+            if var is None:
+                self.__setModel()
+                return True
+            self.stats['decisions'] += 1
+            self.__trailLim.append(len(self.__trail))
+            self.__enqueue(2 * var + self.__phase[var], None)
+
+    # CLAUSES #####################################################################
+    def __addClauses(self):
+        '''
+        dołącz klauzule CNF, klauzule jednoelementowe przypisywane są na poziomie 0
+        '''
+        vals = self.__vals
+        for clause in self.clauses:
+            lits = [self._code(lit) for lit in clause]
+            if len(lits) == 1:
+                if vals[lits[0]] == 0:
+                    return False
+                if vals[lits[0]] == self.UNKNOWN:
+                    self.__enqueue(lits[0], None)
+            else:
+                self.__attach(CDCLClause(lits))
+        return self.__propagate() is None
+
+    def __attach(self, clause):
+        lits = clause.lits
+        self.__watches[lits[0]].append(clause)
+        self.__watches[lits[1]].append(clause)
+
+    def __isLocked(self, clause):
+        first = clause.lits[0]
+        return self.__vals[first] == 1 and self.__reason[first >> 1] is clause
+
+    def __bumpClause(self, clause):
+        clause.activity += self.__claInc
+        if clause.activity > 1e20:
+            for learnt in self.__learnts:
+                learnt.activity *= 1e-20
+            self.__claInc *= 1e-20
+
+    def __reduceLearnts(self):
+        '''
+        usuń połowę nauczonych klauzul o najmniejszej aktywności (poza binarnymi
+        i tymi, które są przyczyną bieżących przypisań)
+        '''
+        self.__learnts.sort(key=lambda clause: clause.activity)
+        half = len(self.__learnts) // 2
+        kept = []
+        for i, clause in enumerate(self.__learnts):
+            if i < half and len(clause.lits) > 2 and not self.__isLocked(clause):
+                clause.deleted = True
+                self.stats['deletedClauses'] += 1
+            else:
+                kept.append(clause)
+        self.__learnts = kept
+
+    # ASSIGNMENT ##################################################################
+    def __enqueue(self, code, reason):
+        var = code >> 1
+        self.__vals[code] = 1
+        self.__vals[code ^ 1] = 0
+        self.__level[var] = len(self.__trailLim)
+        self.__reason[var] = reason
+        self.__trail.append(code)
+
+    def __cancelUntil(self, level):
+        if len(self.__trailLim) <= level:
+            return
+        trail = self.__trail
+        vals = self.__vals
+        stop = self.__trailLim[level]
+        for i in xrange(len(trail) - 1, stop - 1, -1):
+            code = trail[i]
+            var = code >> 1
+            vals[code] = vals[code ^ 1] = self.UNKNOWN
+            self.__reason[var] = None
+            self.__phase[var] = code & 1
+            heappush(self.__heap, (-self.__activity[var], var))
+        del trail[stop:]
+        del self.__trailLim[level:]
+        self.__qhead = len(trail)
+
+    def __propagate(self):
+        '''
+        propagacja jednostkowa na obserwowanych literałach,
+        zwraca klauzulę konfliktową albo None
+        '''
+        trail = self.__trail
+        vals = self.__vals
+        watches = self.__watches
+        conflict = None
+        while self.__qhead < len(trail) and conflict is None:
+            falseLit = trail[self.__qhead] ^ 1
+            self.__qhead += 1
+            ws = watches[falseLit]
+            i = j = 0
+            end = len(ws)
+            while i < end:
+                clause = ws[i]
+                i += 1
+                if clause.deleted:
+                    continue
+                lits = clause.lits
+                if lits[0] == falseLit:
+                    lits[0] = lits[1]
+                    lits[1] = falseLit
+                first = lits[0]
+                if vals[first] == 1:
+                    ws[j] = clause
+                    j += 1
+                    continue
+                for k in xrange(2, len(lits)):
+                    if vals[lits[k]] != 0:
+                        lits[1] = lits[k]
+                        lits[k] = falseLit
+                        watches[lits[1]].append(clause)
+                        break
+                else:
+                    ws[j] = clause
+                    j += 1
+                    if vals[first] == 0:
+                        conflict = clause
+                        while i < end:
+                            ws[j] = ws[i]
+                            j += 1
+                            i += 1
+                    else:
+                        self.stats['propagations'] += 1
+                        self.__enqueue(first, clause)
+            del ws[j:]
+        if conflict is not None:
+            self.__qhead = len(trail)
+        return conflict
+
+    # CONFLICT ANALYSIS ###########################################################
+    def __analyze(self, conflict):
+        '''
+        analiza konfliktu, zwraca nauczoną klauzulę (literał asercyjny na
+        pozycji 0, literał z najwyższego z pozostałych poziomów na pozycji 1)
+        i poziom nawrotu
+        '''
+        seen = self.__seen
+        level = self.__level
+        trail = self.__trail
+        currentLevel = len(self.__trailLim)
+        learnt = [None]
+        pathCount = 0
+        code = None
+        index = len(trail) - 1
+        clause = conflict
+        while True:
+            if clause.learnt:
+                self.__bumpClause(clause)
+            lits = clause.lits if code is None else clause.lits[1:]
+            for q in lits:
+                var = q >> 1
+                if not seen[var] and level[var] > 0:
+                    seen[var] = True
+                    self.__bumpVariable(var)
+                    if level[var] >= currentLevel:
+                        pathCount += 1
+                    else:
+                        learnt.append(q)
+            while not seen[trail[index] >> 1]:
+                index -= 1
+            code = trail[index]
+            index -= 1
+            clause = self.__reason[code >> 1]
+            seen[code >> 1] = False
+            pathCount -= 1
+            if pathCount == 0:
+                break
+        learnt[0] = code ^ 1
+
+        # minimalizacja: pomijamy literały wynikające z pozostałych literałów klauzuli
+        minimized = [learnt[0]]
+        for q in learnt[1:]:
+            reason = self.__reason[q >> 1]
+            if reason is None or not all(seen[r >> 1] or level[r >> 1] == 0
+                                         for r in reason.lits[1:]):
+                minimized.append(q)
+        for q in learnt[1:]:
+            seen[q >> 1] = False
+        learnt = minimized
+
+        backLevel = 0
+        if len(learnt) > 1:
+            maxIndex = 1
+            for i in xrange(2, len(learnt)):
+                if level[learnt[i] >> 1] > level[learnt[maxIndex] >> 1]:
+                    maxIndex = i
+            learnt[1], learnt[maxIndex] = learnt[maxIndex], learnt[1]
+            backLevel = level[learnt[1] >> 1]
+        return learnt, backLevel
+
+    # DECISIONS ###################################################################
+    def __bumpVariable(self, var):
+        activity = self.__activity
+        activity[var] += self.__varInc
+        if activity[var] > 1e100:
+            for v in xrange(1, self.numVars + 1):
+                activity[v] *= 1e-100
+            self.__varInc *= 1e-100
+            self.__rebuildHeap()
+        elif self.__vals[2 * var] == self.UNKNOWN:
+            heappush(self.__heap, (-activity[var], var))
+
+    def __rebuildHeap(self):
+        self.__heap = [(-self.__activity[v], v) for v in xrange(1, self.numVars + 1)
+                       if self.__vals[2 * v] == self.UNKNOWN]
+        heapify(self.__heap)
+
+    def __pickBranchVariable(self):
+        '''
+        nieprzypisana zmienna o największej aktywności, albo None
+        '''
+        heap = self.__heap
+        if len(heap) > 4 * self.numVars + 100:
+            self.__rebuildHeap()
+            heap = self.__heap
+        while heap:
+            negActivity, var = heappop(heap)
+            if self.__vals[2 * var] == self.UNKNOWN and -negActivity == self.__activity[var]:
+                return var
+        return None
+
+    def __setModel(self):
+        self.model = [self._literal(2 * var + (self.__vals[2 * var] != 1))
+                      for var in xrange(1, self.numVars + 1)]
+        logging.info("%s: znaleziono wartościowanie (%s)", self.NAME, self.stats2str())
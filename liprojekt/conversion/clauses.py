@@ -14,11 +14,11 @@ z literałów.
 
 import sys
 import logging
-from collections import deque
-from copy import deepcopy
-from sets import Set
 
 from liprojekt.conversion.formulas import AndOperation, OrOperation, LogicVariable, LogicTruth, LogicFalse, NotOperation
+from liprojekt.conversion.persistent import PersistentStack
+from liprojekt.conversion.literals import VariableTable, negateLiteral, literalMask, \
+    maskLiterals
 
 
 class ClauseState(object):
@@ -31,6 +31,18 @@ class ClauseState(object):
     * ClauseState.FAILURE -> klauzula powstała z formuły, która nie jest spełnialan, albo nie jest tautologią
     '''
     UNKNOWN, SUCCESS, FAILURE = range(3)
+
+class ClauseCause(object):
+    '''
+    przyczyna rozstrzygnięcia półproduktu Clause
+    
+    * ClauseCause.NONE     -> klauzula nie jest rozstrzygnięta
+    * ClauseCause.TRUTH    -> klauzula zawiera prawdę logiczną (ClauseHasTruth)
+    * ClauseCause.FALSE    -> klauzula zawiera fałsz logiczny (ClauseHasFalse)
+    * ClauseCause.RESOLVED -> klauzula w pełni rozwinięta (ClauseResolved)
+    * ClauseCause.OPPOSITE -> klauzula zawiera zmienną i jej negację (ClauseHasOppositeLVars)
+    '''
+    NONE, TRUTH, FALSE, RESOLVED, OPPOSITE = range(5)
     
 class ClauseStatus(object):
     '''
@@ -131,19 +143,23 @@ class ClauseHasOppositeLVars(ClauseStatus):
     status `klauzula ma zmienną logiczną i jej negację`
     
     w skład Clause wchodzi zmienna logiczna i jej negacja, czyli jest postaci (p, ~p, ...)
+    
+    lit i neglit to literały w postaci liczb, vtable to tablica zmiennych
+    (literals.VariableTable) z której pochodzą
     '''
-    def __init__(self, state, lit, neglit, effect):
+    def __init__(self, state, lit, neglit, effect, vtable):
         self.lit = lit
         self.neglist = neglit
-        cause = "Klauzula zawiera zmienną "+str(lit)+ \
-                " i jej negacje "+str(neglit)
+        self.vtable = vtable
+        cause = "Klauzula zawiera zmienną "+vtable.literal2str(lit)+ \
+                " i jej negacje "+vtable.literal2str(neglit)
         super(ClauseHasOppositeLVars, self).__init__(
                 state, effect, cause)
 
     def status2str(self, fformatter):
         return self.effect+ " ponieważ klauzula zawiera zmienną logiczną "+ \
-            fformatter.formula2str(self.lit)+ " i jej negację "+ \
-            fformatter.formula2str(self.neglist)
+            fformatter.literal2str(self.lit, self.vtable)+ " i jej negację "+ \
+            fformatter.literal2str(self.neglist, self.vtable)
     
     
 #==============================================================================
@@ -154,42 +170,157 @@ class Clause(object):
     Półprodukt, którego celem jest stać się klauzulą
     
     Klasa Clause stanowi etap w procesie konwersji formuły logicznej na klauzuly
+    
+    Drzewo konwersji może mieć miliony Clause, więc obiekt Clause jest zwarty:
+    atrybuty trzymane są w __slots__, metody obsługi podformuł wybierane są
+    z tablic klasy (HANDLERS, CORRECTORS), a stan zapisany jest liczbami
+    (ClauseState, ClauseCause). Opis statusu (ClauseStatus) tworzony jest dopiero
+    przy odczycie atrybutu status, czyli przy generowaniu raportu.
+    '''
+    
+    __slots__ = ('vtable', 'cFormulas', 'uncFormulas', 'positive', 'negative',
+                 'hasLogicTruth', 'hasLogicFalse', 'state', 'cause', 'conflict')
+    
+    conSymbol = ","
+    '''
+    symbol łączący podformuły przy wypisywaniu Clause
+    '''
+    
+    OUTCOMES = {}
+    '''
+    implementowane w klasach DisjunctionClause i ConjunctionClause
+    
+    przyczyna rozstrzygnięcia (ClauseCause) -> (stan ClauseState, opis skutku)
+    '''
+    
+    LITERAL_VALUE = None
+    '''
+    implementowane w klasach DisjunctionClause i ConjunctionClause
+    
+    wartość literałów klauzuli w wartościowaniu, którego szuka Clause (prawdziwe
+    w ConjunctionClause, fałszywe w DisjunctionClause), patrz _split
+    '''
+    
+    BRANCHING = None
+    '''
+    implementowane w klasach DisjunctionClause i ConjunctionClause
+    
+    klasa operacji, która rozbija Clause na dwie (patrz branching.BranchingPolicy)
+    '''
+    
+    PROPAGATION_LIMIT = 64
+    '''
+    ile węzłów podformuły najwyżej sprawdzanych jest przy propagacji literałów
+    przed rozbiciem Clause (0 wyłącza propagację), patrz _split
     '''
 
 ########## CONSTRUCTOR #########################################################  
-    def __init__(self, formula, conSymbol = ","):
+    def __init__(self, formula, vtable = None):
         '''
         Konstuktor klasy Clause
         
         Clause tworzone jest z formuły logicznej. Argument formula jest klasy formulas.Formula.
+        vtable to tablica zmiennych (literals.VariableTable), wspólna dla wszystkich Clause
+        powstałych z tej formuły. Jeżeli nie zostanie podana tworzona jest nowa.
         formula staje się pierwszą nieprzerobioną podformułą w półprodukcie Clause. Konwersja
         półproduktu Clause polaga na upraszczaniu kolenych podformuł z listy jeszcze nieprzerobionych
         podformuł.
-        '''
-        self.cFormulas = deque()
-        self.uncFormulas = deque()
-        self.uncFormulas.append(formula)
-        self.lvars = Set()
+        
+        Podformuły przerobione (cFormulas) i nieprzerobione (uncFormulas) trzymane są
+        w trwałych stosach persistent.PersistentStack, a zmienne logiczne w parze
+        masek bitowych (positive, negative, patrz literals.maskLiterals). Żadna z tych
+        struktur nie jest modyfikowana w miejscu, więc gałęzie powstałe z jednej Clause
+        współdzielą jej podformuły.
+        
+        Literały przechowywane są jako liczby (patrz literals.VariableTable), więc
+        wykrycie zmiennej i jej negacji to sprawdzenie bitu zmiennej w masce przeciwnej,
+        a sprawdzenie całej klauzuli to koniunkcja bitowa obu masek.
+        '''
+        if vtable is None:
+            vtable = VariableTable()
+        self.vtable = vtable
+        self.cFormulas = PersistentStack.EMPTY
+        self.uncFormulas = PersistentStack.EMPTY.push(formula)
+        self.positive = 0
+        self.negative = 0
         self.hasLogicTruth = False
         self.hasLogicFalse = False
-        self.status = ClauseUnresolved()
-        
-        
-        self.conSymbol = conSymbol
-        
-        self.handlerMap = {}
-        self.handlerMap[LogicTruth] = self.__handleLogicTruth
-        self.handlerMap[LogicFalse] = self.__handleLogicFalse
-        self.handlerMap[LogicVariable] = self.__handleLogicVariable
-        
-        self.handlerMap[NotOperation] = self.__handleNotOperation
-        self.handlerMap[AndOperation] = self._handleAndOperation
-        self.handlerMap[OrOperation] = self._handleOrOperation
-        
-        self.__correctMap = {}
-        self.__correctMap[LogicTruth] = self.__handleLogicTruth
-        self.__correctMap[LogicFalse] = self.__handleLogicFalse
-        self.__correctMap[LogicVariable] = self.__handleLogicVariable        
+        self.state = ClauseState.UNKNOWN
+        self.cause = ClauseCause.NONE
+        # literał, którego negacja też jest w klauzuli (ClauseCause.OPPOSITE)
+        self.conflict = None
+
+    def _branch(self):
+        '''
+        Nowa gałąź Clause
+        
+        Zwraca płytką kopię Clause. Kopia współdzieli z oryginałem wszystkie
+        (niemutowalne) struktury z podformułami, więc jej utworzenie nie zależy
+        od rozmiaru Clause. Zmiany w kopii polegają na podmianie tych struktur
+        na nowe wersje i nie są widoczne w oryginale.
+        '''
+        branch = object.__new__(self.__class__)
+        branch.vtable = self.vtable
+        branch.cFormulas = self.cFormulas
+        branch.uncFormulas = self.uncFormulas
+        branch.positive = self.positive
+        branch.negative = self.negative
+        branch.hasLogicTruth = self.hasLogicTruth
+        branch.hasLogicFalse = self.hasLogicFalse
+        branch.state = self.state
+        branch.cause = self.cause
+        branch.conflict = self.conflict
+        return branch
+
+    def __getstate__(self):
+        '''
+        stan do zapiklowania, wartości atrybutów w kolejności __slots__
+        '''
+        return tuple(getattr(self, name) for name in Clause.__slots__)
+
+    def __setstate__(self, state):
+        for name, value in zip(Clause.__slots__, state):
+            setattr(self, name, value)
+
+    @property
+    def lvars(self):
+        '''
+        zbiór (frozenset) literałów klauzuli
+        '''
+        return frozenset(self.literals())
+
+    def literals(self):
+        '''
+        lista literałów klauzuli, w kolejności id zmiennych
+        '''
+        return maskLiterals(self.positive, self.negative)
+
+    @property
+    def status(self):
+        '''
+        status Clause (ClauseStatus) z opisem przyczyny rozstrzygnięcia
+        
+        Obiekt tworzony jest przy każdym odczycie, potrzebny jest tylko w raportach
+        '''
+        if self.cause == ClauseCause.NONE:
+            return ClauseUnresolved()
+        state, effect = self.OUTCOMES[self.cause]
+        if self.cause == ClauseCause.OPPOSITE:
+            return ClauseHasOppositeLVars(state, self.conflict, negateLiteral(self.conflict),
+                                          effect, self.vtable)
+        if self.cause == ClauseCause.TRUTH:
+            return ClauseHasTruth(state, effect)
+        if self.cause == ClauseCause.FALSE:
+            return ClauseHasFalse(state, effect)
+        return ClauseResolved(state, effect)
+
+    def _resolve(self, cause, conflict=None):
+        '''
+        rozstrzygnij Clause z przyczyny cause (ClauseCause), stan według OUTCOMES
+        '''
+        self.state = self.OUTCOMES[cause][0]
+        self.cause = cause
+        self.conflict = conflict
 
 ########## STATE #############################################################  
     def isResolved(self):
@@ -199,7 +330,7 @@ class Clause(object):
         Znaczy, czy wiadomo cos o formule z której powstało Clause, na podstawie danej
         Clause. (czy owa formuła jest / nie jest spełnialna, jest / nie jest tautologią)
         '''
-        return self.status.state in (ClauseState.SUCCESS, ClauseState.FAILURE)
+        return self.state != ClauseState.UNKNOWN
     
     def isSuccess(self):
         '''
@@ -207,7 +338,7 @@ class Clause(object):
         
         Clause potwierdza tezę, że formuła z której powstała jest spełnialna / jest tautologią
         '''
-        return self.status.state is ClauseState.SUCCESS
+        return self.state == ClauseState.SUCCESS
     
     def isFailure(self):
         '''
@@ -215,15 +346,18 @@ class Clause(object):
         
         Clause podważa tezę, że formuła z której powstała jest spełnialna / jest tautologią
         '''
-        return self.status.state is ClauseState.FAILURE
+        return self.state == ClauseState.FAILURE
 
 ########## CONVERSION #########################################################  
-    def __convertStep(self):
+    def __convertStep(self, policy):
         if self.isResolved():
             return (self,)
         
         try:
-            formula = self.uncFormulas.popleft()
+            if policy is None:
+                formula, self.uncFormulas = self.uncFormulas.pop()
+            else:
+                formula, self.uncFormulas = policy.select(self)
             return self.__handleFormula(formula)                            
         except IndexError:
             # wszystkie formuly 
@@ -233,7 +367,7 @@ class Clause(object):
         if self.isResolved():
             return self
         try:
-            formula = self.uncFormulas.popleft()
+            formula, self.uncFormulas = self.uncFormulas.pop()
             return self.__correctFormula(formula)
         except IndexError:
             return self.__handleResolved()[0]
@@ -241,38 +375,35 @@ class Clause(object):
     def __correctFormula(self, formula):
         # TODO sprawdz czy to formula
         try:
-            correctedClause = self.__correctMap[formula.__class__](formula)[0]
+            correctedClause = self.CORRECTORS[formula.__class__](self, formula)[0]
             correctedClause = correctedClause.__correctStep()
             return correctedClause
         except KeyError:
             # nie można poprawić, wstaw spowrotem na kolejkę nieprzerobionych
-            self.uncFormulas.appendleft(formula)
+            self.uncFormulas = self.uncFormulas.push(formula)
             return self
         except:
             print "nieprzewidziany blad", sys.exc_info()[0]
             raise
 
 
-    def __analyseLVariables(self, lvar = None):
-        logging.debug("Analiza zmiennych, nowa zmienna to [%s]\n"+
-                      "pozostałe zmienne to %s", lvar, map(str, self.lvars))
-        if lvar:
-            opp = lvar.negate()
-            if opp in self.lvars:
-                logging.debug("Znaleziono negację zmiennej")
-                self._oppositeLVarsDetected(lvar, opp)
+    def __analyseLVariables(self, lit = None):
+        if lit:
+            opposite = self.negative if lit > 0 else self.positive
+            if opposite & literalMask(lit):
+                logging.debug("Znaleziono negację zmiennej %s", lit)
+                self._oppositeLVarsDetected(lit, negateLiteral(lit))
         else:
-            oppSet = Set(map((lambda x: x.negate()), self.lvars))
-            pairs = oppSet.intersection(self.lvars)
-            if pairs:
-                lvar = pairs.pop()
-                self._oppositeLVarsDetected(lvar, lvar.negate())
+            common = self.positive & self.negative
+            if common:
+                lit = (common & -common).bit_length() - 1
+                self._oppositeLVarsDetected(lit, negateLiteral(lit))
 
     def __handleFormula(self, formula):
         # TODO sprawdz czy to formula
         f = formula.makeSimple()
         try:
-            newClauses = self.handlerMap[f.__class__](f)
+            newClauses = self.HANDLERS[f.__class__](self, f)
         except KeyError:
             print "Nieobslugiwana formula", f
             raise
@@ -289,45 +420,150 @@ class Clause(object):
         return (self,)            
                
                                   
-    def convertStep(self):
+    def convertStep(self, policy=None):
         '''
         kolejny krok konwersji
         
         brana jest kolejna nieurposzczona podformuła z której składa sie Clause. 
         Podformuła poddawana jest przekształceniom opartym na prawach DeMorgana,
         powstaje nowy obiekt Clause, albo para nowych obiektów Clause.
+        
+        policy to polityka wyboru podformuły (branching.BranchingPolicy), domyślnie
+        brana jest podformuła ze szczytu stosu nieprzerobionych podformuł
         '''
         if self.isResolved():
             return (self,)
         
-        clauseCopy = deepcopy(self)
-        return clauseCopy.__convertStep()
+        clauseCopy = self._branch()
+        return clauseCopy.__convertStep(policy)
        
             
 # HANDLERS ####################################################################
 ## ALWAYS THE SAME ##
     def __handleLogicVariable(self, lvar):
-        self.cFormulas.append(lvar)
-        self.lvars.add(lvar)
-        self.__analyseLVariables(lvar)
+        lit = self.vtable.literal(lvar)
+        self.cFormulas = self.cFormulas.push(lit)
+        if lit > 0:
+            self.positive |= literalMask(lit)
+        else:
+            self.negative |= literalMask(lit)
+        self.__analyseLVariables(lit)
         return (self,)
     
     def __handleNotOperation(self, formula):
-        self.uncFormulas.appendleft(formula)
+        self.uncFormulas = self.uncFormulas.push(formula)
         return (self,)
     
 ## CLAUSE TYPE SPEC BEHAV ##    
     def __handleLogicTruth(self, formula=None):
-        self.cFormulas.append(LogicTruth())
+        self.cFormulas = self.cFormulas.push(LogicTruth())
         self._logicTruthDetected()
         return (self,)
         
     def __handleLogicFalse(self, formula=None):
-        self.cFormulas.append(LogicFalse())
+        self.cFormulas = self.cFormulas.push(LogicFalse())
         self._logicFalseDetected()
         return (self,)
 
 
+    def _split(self, formula):
+        '''
+        Rozbij się na dwie Clause, jedna zawiera lewy operand operacji formula, druga prawy
+        
+        Przed rozbiciem operandy wartościowane są literałami klauzuli (LITERAL_VALUE,
+        zmienne spoza klauzuli nie mają wartości):
+        * operand o wartości LITERAL_VALUE jest spełniony przez literały klauzuli, więc
+          formula jest pomijana (gałąź drugiego operandu nie da innego wyniku)
+        * operand o wartości przeciwnej rozstrzyga swoją gałąź, więc gałąź nie jest
+          tworzona, a Clause dostaje tylko drugi operand (jeżeli oba operandy mają tę
+          wartość, Clause dostaje lewy, żeby gałąź rozstrzygnęła się zwykłym krokiem)
+        * jeżeli któraś z podformuł nieprzerobionych ma wartość przeciwną, Clause jest
+          skazana na rozstrzygnięcie, więc zamiast rozbicia obsługiwana jest ta
+          podformuła, a formula wraca na stos (patrz __doomedFormula)
+        Dzięki temu gałęzie skazane na rozstrzygnięcie odcinane są zanim powstaną.
+        '''
+        left, right = formula.subformulas
+        if self.PROPAGATION_LIMIT:
+            leftValue = self.__value(left, self.PROPAGATION_LIMIT)[0]
+            if leftValue is self.LITERAL_VALUE:
+                return (self,)
+            rightValue = self.__value(right, self.PROPAGATION_LIMIT)[0]
+            if rightValue is self.LITERAL_VALUE:
+                return (self,)
+            if leftValue is not None or rightValue is not None:
+                self.uncFormulas = self.uncFormulas.push(right if rightValue is None else left)
+                return (self,)
+            index = self.__doomedFormula()
+            if index is not None:
+                doomed, rest = self.uncFormulas.take(index)
+                self.uncFormulas = rest.push(formula)
+                doomed = doomed.makeSimple()
+                return self.HANDLERS[doomed.__class__](self, doomed)
+        myCopy = self._branch()
+        self.uncFormulas = self.uncFormulas.push(left)
+        myCopy.uncFormulas = myCopy.uncFormulas.push(right)
+        return (self, myCopy)
+    
+    def __doomedFormula(self):
+        '''
+        Indeks pierwszej podformuły nieprzerobionej o wartości przeciwnej do
+        LITERAL_VALUE, albo None
+        
+        Podformuły wartościowane są ze wspólnym budżetem PROPAGATION_LIMIT węzłów,
+        więc sprawdzany jest tylko szczyt stosu (koszt rozbicia jest stały).
+        '''
+        budget = self.PROPAGATION_LIMIT
+        for index, formula in enumerate(self.uncFormulas):
+            value, budget = self.__value(formula, budget)
+            if value is not None and value is not self.LITERAL_VALUE:
+                return index
+            if budget <= 0:
+                return None
+        return None
+    
+    def __value(self, formula, budget):
+        '''
+        Wartość (uproszczonej) formuły przy wartościowaniu literałów klauzuli
+        
+        Zwraca parę (wartość, pozostały budżet węzłów), wartość to None jeżeli
+        zależy od zmiennych spoza klauzuli albo budżet się wyczerpał. Głębokość
+        rekurencji ograniczona jest budżetem.
+        '''
+        budget -= 1
+        if budget < 0:
+            return None, budget
+        f = formula.makeSimple()
+        cls = f.__class__
+        if cls is LogicVariable:
+            lit = self.vtable.literal(f)
+            mask = literalMask(lit)
+            same, opposite = (self.positive, self.negative) if lit > 0 else \
+                             (self.negative, self.positive)
+            if same & mask:
+                return self.LITERAL_VALUE, budget
+            if opposite & mask:
+                return not self.LITERAL_VALUE, budget
+            return None, budget
+        if cls is LogicTruth:
+            return True, budget
+        if cls is LogicFalse:
+            return False, budget
+        if cls is NotOperation:
+            value, budget = self.__value(f.subformula, budget)
+            return (None if value is None else not value), budget
+        if cls is not AndOperation and cls is not OrOperation:
+            return None, budget
+        # wartość pochłaniająca: fałsz dla AND, prawda dla OR
+        absorbing = cls is OrOperation
+        result = not absorbing
+        for sub in f.subformulas:
+            value, budget = self.__value(sub, budget)
+            if value is absorbing:
+                return absorbing, budget
+            if value is None:
+                result = None
+        return result, budget
+
 ## DIFF OUTCOME ##       
     def _handleAndOperation(self, formula):
         '''
@@ -348,6 +584,26 @@ class Clause(object):
         '''
         #TODO zmus do impl
         pass
+    
+    HANDLERS = {
+        LogicTruth:     __handleLogicTruth,
+        LogicFalse:     __handleLogicFalse,
+        LogicVariable:  __handleLogicVariable,
+        NotOperation:   __handleNotOperation
+    }
+    '''
+    klasa podformuły -> metoda obsługi przy kroku konwersji, klasy DisjunctionClause
+    i ConjunctionClause dodają obsługę AndOperation i OrOperation
+    '''
+    
+    CORRECTORS = {
+        LogicTruth:     __handleLogicTruth,
+        LogicFalse:     __handleLogicFalse,
+        LogicVariable:  __handleLogicVariable
+    }
+    '''
+    klasa podformuły -> metoda obsługi przy poprawianiu Clause (bez rozgałęzień)
+    '''
         
 
 # DETECTED EVENTS ###############################################################
@@ -389,16 +645,32 @@ class Clause(object):
         pass
     
 ############# OUTPUT STRING #####################################################
+    def __converted2str(self, item):
+        if isinstance(item, int):
+            return self.vtable.literal2str(item)
+        return str(item)
+    
+    def __convertedFormula2str(self, fformatter, item):
+        if isinstance(item, int):
+            return fformatter.literal2str(item, self.vtable)
+        return fformatter.formula2str(item)
+    
     def __str__(self):
-        return "Vars and Consts: " + (" " + self.conSymbol + " ").join(map(str, self.cFormulas)) + "\n" + \
+        return "Vars and Consts: " + (" " + self.conSymbol + " ").join(map(self.__converted2str, reversed(self.cFormulas))) + "\n" + \
                 "Unconverted subformulas: " + (" " + self.conSymbol + " ").join(map(str, self.uncFormulas)) + "\n" + \
                 "Status: " + str(self.status)
 
     def lvars2str(self, fformatter):
         '''
-        wypisuje zmienne logicznie w Clause
+        wypisuje zmienne logicznie w Clause (w kolejności ich napotkania)
         '''
-        return ", ".join(map(fformatter.formula2str, self.lvars))
+        lvars = []
+        seen = set()
+        for item in reversed(self.cFormulas):
+            if isinstance(item, int) and item not in seen:
+                seen.add(item)
+                lvars.append(item)
+        return ", ".join(fformatter.literal2str(lit, self.vtable) for lit in lvars)
     
     def lconsts2str(self, fformatter):
         '''
@@ -415,7 +687,8 @@ class Clause(object):
         '''
         wypisuje podformuły uproszczone (zmienne i stałe logiczne) logicznie w Clause
         '''
-        return (" "+self.conSymbol+" ").join(map(fformatter.formula2str, self.cFormulas))
+        return (" "+self.conSymbol+" ").join(self.__convertedFormula2str(fformatter, item)
+                                             for item in reversed(self.cFormulas))
     
     def unconvertedFormulas2str(self, fformatter):
         '''
@@ -434,7 +707,7 @@ class Clause(object):
         '''
         wypisuje status Clause
         '''
-        if (onlyResolved and self.status.state != ClauseState.UNKNOWN) or not onlyResolved:
+        if (onlyResolved and self.state != ClauseState.UNKNOWN) or not onlyResolved:
             return statusPrefix+self.status.status2str(fformatter)
         return ""
 
@@ -446,13 +719,25 @@ class  ConjunctionClause(Clause):
     Klasa reprezentująca półprodukt dążący do postaci klauzuli koniunkcyjnej
     '''
     
+    __slots__ = ()
+    
+    OUTCOMES = {
+        ClauseCause.RESOLVED:   (ClauseState.SUCCESS, "Klauzula jest spelnialna"),
+        ClauseCause.OPPOSITE:   (ClauseState.FAILURE, "Klauzula jest zawsze fałszywa"),
+        ClauseCause.FALSE:      (ClauseState.FAILURE, "Klauzula jest zawsze fauszywa")
+    }
+    
+    LITERAL_VALUE = True
+    
+    BRANCHING = OrOperation
+    
     def _handleAndOperation(self, formula):
         '''
         obsługa operacji AND przy dążeniu do postaci klauzuli koniunkcyjnej
         
         Po prostu weź dwie strony operacji i ustaw je na początku podformuł nieprzerobionych
         '''
-        self.uncFormulas.extendleft(formula.subformulas)
+        self.uncFormulas = self.uncFormulas.extend(formula.subformulas)
         return (self,)
     
     def _handleOrOperation(self, formula):
@@ -460,12 +745,13 @@ class  ConjunctionClause(Clause):
         obsługa operacji OR przy dążeniu do postaci klauzuli koniunkcyjnej
         
         Rozbij się na dwie klauzule ConjunctionClause, jedna zawiera lewy operand
-        operacji OR, druga prawy.
+        operacji OR, druga prawy (patrz Clause._split).
         '''
-        myCopy = deepcopy(self)
-        self.uncFormulas.appendleft(formula.getLeftSubformula())
-        myCopy.uncFormulas.appendleft(formula.getRightSubformula())
-        return (self, myCopy)
+        return self._split(formula)
+    
+    HANDLERS = dict(Clause.HANDLERS)
+    HANDLERS[AndOperation] = _handleAndOperation
+    HANDLERS[OrOperation] = _handleOrOperation
         
     
     # DETECTED EVENTS ###############################################################
@@ -476,8 +762,7 @@ class  ConjunctionClause(Clause):
         
         To znaczy, że ta klauzula jest spełnialna
         '''
-        self.status = ClauseResolved(ClauseState.SUCCESS, 
-                         "Klauzula jest spelnialna")
+        self._resolve(ClauseCause.RESOLVED)
         
     def _oppositeLVarsDetected(self, lvar, notLvar):
         '''
@@ -485,8 +770,7 @@ class  ConjunctionClause(Clause):
         
         To znaczy, że klauzlua nie jest spełnialna.
         '''
-        self.status = ClauseHasOppositeLVars(ClauseState.FAILURE, lvar, notLvar, 
-                                             "Klauzula jest zawsze fałszywa")
+        self._resolve(ClauseCause.OPPOSITE, lvar)
     
     def _logicTruthDetected(self):
         '''
@@ -503,8 +787,7 @@ class  ConjunctionClause(Clause):
         To znaczy, że jest zawsze fauszywa (niespełnialna)
         '''
         self.hasLogicFalse = True;
-        self.status = ClauseHasFalse(ClauseState.FAILURE, 
-                                     "Klauzula jest zawsze fauszywa")
+        self._resolve(ClauseCause.FALSE)
 
 
 #==============================================================================
@@ -514,17 +797,27 @@ class  DisjunctionClause(Clause):
     '''
     Klasa reprezentująca półprodukt dążący do postaci klauzuli dysjunkcyjnej
     '''
+    
+    __slots__ = ()
+    
+    OUTCOMES = {
+        ClauseCause.RESOLVED:   (ClauseState.FAILURE, "Klauzula nie jest zawsze prawdziwa"),
+        ClauseCause.OPPOSITE:   (ClauseState.SUCCESS, "Klauzula jest zawsze prawdziwa"),
+        ClauseCause.TRUTH:      (ClauseState.SUCCESS, "Klauzula jest zawsze prawdziwa")
+    }
+    
+    LITERAL_VALUE = False
+    
+    BRANCHING = AndOperation
+    
     def _handleAndOperation(self, formula):
         '''
         obsługa operacji AND przy dążeniu do postaci klauzuli koniunkcyjnej
 
         Rozbij się na dwie klauzule DisjunctionClause, jedna zawiera lewy operand
-        operacji AND, druga prawy.       
+        operacji AND, druga prawy (patrz Clause._split).
         '''
-        myCopy = deepcopy(self)
-        self.uncFormulas.appendleft(formula.getLeftSubformula())
-        myCopy.uncFormulas.appendleft(formula.getRightSubformula())
-        return (self, myCopy)
+        return self._split(formula)
     
  
     def _handleOrOperation(self, formula):
@@ -533,8 +826,12 @@ class  DisjunctionClause(Clause):
         
         Po prostu weź dwie strony operacji i ustaw je na początku podformuł nieprzerobionych
         '''
-        self.uncFormulas.extendleft(formula.subformulas)
+        self.uncFormulas = self.uncFormulas.extend(formula.subformulas)
         return (self,)
+    
+    HANDLERS = dict(Clause.HANDLERS)
+    HANDLERS[AndOperation] = _handleAndOperation
+    HANDLERS[OrOperation] = _handleOrOperation
         
 # DETECTED EVENTS ###############################################################
 
@@ -544,8 +841,7 @@ class  DisjunctionClause(Clause):
         
         To znaczy, że ta klauzula jest jest tautologią.
         '''
-        self.status = ClauseResolved(ClauseState.FAILURE, 
-                         "Klauzula nie jest zawsze prawdziwa")
+        self._resolve(ClauseCause.RESOLVED)
                    
     def _oppositeLVarsDetected(self, lvar, notLvar):
         '''
@@ -553,8 +849,7 @@ class  DisjunctionClause(Clause):
         
         To znaczy, że klauzlua jest tautologią.
         '''
-        self.status = ClauseHasOppositeLVars(ClauseState.SUCCESS, lvar, notLvar, 
-                                             "Klauzula jest zawsze prawdziwa")
+        self._resolve(ClauseCause.OPPOSITE, lvar)
     
     def _logicTruthDetected(self):
         '''
@@ -563,7 +858,7 @@ class  DisjunctionClause(Clause):
         To znaczy, że jest zawsze prawdziwa (tautologia)
         '''
         self.hasLogicTruth = True;
-        self.status = ClauseHasTruth(ClauseState.SUCCESS, "Klauzula jest zawsze prawdziwa")
+        self._resolve(ClauseCause.TRUTH)
     
     def _logicFalseDetected(self):
         '''
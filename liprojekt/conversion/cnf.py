@@ -0,0 +1,239 @@
+# -*- coding: utf-8 -*-
+'''
+Moduł zawiera klasy kodujące formuły logiczne (formulas.Formula) w postaci
+CNF, czyli listy klauzul dysjunkcyjnych.
+
+Klauzula to krotka literałów zapisanych jako liczby (patrz literals.VariableTable).
+Z takiej listy klauzul korzystają silniki SAT (np. solvers.DPLLSolver).
+
+Koderzy:
+* ClauseTreeCNFEncoder -> CNF równoważna formule, może być wykładniczo duża
+* TseitinCNFEncoder    -> CNF równospełnialna, rozmiaru liniowego względem
+                          formuły, ze zmiennymi pomocniczymi (opcjonalnie
+                          z uwzględnieniem polaryzacji, Plaisted-Greenbaum)
+'''
+
+import logging
+
+from liprojekt.conversion.clauses import DisjunctionClause
+from liprojekt.conversion.literals import VariableTable
+from liprojekt.conversion.formulas import (LogicTruth, LogicFalse, LogicVariable,
+    NotOperation, AndOperation, OrOperation, ImplicationOperation, EquivalenceOperation)
+
+
+class CNFEncoder(object):
+    '''
+    Klasa bazowa koderów formuł do postaci CNF
+    '''
+
+    def __init__(self, formula, vtable=None):
+        '''
+        formula to kodowana formuła logiczna (formulas.Formula), vtable to
+        tablica zmiennych (literals.VariableTable) w której kodowane są literały
+        '''
+        self.formula = formula
+        if vtable is None:
+            vtable = VariableTable()
+        self.vtable = vtable
+        self.__clauses = None
+
+    def encode(self):
+        '''
+        zwróć listę klauzul CNF formuły (liczona tylko raz)
+        '''
+        if self.__clauses is None:
+            self.__clauses = self._encode()
+            logging.info("CNF formuły ma %d klauzul nad %d zmiennymi",
+                         len(self.__clauses), len(self.vtable))
+        return self.__clauses
+
+    def isAuxiliary(self, varId):
+        '''
+        czy zmienna o id varId jest zmienną pomocniczą kodera (nie występuje
+        w formule i nie powinna być wypisywana w raportach)
+        '''
+        return self.vtable.isAuxiliary(varId)
+
+    def _encode(self):
+        '''
+        metoda implementowana przez klasy dziedziczące
+        '''
+        pass
+
+
+class ClauseTreeCNFEncoder(CNFEncoder):
+    '''
+    Koder CNF oparty na półproduktach clauses.DisjunctionClause
+
+    Formuła rozwijana jest do postaci CNF tak samo jak przy sprawdzaniu czy jest
+    tautologią, tylko drzewo przechodzone jest w głąb i nie jest zapamiętywane.
+    Klauzule zawsze prawdziwe (zawierające zmienną i jej negację albo prawdę
+    logiczną) są pomijane. Rozmiar CNF może być wykładniczy względem formuły.
+    '''
+
+    def _encode(self):
+        clauses = []
+        seen = set()
+        stack = [DisjunctionClause(self.formula, vtable=self.vtable)]
+        while stack:
+            clause = stack.pop()
+            if clause.isResolved():
+                key = (clause.positive, clause.negative)
+                if clause.isFailure() and key not in seen:
+                    seen.add(key)
+                    clauses.append(tuple(clause.literals()))
+                continue
+            stack.extend(reversed(clause.convertStep()))
+        return clauses
+
+
+class TseitinCNFEncoder(CNFEncoder):
+    '''
+    Koder CNF Tseitina
+    
+    Każda operacja dwuargumentowa w formule (węzeł DAG) dostaje zmienną pomocniczą g
+    i klauzule wymuszające g <=> operacja, np. dla g <=> (a & b):
+        (~g | a), (~g | b), (g | ~a | ~b)
+    Negacja to zmiana znaku literału, a stałe logiczne kodowane są jedną zmienną
+    pomocniczą wymuszoną klauzulą jednoelementową. Na koniec dodawana jest
+    klauzula z literałem całej formuły.
+    
+    Współdzielone podformuły (formulas.Formula to DAG) kodowane są raz, więc CNF
+    ma rozmiar liniowy względem formuły i jest z nią równospełnialna. Wartościowanie
+    spełniające CNF obcięte do zmiennych formuły spełnia formułę.
+    
+    Z opcją polarity (kodowanie Plaisted-Greenbaum) dla węzła występującego w formule
+    tylko pozytywnie generowana jest tylko implikacja g => operacja, a dla węzła
+    występującego tylko negatywnie tylko operacja => g. Równoważność przekazuje
+    swoim argumentom obie polaryzacje.
+    '''
+    
+    POSITIVE, NEGATIVE = 1, 2
+    BOTH = POSITIVE | NEGATIVE
+    
+    def __init__(self, formula, vtable=None, polarity=False):
+        '''
+        polarity -> czy generować klauzule tylko dla polaryzacji w jakich węzeł
+        występuje w formule (Plaisted-Greenbaum)
+        '''
+        super(TseitinCNFEncoder, self).__init__(formula, vtable)
+        self.polarity = polarity
+        self.__trueLiteral = None
+    
+    def _encode(self):
+        order = self.__postOrder()
+        if self.polarity:
+            polarities = self.__polarities(order)
+        else:
+            polarities = None
+        
+        clauses = []
+        literals = {}
+        for node in order:
+            nodeClass = node.__class__
+            if nodeClass is LogicVariable:
+                literals[node] = self.vtable.literal(node)
+            elif nodeClass is LogicTruth:
+                literals[node] = self.__constantLiteral(clauses)
+            elif nodeClass is LogicFalse:
+                literals[node] = -self.__constantLiteral(clauses)
+            elif nodeClass is NotOperation:
+                literals[node] = -literals[node.subformula]
+            else:
+                left = literals[node.getLeftSubformula()]
+                right = literals[node.getRightSubformula()]
+                gate = self.vtable.newAuxiliaryVariable("tseitin")
+                if polarities is None:
+                    polarity = self.BOTH
+                else:
+                    polarity = polarities[node]
+                self.__gateClauses(clauses, nodeClass, gate, left, right, polarity)
+                literals[node] = gate
+        clauses.append((literals[self.formula],))
+        return clauses
+    
+    def __constantLiteral(self, clauses):
+        if self.__trueLiteral is None:
+            self.__trueLiteral = self.vtable.newAuxiliaryVariable("true")
+            clauses.append((self.__trueLiteral,))
+        return self.__trueLiteral
+    
+    def __gateClauses(self, clauses, nodeClass, g, a, b, polarity):
+        pos = polarity & self.POSITIVE
+        neg = polarity & self.NEGATIVE
+        if nodeClass is ImplicationOperation:
+            nodeClass, a = OrOperation, -a
+        if nodeClass is AndOperation:
+            if pos:
+                clauses.append((-g, a))
+                clauses.append((-g, b))
+            if neg:
+                clauses.append((g, -a, -b))
+        elif nodeClass is OrOperation:
+            if pos:
+                clauses.append((-g, a, b))
+            if neg:
+                clauses.append((g, -a))
+                clauses.append((g, -b))
+        elif nodeClass is EquivalenceOperation:
+            if pos:
+                clauses.append((-g, -a, b))
+                clauses.append((-g, a, -b))
+            if neg:
+                clauses.append((g, a, b))
+                clauses.append((g, -a, -b))
+        else:
+            raise TypeError("Nieobslugiwana formula " + str(nodeClass))
+    
+    def __postOrder(self):
+        '''
+        węzły DAG formuły, każdy raz, podformuły przed formułami (bez rekurencji)
+        '''
+        order = []
+        visited = set()
+        stack = [(self.formula, False)]
+        while stack:
+            node, expanded = stack.pop()
+            if expanded:
+                order.append(node)
+                continue
+            if node in visited:
+                continue
+            visited.add(node)
+            stack.append((node, True))
+            for subformula in reversed(node.subformulas):
+                if subformula not in visited:
+                    stack.append((subformula, False))
+        return order
+    
+    def __polarities(self, order):
+        '''
+        polaryzacje węzłów DAG, przechodząc od formuły do podformuł
+        '''
+        flip = {self.POSITIVE: self.NEGATIVE, self.NEGATIVE: self.POSITIVE,
+                self.BOTH: self.BOTH}
+        polarities = dict((node, 0) for node in order)
+        polarities[self.formula] = self.POSITIVE
+        for node in reversed(order):
+            polarity = polarities[node]
+            nodeClass = node.__class__
+            if nodeClass is NotOperation:
+                subpolarities = [flip[polarity]]
+            elif nodeClass is ImplicationOperation:
+                subpolarities = [flip[polarity], polarity]
+            elif nodeClass is EquivalenceOperation:
+                subpolarities = [self.BOTH, self.BOTH]
+            else:
+                subpolarities = [polarity] * len(node.subformulas)
+            for subformula, subpolarity in zip(node.subformulas, subpolarities):
+                polarities[subformula] |= subpolarity
+        return polarities
+
+
+class PlaistedGreenbaumCNFEncoder(TseitinCNFEncoder):
+    '''
+    Koder CNF Tseitina z uwzględnieniem polaryzacji (Plaisted-Greenbaum)
+    '''
+    
+    def __init__(self, formula, vtable=None):
+        super(PlaistedGreenbaumCNFEncoder, self).__init__(formula, vtable, polarity=True)
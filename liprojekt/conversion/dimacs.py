@@ -0,0 +1,239 @@
+# -*- coding: utf-8 -*-
+'''
+Moduł zawiera odczyt i zapis formuł w postaci CNF w formacie DIMACS:
+
+    c komentarz
+    p cnf <ilość zmiennych> <ilość klauzul>
+    1 -2 3 0
+    -1 2 0
+
+Klauzula to ciąg literałów (liczb całkowitych, patrz literals.VariableTable)
+zakończony zerem, może zajmować kilka linii.
+
+* ClauseStore    -> zwarty magazyn klauzul (jedna tablica liczb)
+* DimacsReader   -> odczyt pliku DIMACS przez mmap, kawałkami, bez tworzenia
+                    formuł formulas.Formula
+* writeDimacs    -> zapis klauzul w formacie DIMACS
+* formula2dimacs -> zapis formuły w formacie DIMACS, przez koder CNF (cnf.CNFEncoder)
+'''
+
+import logging
+import mmap
+import re
+from array import array
+
+from liprojekt.conversion.cnf import TseitinCNFEncoder
+from liprojekt.conversion.literals import VariableTable
+
+
+class ClauseStore(object):
+    '''
+    Zwarty magazyn klauzul CNF
+
+    Literały wszystkich klauzul trzymane są w jednej tablicy array('i'),
+    każda klauzula zakończona jest zerem (tak jak w formacie DIMACS).
+    Iteracja po magazynie zwraca klauzule jako krotki literałów, więc magazyn
+    można przekazać silnikowi SAT (solvers.SatSolver) albo do writeDimacs.
+
+    UWAGA!! zwarty jest tylko magazyn: silnik SAT kopiuje klauzule do własnych
+    list (i struktur obserwowanych literałów), więc pamięć weryfikacji jest
+    wielokrotnie większa niż plik DIMACS.
+    '''
+
+    def __init__(self, numVars=0):
+        self.literals = array('i')
+        self.numVars = numVars
+        self.__count = 0
+
+    def append(self, clause):
+        '''
+        dodaj klauzulę (ciąg literałów bez kończącego zera)
+        '''
+        self.literals.extend(clause)
+        self.literals.append(0)
+        self.__count += 1
+        if clause:
+            self.numVars = max(self.numVars, max(abs(lit) for lit in clause))
+
+    def extend(self, literals):
+        '''
+        dodaj ciąg literałów z kończącymi klauzule zerami (np. z pliku DIMACS)
+        '''
+        chunk = array('i', literals)
+        if not chunk:
+            return
+        self.literals.extend(chunk)
+        self.__count += chunk.count(0)
+        self.numVars = max(self.numVars, max(chunk), -min(chunk))
+
+    def close(self):
+        '''
+        zakończ ostatnią klauzulę, jeżeli nie kończy jej zero
+        '''
+        if self.literals and self.literals[-1] != 0:
+            self.literals.append(0)
+            self.__count += 1
+
+    def isValid(self):
+        '''
+        czy CNF jest tautologią (każda klauzula zawiera zmienną i jej negację)
+        '''
+        for clause in self:
+            lits = set(clause)
+            if not any(-lit in lits for lit in lits):
+                return False
+        return True
+
+    def __iter__(self):
+        clause = []
+        for lit in self.literals:
+            if lit == 0:
+                yield tuple(clause)
+                clause = []
+            else:
+                clause.append(lit)
+
+    def __len__(self):
+        '''
+        ilość klauzul
+        '''
+        return self.__count
+
+
+class DimacsReader(object):
+    '''
+    Odczyt pliku w formacie DIMACS CNF
+
+    Plik mapowany jest do pamięci (mmap) i czytany kawałkami po CHUNK_SIZE
+    bajtów (do końca linii). Kawałek bez komentarzy i nagłówka zamieniany jest
+    na liczby w całości, bez przechodzenia po liniach, więc podczas odczytu
+    w pamięci jest tylko bieżący kawałek tekstu i zwarty magazyn klauzul
+    (ClauseStore).
+
+    Znak `%` na początku linii kończy formułę (format SATLIB).
+    '''
+
+    CHUNK_SIZE = 1 << 20
+
+    SPECIAL_LINE = re.compile(r'^[ \t]*[^-0-9\s]', re.M)
+    '''
+    linia, która nie zawiera samych literałów (komentarz, nagłówek, `%`)
+    '''
+
+    def __init__(self, fileName, chunkSize=None):
+        self.fileName = fileName
+        self.chunkSize = chunkSize or self.CHUNK_SIZE
+        self.header = None
+
+    def read(self):
+        '''
+        wczytaj plik, zwraca magazyn klauzul (ClauseStore)
+        '''
+        store = ClauseStore()
+        with open(self.fileName, 'rb') as f:
+            f.seek(0, 2)
+            if f.tell() == 0:
+                raise Exception("Plik DIMACS " + self.fileName + " jest pusty")
+            data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            try:
+                pos = 0
+                while pos < len(data):
+                    end = data.find('\n', min(pos + self.chunkSize, len(data)))
+                    end = len(data) if end < 0 else end + 1
+                    if not self.__parseChunk(data[pos:end], store):
+                        break
+                    pos = end
+            finally:
+                data.close()
+        store.close()
+        self.__checkHeader(store)
+        return store
+
+    def __parseChunk(self, chunk, store):
+        '''
+        dodaj literały z kawałka pliku do magazynu, zwraca False jeżeli
+        napotkano koniec formuły (`%`)
+        '''
+        if self.SPECIAL_LINE.search(chunk) is None:
+            store.extend(self.__literals(chunk))
+            return True
+        body = []
+        finished = False
+        for line in chunk.splitlines():
+            stripped = line.strip()
+            if not stripped or stripped[0] == 'c':
+                continue
+            if stripped[0] == '%':
+                finished = True
+                break
+            if stripped[0] == 'p':
+                self.__parseHeader(stripped)
+                continue
+            body.append(stripped)
+        store.extend(self.__literals(" ".join(body)))
+        return not finished
+
+    def __literals(self, text):
+        try:
+            return map(int, text.split())
+        except ValueError:
+            raise Exception("Niepoprawny literał w pliku DIMACS " + self.fileName)
+
+    def __parseHeader(self, line):
+        fields = line.split()
+        if self.header is not None or len(fields) != 4 or fields[1] != 'cnf':
+            raise Exception("Niepoprawny nagłówek pliku DIMACS: " + line)
+        try:
+            self.header = (int(fields[2]), int(fields[3]))
+        except ValueError:
+            raise Exception("Niepoprawny nagłówek pliku DIMACS: " + line)
+
+    def __checkHeader(self, store):
+        if self.header is None:
+            logging.warning("Plik DIMACS %s nie ma nagłówka `p cnf`", self.fileName)
+            return
+        numVars, numClauses = self.header
+        if store.numVars > numVars:
+            logging.warning("Plik DIMACS zawiera %d zmiennych, nagłówek podaje %d",
+                            store.numVars, numVars)
+        store.numVars = max(store.numVars, numVars)
+        if len(store) != numClauses:
+            logging.warning("Plik DIMACS zawiera %d klauzul, nagłówek podaje %d",
+                            len(store), numClauses)
+
+
+def writeDimacs(stream, clauses, numVars, comments=(), batchSize=4096):
+    '''
+    zapisz klauzule clauses (ciągi literałów) nad numVars zmiennymi
+    do otwartego pliku stream w formacie DIMACS
+
+    Klauzule zapisywane są porcjami po batchSize, clauses to lista klauzul
+    albo magazyn ClauseStore.
+    '''
+    for comment in comments:
+        stream.write("c " + comment + "\n")
+    stream.write("p cnf %d %d\n" % (numVars, len(clauses)))
+    batch = []
+    for clause in clauses:
+        batch.append(" ".join(map(str, clause)) + " 0\n")
+        if len(batch) >= batchSize:
+            stream.write("".join(batch))
+            batch = []
+    stream.write("".join(batch))
+
+
+def formula2dimacs(stream, formula, encoderClass=TseitinCNFEncoder):
+    '''
+    zapisz formułę (formulas.Formula) w formacie DIMACS, przez koder CNF
+    encoderClass (domyślnie kodowanie Tseitina)
+
+    Nazwy zmiennych formuły zapisywane są w komentarzach `c <id> <nazwa>`.
+    Zwraca użyty koder.
+    '''
+    vtable = VariableTable()
+    encoder = encoderClass(formula, vtable)
+    clauses = encoder.encode()
+    comments = ["%d %s" % (varId, vtable.name(varId)) for varId in vtable.variableIds()
+                if not encoder.isAuxiliary(varId)]
+    writeDimacs(stream, clauses, len(vtable), comments)
+    return encoder
@@ -8,6 +8,8 @@ Moduł służy do formatowania formuł logicznych klasy
 formulas.Formula na stringi
 '''
 
+import copy
+
 from liprojekt.conversion.formulas import (AndOperation, OrOperation, NotOperation,
     EquivalenceOperation, ImplicationOperation,  
     LogicFalse, LogicTruth, LogicVariable)
@@ -24,6 +26,7 @@ class FormulaFormatter(object):
         Constructor
         '''
         self.alphabet = alphabet
+        self.names = None
         
         self.handleMap = \
         {
@@ -38,56 +41,173 @@ class FormulaFormatter(object):
          }
         
 
-    def formula2str(self, formula):
-        return self.handleMap[formula.__class__](formula)
+    def formula2str(self, formula, names=None):
+        '''
+        formatuj formułę bez rekurencji
+        
+        Na stosie leżą formuły do sformatowania i gotowe fragmenty tekstu,
+        formuła zamieniana jest na ciąg fragmentów i podformuł (handleMap),
+        a fragmenty dopisywane są do wyniku w kolejności. Czas i pamięć są
+        liniowe względem długości wyniku, niezależnie od głębokości formuły.
+        
+        names -> słownik podformuła -> nazwa, formuła i jej podformuły z tego
+        słownika wypisywane są nazwą (patrz formula2defs), domyślnie słownik
+        formatera (withNames)
+        '''
+        if names is None:
+            names = self.names
+        pieces = []
+        stack = [formula]
+        while stack:
+            item = stack.pop()
+            if isinstance(item, basestring):
+                pieces.append(item)
+            elif names is not None and item in names:
+                pieces.append(names[item])
+            else:
+                stack.extend(reversed(self.handleMap[item.__class__](item)))
+        return "".join(pieces)
+    
+    def formula2defs(self, formula, minSize=0):
+        '''
+        formatuj formułę z definicjami nazwanych podformuł (alphabet.getDefinitionFormat)
+        
+        Podformuły występujące w formule (DAG) w wielu miejscach wypisywane są raz,
+        jako definicje poprzedzające formułę, a w formule zastępuje je nazwa.
+        Długość wyniku jest liniowa względem ilości węzłów DAG, a nie drzewa formuły.
+        Jeżeli formuła rozwinięta do drzewa ma co najwyżej minSize węzłów,
+        formatowana jest bez definicji (formula2str).
+        '''
+        definitions, names = self.formulas2defs([formula], minSize)
+        return definitions + self.formula2str(formula, names)
+    
+    def formulas2defs(self, formulas, minSize=0):
+        '''
+        definicje podformuł wspólnych dla formuł formulas, zwraca parę
+        (tekst definicji, słownik podformuła -> nazwa)
+        
+        Nazwane są podformuły występujące w wielu miejscach (także jako kilka
+        elementów formulas). Jeżeli formuły rozwinięte do drzew mają razem
+        co najwyżej minSize węzłów, nie ma definicji: ('', {}).
+        '''
+        order, parents, size = self.__dagStats(formulas)
+        if size <= minSize:
+            return "", {}
+        
+        used = set(node.name for node in order if isinstance(node, LogicVariable))
+        used |= self.alphabet.getReservedWords()
+        names = {}
+        pieces = []
+        number = 0
+        for node in order:
+            if parents[node] < 2 or not node.subformulas or \
+                    (isinstance(node, NotOperation) and not node.subformula.subformulas):
+                continue
+            number += 1
+            while "d%d" % number in used:
+                number += 1
+            name = "d%d" % number
+            pieces.append(self.alphabet.getDefinitionFormat().format(
+                name=name, formula=self.formula2str(node, names),
+                **self.alphabet.getDefinitions()).lstrip())
+            names[node] = name
+        return "".join(pieces), names
+    
+    def withNames(self, names):
+        '''
+        kopia formatera wypisująca podformuły ze słownika names nazwą
+        (np. w klauzulach drzewa konwersji, patrz formulas2defs)
+        '''
+        formatter = copy.copy(self)
+        formatter.names = names
+        return formatter
+    
+    def __dagStats(self, formulas):
+        '''
+        węzły DAG formuł (podformuły przed formułami), ilość wystąpień każdego
+        węzła jako podformuły albo elementu formulas i ilość węzłów formuł
+        rozwiniętych do drzew
+        '''
+        order = []
+        parents = {}
+        stack = []
+        for formula in formulas:
+            if formula not in parents:
+                parents[formula] = 0
+                stack.append(formula)
+            parents[formula] += 1
+        stack.reverse()
+        sizes = {}
+        while stack:
+            node = stack[-1]
+            if node in sizes:
+                stack.pop()
+                continue
+            pending = [f for f in node.subformulas if f not in sizes]
+            if pending:
+                stack.extend(pending)
+                continue
+            stack.pop()
+            sizes[node] = 1 + sum(sizes[f] for f in node.subformulas)
+            for f in node.subformulas:
+                parents[f] = parents.get(f, 0) + 1
+            order.append(node)
+        return order, parents, sum(sizes[f] for f in formulas)
+    
+    def literal2str(self, literal, vtable):
+        '''
+        formatuj literał zapisany jako liczba, vtable to tablica zmiennych
+        (literals.VariableTable) z której pochodzi literał
+        '''
+        return self.__formatLiteral(vtable.name(literal), literal < 0)
+    
+    def __formatLiteral(self, name, isNegated):
+        if isNegated:
+            attars = {'subformula': name,
+                      'not': self.alphabet.getOperatorSymbol('not')}
+            return self.alphabet.getNotFormat().format(**attars)
+        return name
     
     def __prepSymbol(self, symbol):
         return " "+symbol+" "
     
-    def __putInParenths(self, strform):
-        return  self.alphabet.getParenthesisSymbol("(")+ \
-                strform+                                     \
-                self.alphabet.getParenthesisSymbol(")")
+    def __formatBinary(self, formula, key):
+        parts = [self.alphabet.getParenthesisSymbol("(")]
+        symbol = self.__prepSymbol(self.alphabet.getOperatorSymbol(key))
+        for i, subformula in enumerate(formula.subformulas):
+            if i:
+                parts.append(symbol)
+            parts.append(subformula)
+        parts.append(self.alphabet.getParenthesisSymbol(")"))
+        return parts
+    
     # Consts
     def __formatLogicTruthFormula(self, formula):
-        return (self.alphabet.getConstantSymbol('true'))
+        return [self.alphabet.getConstantSymbol('true')]
     
     def __formatLogicFalseFormula(self, formula):
-        return (self.alphabet.getConstantSymbol('false'))
+        return [self.alphabet.getConstantSymbol('false')]
     
     # Var
     def __formatLogicVariableFormula(self, formula):
-        if formula.isNegated:
-            attars = {'subformula': formula.name,
-                      'not': self.alphabet.getOperatorSymbol('not')}
-            return self.alphabet.getNotFormat().format(**attars)
-        return formula.name
+        return [self.__formatLiteral(formula.name, formula.isNegated)]
     
     # Unary
     def __formatNotFormula(self, formula):
-        attars = {'subformula': self.formula2str(formula.subformula),
-                  'not': self.alphabet.getOperatorSymbol('not')}
-        return self.alphabet.getNotFormat().format(**attars)
+        before, after = self.alphabet.getNotFormat().split('{subformula}')
+        symbol = self.alphabet.getOperatorSymbol('not')
+        return [before.format(**{'not': symbol}), formula.subformula,
+                after.format(**{'not': symbol})]
     
     # Binary
     def __formatAndFormula(self, formula):
-        return self.__putInParenths(
-                    (self.__prepSymbol(self.alphabet.getOperatorSymbol('and'))).join(
-                                  map(self.formula2str, formula.subformulas)))
+        return self.__formatBinary(formula, 'and')
     
     def __formatOrFormula(self, formula):
-        return self.__putInParenths(
-                    (self.__prepSymbol(self.alphabet.getOperatorSymbol('or'))).join(
-                                  map(self.formula2str, formula.subformulas)))
-    
+        return self.__formatBinary(formula, 'or')
     
     def __formatEquFormula(self, formula):
-        return self.__putInParenths(
-                    (self.__prepSymbol(self.alphabet.getOperatorSymbol('equ'))).join(
-                                  map(self.formula2str, formula.subformulas)))
+        return self.__formatBinary(formula, 'equ')
     
     def __formatImpFormula(self, formula):
-        return self.__putInParenths(
-                    (self.__prepSymbol(self.alphabet.getOperatorSymbol('impL'))).join(
-                                  map(self.formula2str, formula.subformulas)))
-    
\ No newline at end of file
+        return self.__formatBinary(formula, 'impL')
@@ -11,11 +11,81 @@ logicznych i operandów
 operacjie logiczne := NOT, AND, OR, EQU, IMP
 operandy           := TRUE, FALSE, <zmienna logiczna>, <formula logiczna>
 <formula logiczna> :=  <operand> <operacja logiczna> <operand> albo NOT <operand>
+
+Formuły są niemutowalne i współdzielone (hash-consing). Utworzenie formuły
+identycznej strukturalnie z formułą już istniejącą zwraca istniejący obiekt,
+więc formuły tworzą graf DAG, a porównanie formuł sprowadza się do porównania
+tożsamości obiektów.
 '''
 
 
-from copy import copy, deepcopy
 import logging
+import weakref
+
+
+def memoized(method):
+    '''
+    Dekorator bezargumentowej metody formuły, zapamiętuje jej wynik w formule
+
+    Formuły są niemutowalne, więc wynik np. negate() lub makeSimple() liczony
+    jest dla każdej formuły (węzła DAG) co najwyżej raz.
+
+    Metoda wywołuje zapamiętywane metody innych formuł (Formula._dependencies),
+    więc wyniki liczone są bez rekurencji: na stosie leżą pary (formuła, nazwa
+    metody), a metoda formuły wywoływana jest dopiero, gdy wszystkie jej zależności
+    są już zapamiętane. Głębokość formuły nie jest ograniczona stosem wywołań.
+    '''
+    name = method.__name__
+    attr = '_memo_' + name
+    def wrapper(self):
+        try:
+            return self.__dict__[attr]
+        except KeyError:
+            pass
+        stack = [(self, name)]
+        while stack:
+            formula, current = stack[-1]
+            if formula._isMemoized(current):
+                stack.pop()
+                continue
+            pending = [(f, n) for f, n in formula._dependencies(current)
+                       if not f._isMemoized(n)]
+            if pending:
+                stack.extend(pending)
+                continue
+            stack.pop()
+            formula.__dict__['_memo_' + current] = \
+                getattr(formula.__class__, current).method(formula)
+        return self.__dict__[attr]
+    wrapper.__name__ = name
+    wrapper.__doc__ = method.__doc__
+    wrapper.method = method
+    return wrapper
+
+
+class FormulaMeta(type):
+    '''
+    Metaklasa formuł logicznych
+
+    Odpowiada za współdzielenie formuł (hash-consing). Każda klasa formuł ma
+    słownik swoich instancji, w którym kluczem są argumenty konstruktora
+    (podformuły porównywane są po tożsamości). Słownik trzyma słabe referencje,
+    więc nieużywane formuły są zwalniane.
+    '''
+
+    def __init__(cls, name, bases, attrs):
+        super(FormulaMeta, cls).__init__(name, bases, attrs)
+        cls._instances = weakref.WeakValueDictionary()
+
+    def __call__(cls, *args):
+        key = cls._consKey(*args)
+        try:
+            return cls._instances[key]
+        except KeyError:
+            formula = super(FormulaMeta, cls).__call__(*key)
+            formula._args = key
+            cls._instances[key] = formula
+            return formula
 
 class FormulaFactory(object):
     '''
@@ -71,22 +141,170 @@ class FormulaFactory(object):
     def createEquvalenceOperation(self, tokens):
         return self.__listToTree(EquivalenceOperation, tokens[0][0::2])
 
+class SimplifyingFormulaFactory(FormulaFactory):
+    '''
+    Fabryka formuł logicznych upraszczająca formuły podczas parsowania
+    
+    Zamiast formuły zapisanej w tekście tworzona jest formuła równoważna:
+    * stałe są zwijane: p & T = p, p & F = F, p | T = T, p => T = T, T => p = p ...
+    * podwójna negacja jest usuwana, negacja zmiennej jest literałem
+    * powtórzone argumenty ciągu koniunkcji / dysjunkcji są pomijane: p & q & p = p & q
+    * x & ~x = F, x | ~x = T, p => p = T, p <=> p = T, p <=> ~p = F
+    
+    Uproszczenia dotyczą tylko węzła tworzonego w danej chwili (i argumentów
+    jednego ciągu operatorów), więc koszt jest stały na każdy węzeł formuły.
+    '''
+    
+    def __isComplement(self, left, right):
+        '''
+        czy right jest zaprzeczeniem left
+        '''
+        if isinstance(left, NotOperation) and left.subformula is right:
+            return True
+        if isinstance(right, NotOperation) and right.subformula is left:
+            return True
+        return isinstance(left, LogicVariable) and isinstance(right, LogicVariable) and \
+            left.name == right.name and left.isNegated != right.isNegated
+    
+    def __negation(self, formula):
+        if isinstance(formula, (LogicConst, LogicVariable)):
+            return formula.negate()
+        if isinstance(formula, NotOperation):
+            return formula.subformula
+        return NotOperation(formula)
+    
+    def __chain(self, BinOperation, formulas, absorbing, neutral):
+        '''
+        ciąg koniunkcji (dysjunkcji) formulas bez powtórzeń i elementów
+        neutralnych, element pochłaniający albo para x, ~x daje absorbing
+        '''
+        operands = []
+        seen = set()
+        for formula in formulas:
+            if isinstance(formula, absorbing):
+                return formula
+            if isinstance(formula, neutral) or id(formula) in seen:
+                continue
+            seen.add(id(formula))
+            operands.append(formula)
+        for formula in operands:
+            if isinstance(formula, NotOperation):
+                complement = formula.subformula
+            elif isinstance(formula, LogicVariable):
+                complement = formula.negate()
+            else:
+                continue
+            if id(complement) in seen:
+                return absorbing()
+        if not operands:
+            return neutral()
+        formula = operands[0]
+        for subf in operands[1:]:
+            formula = BinOperation(formula, subf)
+        return formula
+    
+    def __implication(self, left, right):
+        if isinstance(left, LogicFalse) or isinstance(right, LogicTruth) or left is right:
+            return LogicTruth()
+        if isinstance(left, LogicTruth):
+            return right
+        if isinstance(right, LogicFalse):
+            return self.__negation(left)
+        if self.__isComplement(left, right):
+            # (~p => p) = p, (p => ~p) = ~p
+            return right
+        return ImplicationOperation(left, right)
+    
+    def __equivalence(self, left, right):
+        if left is right:
+            return LogicTruth()
+        if self.__isComplement(left, right):
+            return LogicFalse()
+        for const, other in ((left, right), (right, left)):
+            if isinstance(const, LogicTruth):
+                return other
+            if isinstance(const, LogicFalse):
+                return self.__negation(other)
+        return EquivalenceOperation(left, right)
+    
+    def createNotOperation(self, tokens):
+        return self.__negation(tokens[0][1])
+    
+    def createAndOperation(self, tokens):
+        return self.__chain(AndOperation, tokens[0][0::2], LogicFalse, LogicTruth)
+    
+    def createOrOperation(self, tokens):
+        return self.__chain(OrOperation, tokens[0][0::2], LogicTruth, LogicFalse)
+    
+    def createImpicationOperation(self, tokens):
+        formulas = list(tokens[0][0::2])
+        formula = formulas.pop()
+        while formulas:
+            formula = self.__implication(formulas.pop(), formula)
+        return formula
+    
+    def createEquvalenceOperation(self, tokens):
+        formulas = tokens[0][0::2]
+        formula = formulas[0]
+        for subf in formulas[1:]:
+            formula = self.__equivalence(formula, subf)
+        return formula
+
 class Formula(object):
     '''
     Formuła logiczna, klasa wirtualna
     '''
+    
+    __metaclass__ = FormulaMeta
 
-
-    def __init__(self, subformulas=[]):
+    def __init__(self, subformulas=()):
         '''
         Formuła logiczna powstałe z podformuł logicznych (klasy Formula)
+        
+        Podformuły nie są kopiowane, tylko współdzielone
         '''
-        self._subformulas = map(deepcopy, subformulas)
+        self._subformulas = tuple(subformulas)
+
+    @classmethod
+    def _consKey(cls, *args):
+        '''
+        klucz pod którym formuła trzymana jest w słowniku instancji klasy
+        '''
+        return args
+    
+    def __copy__(self):
+        return self
+    
+    def __deepcopy__(self, memo):
+        return self
+    
+    def __reduce__(self):
+        return (self.__class__, self._args)
 
-        
 
     def __str__(self):
-        return "BASE FORMULA"
+        '''
+        tekst formuły bez rekurencji
+        
+        Formuła zamieniana jest na ciąg fragmentów i podformuł (_strParts),
+        fragmenty dopisywane są do wyniku w kolejności (jak w
+        FormulaFormatter.formula2str).
+        '''
+        pieces = []
+        stack = [self]
+        while stack:
+            item = stack.pop()
+            if isinstance(item, basestring):
+                pieces.append(item)
+            else:
+                stack.extend(reversed(item._strParts()))
+        return "".join(pieces)
+    
+    def _strParts(self):
+        '''
+        fragmenty tekstu formuły i jej podformuły
+        '''
+        return ["BASE FORMULA"]
     
     @property
     def subformulas(self):
@@ -116,12 +334,51 @@ class Formula(object):
         '''
         return self
 
-    
-  
+    def evaluate(self, valuation):
+        '''
+        Wartość logiczna formuły przy wartościowaniu valuation
+        
+        valuation to słownik nazwa zmiennej -> True/False, zmienne których nie ma
+        w słowniku są fałszywe. Każdy węzeł DAG liczony jest raz (bez rekurencji).
+        '''
+        values = {}
+        stack = [self]
+        while stack:
+            formula = stack[-1]
+            if formula in values:
+                stack.pop()
+                continue
+            pending = [f for f in formula.subformulas if f not in values]
+            if pending:
+                stack.extend(pending)
+                continue
+            stack.pop()
+            values[formula] = formula._evaluate(
+                [values[f] for f in formula.subformulas], valuation)
+        return values[self]
+
+    def _isMemoized(self, name):
+        '''
+        czy wynik metody name jest znany bez rekurencji (metoda nie jest
+        zapamiętywana albo jej wynik jest już zapamiętany)
+        '''
+        return not hasattr(getattr(self.__class__, name), 'method') or \
+            '_memo_' + name in self.__dict__
+
+    def _dependencies(self, name):
+        '''
+        pary (formuła, nazwa metody), których wyniki wywołuje zapamiętywana
+        metoda name tej formuły (patrz memoized)
+        '''
+        return []
 
-###   TODO
-#    def __deepcopy__(self):
-#        pass 
+    def _evaluate(self, subvalues, valuation):
+        '''
+        metoda virtualna
+        
+        Wartość formuły na podstawie wartości podformuł subvalues
+        '''
+        pass
 
 ###########################################################################################
 
@@ -145,8 +402,11 @@ class LogicTruth(LogicConst):
     classdocs
     '''
     
-    def __str__(self):
-        return "<TRUE>"
+    def _strParts(self):
+        return ["<TRUE>"]
+    
+    def _evaluate(self, subvalues, valuation):
+        return True
    
     def negate(self):
         '''
@@ -160,8 +420,11 @@ class LogicFalse(LogicConst):
     classdocs
     '''
     
-    def __str__(self):
-        return "<FALSE>"
+    def _strParts(self):
+        return ["<FALSE>"]
+    
+    def _evaluate(self, subvalues, valuation):
+        return False
     
 
     def negate(self):
@@ -179,33 +442,23 @@ class LogicVariable(Formula):
     Właściwie jest to literał, bo może być to zmienna zanegowana.
     '''
     
-    
-    MAGIC_TRUE  = 't'
-    MAGIC_FALSE = 'f'
     def __init__(self, name, isNegated=False):
         '''
         Przy towrzniu zmiennej podawana jest jej nazwa w postaci łańcucha znaków
         
-        Zmienna rozpoznawana jest po hashu. Przy czym hash(~~p) = hash(p)
+        Literał o danej nazwie i znaku istnieje tylko raz, więc ~~p jest p
         '''
         super(LogicVariable, self).__init__()
         self.name = name
         self.isNegated = isNegated
-        self.__hash = self.__computeHash()
     
-    def __computeHash(self):
-        if self.isNegated:
-            return hash(LogicVariable.MAGIC_FALSE+self.name)
-        else:
-            return hash(LogicVariable.MAGIC_TRUE+self.name)
+    @classmethod
+    def _consKey(cls, name, isNegated=False):
+        return (name, bool(isNegated))
     
-    def __negate(self):
-        self.isNegated = not self.isNegated
-        self.__hash = self.__computeHash()
-        return self
-        
+    @memoized
     def negate(self):      
-        return copy(self).__negate()
+        return LogicVariable(self.name, not self.isNegated)
           
     def makeSimple(self):
         '''
@@ -213,16 +466,13 @@ class LogicVariable(Formula):
         '''
         return self
     
-    def __hash__(self):
-        return self.__hash
-    
-    def __eq__(self, other):
-        return isinstance(other, self.__class__) and hash(self) == hash(other)
+    def _evaluate(self, subvalues, valuation):
+        return valuation.get(self.name, False) != self.isNegated
         
-    def __str__(self):
+    def _strParts(self):
         if self.isNegated:
-            return "<~"+self.name+"[id"+str(id(self))+"hash"+str(hash(self))+"]>" 
-        return "<"+self.name+"[id"+str(id(self))+"hash"+str(hash(self))+"]>" #TODO
+            return ["<~"+self.name+"[id"+str(id(self))+"hash"+str(hash(self))+"]>"]
+        return ["<"+self.name+"[id"+str(id(self))+"hash"+str(hash(self))+"]>"] #TODO
                 
 ###########################################################################################
 
@@ -256,16 +506,28 @@ class NotOperation(UnaryOperation):
         '''
         return self.subformula
     
-
+    @memoized
     def makeSimple(self):
         '''
         Negacja przesuwana jest w dół.
+        
+        Zaprzeczenie negacji to jej podformuła, która też może wymagać uproszczenia
+        (np. ~~(p <=> q)).
         '''
-        return self.subformula.negate()
+        return self.subformula.negate().makeSimple()
     
+    def _dependencies(self, name):
+        negation = self.subformula
+        if not negation._isMemoized('negate'):
+            return [(negation, 'negate')]
+        return [(negation.negate(), 'makeSimple')]
     
-    def __str__(self):
-        return "<NOT "+ str(self.subformula)+">"
+    def _evaluate(self, subvalues, valuation):
+        return not subvalues[0]
+    
+    
+    def _strParts(self):
+        return ["<NOT ", self.subformula, ">"]
 
 
 
@@ -294,11 +556,32 @@ class BinaryOperation(Formula):
         '''
         return self._subformulas[1]
     
+    def _strParts(self):
+        parts = ["("]
+        for i, subformula in enumerate(self.subformulas):
+            if i:
+                parts.append(self.SYMBOL)
+            parts.append(subformula)
+        parts.append(")")
+        return parts
+    
+    def _negatedSubformulas(self):
+        return [(self.getLeftSubformula(), 'negate'),
+                (self.getRightSubformula(), 'negate')]
+    
+    def _simpleNegation(self):
+        if not self._isMemoized('makeSimple'):
+            return [(self, 'makeSimple')]
+        return [(self.makeSimple(), 'negate')]
+    
 class AndOperation(BinaryOperation):
     '''
     Operacja koniunkcji
     '''
     
+    SYMBOL = " AND "
+    
+    @memoized
     def negate(self):
         '''
         ~(a & b) = ~a | ~b
@@ -310,6 +593,9 @@ class AndOperation(BinaryOperation):
                     ,
                     self.getRightSubformula().negate()
                 )
+    
+    def _dependencies(self, name):
+        return self._negatedSubformulas()
         
     def makeSimple(self):
         '''
@@ -318,15 +604,18 @@ class AndOperation(BinaryOperation):
         return self
     
 
-    def __str__(self):
-        return "("+" AND ".join(map(str, self.subformulas))+")"
+    def _evaluate(self, subvalues, valuation):
+        return subvalues[0] and subvalues[1]
 
 
 class OrOperation(BinaryOperation):
     '''
     Operacja dysjunkcji
     '''
+    
+    SYMBOL = " OR "
 
+    @memoized
     def negate(self):
         '''
         ~(a | b) = ~a & ~b
@@ -339,6 +628,9 @@ class OrOperation(BinaryOperation):
                     self.getRightSubformula().negate()
                 )
     
+    def _dependencies(self, name):
+        return self._negatedSubformulas()
+    
     def makeSimple(self):
         '''
         Już w najprostrzej postaci
@@ -346,18 +638,22 @@ class OrOperation(BinaryOperation):
         return self
     
 
-    def __str__(self):
-        return "("+" OR ".join(map(str, self.subformulas))+")"
+    def _evaluate(self, subvalues, valuation):
+        return subvalues[0] or subvalues[1]
 
 
 class EquivalenceOperation(BinaryOperation):
     '''
     Operacja równoważności
     '''
+    
+    SYMBOL = " EQL "
 
+    @memoized
     def negate(self):
         return self.makeSimple().negate()
     
+    @memoized
     def makeSimple(self):
         '''
         (a <=> b) = (a & b) | (~a & ~b)
@@ -373,9 +669,14 @@ class EquivalenceOperation(BinaryOperation):
                     )
                 )
     
+    def _dependencies(self, name):
+        if name == 'negate':
+            return self._simpleNegation()
+        return self._negatedSubformulas()
+    
 
-    def __str__(self):
-        return "("+" EQL ".join(map(str, self.subformulas))+")"
+    def _evaluate(self, subvalues, valuation):
+        return subvalues[0] == subvalues[1]
 
 
     
@@ -383,10 +684,14 @@ class ImplicationOperation(BinaryOperation):
     '''
     Operacja implikacj
     '''
+    
+    SYMBOL = " IMP "
 
+    @memoized
     def negate(self):
         return self.makeSimple().negate()
     
+    @memoized
     def makeSimple(self):
         '''
         (a => b) = ~a | b
@@ -395,9 +700,14 @@ class ImplicationOperation(BinaryOperation):
                     self.getLeftSubformula().negate(),
                     self.getRightSubformula()
                 )
+    
+    def _dependencies(self, name):
+        if name == 'negate':
+            return self._simpleNegation()
+        return [(self.getLeftSubformula(), 'negate')]
 
 
-    def __str__(self):
-        return "("+" IMP ".join(map(str, self.subformulas))+")"
+    def _evaluate(self, subvalues, valuation):
+        return not subvalues[0] or subvalues[1]
 
 ###########################################
@@ -0,0 +1,171 @@
+# -*- coding: utf-8 -*-
+'''
+Moduł zawiera tablicę zmiennych logicznych, która pozwala zapisywać
+literały jako liczby całkowite.
+
+Każda zmienna logiczna dostaje kolejny numer (id) 1, 2, 3, ...
+Literał zapisywany jest jako liczba ze znakiem:
+* id  -> zmienna p
+* -id -> negacja zmiennej ~p
+
+Dzięki temu negacja literału to zmiana znaku, a sprawdzenie czy dwa
+literały są przeciwne to porównanie liczb. Nazwy zmiennych potrzebne
+są dopiero przy wypisywaniu raportów.
+
+Zbiór literałów można zapisać jako parę masek bitowych (liczb całkowitych):
+zmienne niezanegowane i zanegowane, bit o numerze id zmiennej. Wykrycie zmiennej
+i jej negacji w zbiorze to wtedy jedna koniunkcja bitowa masek.
+
+Tablica może zawierać też zmienne pomocnicze (np. wprowadzane przez kodowanie
+Tseitina), których nie ma w formule i które nie są wypisywane w raportach.
+'''
+
+from liprojekt.conversion.formulas import LogicVariable
+
+
+def negateLiteral(literal):
+    '''
+    zwróć literał przeciwny
+    '''
+    return -literal
+
+def literalVariable(literal):
+    '''
+    zwróć id zmiennej literału
+    '''
+    return abs(literal)
+
+def isNegativeLiteral(literal):
+    '''
+    czy literał jest zanegowaną zmienną
+    '''
+    return literal < 0
+
+def literalMask(literal):
+    '''
+    zwróć maskę bitową zmiennej literału (bit o numerze id zmiennej)
+    '''
+    return 1 << abs(literal)
+
+def maskLiterals(positive, negative):
+    '''
+    zwróć listę literałów zbioru zapisanego jako para masek bitowych: zmienne
+    niezanegowane (positive) i zanegowane (negative), w kolejności id zmiennych
+    '''
+    literals = []
+    for mask, sign in ((positive, 1), (negative, -1)):
+        while mask:
+            low = mask & -mask
+            literals.append(sign * (low.bit_length() - 1))
+            mask ^= low
+    literals.sort(key=abs)
+    return literals
+
+
+class VariableTable(object):
+    '''
+    Tablica zmiennych logicznych
+
+    Przypisuje nazwom zmiennych logicznych kolejne liczby całkowite (id)
+    i pozwala zamieniać literały (formulas.LogicVariable) na liczby i spowrotem.
+    '''
+
+    def __init__(self):
+        '''
+        Tworzona jest pusta tablica, zmienne dodawane są przy pierwszym użyciu
+        '''
+        self.__ids = {}
+        self.__names = [None]
+        self.__literals = {}
+        self.__auxiliary = set()
+
+    def variableId(self, name):
+        '''
+        zwróć id zmiennej o nazwie name (jeżeli trzeba, dodaj ją do tablicy)
+        '''
+        try:
+            return self.__ids[name]
+        except KeyError:
+            varId = len(self.__names)
+            self.__ids[name] = varId
+            self.__names.append(name)
+            return varId
+
+    def newAuxiliaryVariable(self, prefix="aux"):
+        '''
+        dodaj nową zmienną pomocniczą i zwróć jej id
+        
+        Nazwa zmiennej zaczyna się od `_`, więc nie koliduje z nazwami zmiennych
+        z formuł (te muszą zaczynać się od litery)
+        '''
+        varId = self.variableId("_" + prefix + str(len(self.__names)))
+        self.__auxiliary.add(varId)
+        return varId
+
+    def copy(self):
+        '''
+        zwróć kopię tablicy, zmienne dodane do kopii nie trafiają do oryginału
+        '''
+        table = VariableTable()
+        table.__ids = self.__ids.copy()
+        table.__names = list(self.__names)
+        table.__literals = self.__literals.copy()
+        table.__auxiliary = set(self.__auxiliary)
+        return table
+
+    def isAuxiliary(self, varId):
+        '''
+        czy zmienna o id varId jest zmienną pomocniczą
+        '''
+        return varId in self.__auxiliary
+
+    def literal(self, lvar):
+        '''
+        zwróć literał odpowiadający formule lvar (klasy formulas.LogicVariable)
+        '''
+        try:
+            return self.__literals[lvar]
+        except KeyError:
+            literal = self.variableId(lvar.name)
+            if lvar.isNegated:
+                literal = negateLiteral(literal)
+            self.__literals[lvar] = literal
+            return literal
+
+    def name(self, literal):
+        '''
+        zwróć nazwę zmiennej literału
+        '''
+        return self.__names[literalVariable(literal)]
+
+    def variable(self, literal):
+        '''
+        zwróć literał w postaci formuły formulas.LogicVariable
+        '''
+        return LogicVariable(self.name(literal), isNegativeLiteral(literal))
+
+    def literal2str(self, literal):
+        '''
+        zapis literału do celów diagnostycznych, np. `p` albo `~p`
+        '''
+        if isNegativeLiteral(literal):
+            return "~" + self.name(literal)
+        return self.name(literal)
+
+    def variableIds(self):
+        '''
+        zwróć listę id wszystkich zmiennych w tablicy
+        '''
+        return range(1, len(self.__names))
+
+    def __contains__(self, name):
+        '''
+        czy tablica zawiera zmienną o nazwie name
+        '''
+        return name in self.__ids
+
+    def __len__(self):
+        '''
+        ilość zmiennych w tablicy
+        '''
+        return len(self.__names) - 1
@@ -0,0 +1,297 @@
+# -*- coding: utf-8 -*-
+'''
+Moduł zawiera klasy weryfikujące formułę równolegle, w wielu procesach.
+
+Każdy krok konwersji Clause.convertStep, który zwraca dwie nowe Clause, tworzy
+dwa niezależne poddrzewa konwersji. Procesy robocze rozwijają swoje poddrzewa
+w głąb, a poddrzewa, których nie zdążą rozwinąć, oddają do wspólnej kolejki
+zadań, z której biorą je bezczynne procesy.
+
+* ParallelSatisfiabilityVerifier -> równoległa weryfikacja spełnialności
+* ParallelValidityVerifier       -> równoległa weryfikacja czy formuła jest tautologią
+'''
+
+import logging
+import traceback
+from array import array
+from collections import deque
+from cStringIO import StringIO
+from Queue import Empty
+import cPickle
+import multiprocessing
+
+from liprojekt.conversion.verification import FormulaVerifier, SatisfiabilityVerifier, \
+    ValidityVerifier, prepareFormulas
+from liprojekt.conversion.recording import ClauseBinTreeNode
+from liprojekt.conversion.transposition import TranspositionTable
+
+
+class ParallelFormulaVerifier(FormulaVerifier):
+    '''
+    Klasa bazowa równoległej weryfikacji drzewem konwersji
+
+    Przebieg weryfikacji:
+    1) formuła jest upraszczana, a jej zmienne dodawane do tablicy zmiennych
+       (procesy robocze dziedziczą je przez fork, więc numery zmiennych są wspólne)
+    2) korzeń drzewa trafia do wspólnej kolejki zadań
+    3) proces roboczy bierze zadanie (Clause i ID węzła) i rozwija je w głąb
+       na własnym stosie. Jeżeli jakiś proces czeka na zadanie, albo stos jest
+       dłuższy niż splitThreshold, najpłytsza (największa) gałąź ze dna stosu
+       oddawana jest do kolejki zadań
+    4) znalezienie klauzuli rozstrzygającej (endOnSuccess / endOnFailure) kończy
+       pracę wszystkich procesów, w przeciwnym wypadku procesy kończą pracę,
+       gdy nie ma zadań w kolejce ani w trakcie rozwijania
+
+    Procesy odsyłają tylko pierwsze znalezione klauzule każdego rodzaju (i klauzule
+    rozstrzygające), drzewo konwersji nie jest zapamiętywane - zawiera tylko korzeń.
+    Clause przesyłane są bez tablicy zmiennych, każdy proces podstawia swoją.
+    Liczniki rozwijania drzewa (steps, splits, nodes, merged) odsyłane są przy
+    zakończeniu pracy procesu i sumowane. Każdy proces ma własną tablicę transpozycji
+    (kopia z procesu głównego), więc scalane są tylko stany z jego poddrzew.
+
+    Przy jobs < 2 weryfikacja jest sekwencyjna (FormulaVerifier.verifyFormula).
+    '''
+
+    SPLIT_THRESHOLD = 64
+    '''
+    długość stosu procesu roboczego, powyżej której gałęzie oddawane są do kolejki
+    '''
+
+    STOP_CHECK_STEPS = 64
+    '''
+    co ile kroków konwersji proces roboczy sprawdza czy ma przerwać pracę
+    '''
+
+    WAIT_TIMEOUT = 0.05
+
+    def __init__(self, formula, vtable=None, jobs=None, splitThreshold=None,
+                 branchingClass=None, transpositionSize=TranspositionTable.DEFAULT_MAX_ENTRIES):
+        '''
+        jobs -> ilość procesów roboczych, domyślnie ilość procesorów
+
+        splitThreshold -> długość stosu procesu roboczego, powyżej której gałęzie
+        oddawane są do kolejki zadań (domyślnie SPLIT_THRESHOLD)
+        
+        branchingClass -> klasa polityki wyboru podformuły (branching.BranchingPolicy)
+        
+        transpositionSize -> rozmiar tablicy transpozycji każdego procesu
+        '''
+        super(ParallelFormulaVerifier, self).__init__(
+            formula, vtable, strategy=FormulaVerifier.DEPTH_FIRST, recordTree=False,
+            branchingClass=branchingClass, transpositionSize=transpositionSize)
+        if jobs is None:
+            jobs = multiprocessing.cpu_count()
+        self.jobs = jobs
+        self.splitThreshold = splitThreshold or self.SPLIT_THRESHOLD
+
+    def verifyFormula(self):
+        '''
+        Weryfikuj formułę w jobs procesach
+        '''
+        if self.jobs < 2:
+            return super(ParallelFormulaVerifier, self).verifyFormula()
+        self._ifVerifiedAssert(False)
+
+        prepareFormulas([self.formula], [self.vtable])
+        try:
+            decided = self.__verifyParallel()
+        except Exception as e:
+            logging.warning("Weryfikacja równoległa nie powiodła się (%s), "+
+                            "weryfikacja sekwencyjna", e)
+            self.succClauseNodes = []
+            self.failClauseNodes = []
+            self.steps, self.splits, self.nodes, self.merged = 0, 0, 1, 0
+            if self.transpositions is not None:
+                self.transpositions.clear()
+            return super(ParallelFormulaVerifier, self).verifyFormula()
+
+        logging.info("Drzewo konwersji (%s): %s", self.branchingName(), self.stats2str())
+        if decided is not None:
+            logging.debug("Znaleziono klauzulę rozstrzygającą -> koniec weryfikacji")
+            return self._setResult(decided)
+        logging.debug("Przeanalizowano wszystkie klauzuly")
+        return self.analyze()
+
+    def __verifyParallel(self):
+        '''
+        uruchom procesy robocze i zbierz ich wyniki, zwraca wynik klauzuli
+        rozstrzygającej albo None jeżeli jej nie znaleziono
+        '''
+        tasks = multiprocessing.Queue()
+        results = multiprocessing.Queue()
+        pending = multiprocessing.Value('i', 1)
+        idle = multiprocessing.Value('i', 0)
+        stop = multiprocessing.Event()
+
+        tasks.put(self.__dumps((self.tree.root.clause, ())))
+        workers = [multiprocessing.Process(target=self._worker,
+                                           args=(tasks, results, pending, idle, stop))
+                   for _ in xrange(self.jobs)]
+        logging.info("Weryfikacja równoległa w %d procesach", len(workers))
+        for worker in workers:
+            worker.daemon = True
+            worker.start()
+
+        decided, error, exits = None, None, 0
+        try:
+            while exits < len(workers):
+                try:
+                    message = results.get(timeout=self.WAIT_TIMEOUT)
+                except Empty:
+                    if not any(worker.is_alive() for worker in workers):
+                        raise Exception("Procesy robocze zakończyły się bez wyniku")
+                    continue
+                kind = message[0]
+                if kind == 'exit':
+                    exits += 1
+                    steps, splits, nodes, merged = message[1]
+                    self.steps += steps
+                    self.splits += splits
+                    self.nodes += nodes
+                    self.merged += merged
+                elif kind == 'error':
+                    error = message[1]
+                    stop.set()
+                else:
+                    success, code, data = message[1:]
+                    node = ClauseBinTreeNode(self.__loads(data))
+                    node.ID.code = array('B', code)
+                    if success:
+                        self.succClauseNodes.append(node)
+                    else:
+                        self.failClauseNodes.append(node)
+                    if kind == 'decided' and decided is None:
+                        decided = success
+        finally:
+            stop.set()
+            for worker in workers:
+                worker.join(self.WAIT_TIMEOUT)
+                if worker.is_alive():
+                    worker.terminate()
+
+        if error is not None:
+            raise Exception("Błąd w procesie roboczym:\n" + error)
+        return decided
+
+    def _worker(self, tasks, results, pending, idle, stop):
+        '''
+        pętla procesu roboczego (wykonywana w procesie potomnym)
+        '''
+        # zadania pozostawione w kolejce po przerwaniu pracy nie są potrzebne
+        tasks.cancel_join_thread()
+        # kroki, rozbicia, nowe węzły, scalone węzły
+        counts = [0, 0, 0, 0]
+        try:
+            reported = {True: False, False: False}
+            while not stop.is_set():
+                with idle.get_lock():
+                    idle.value += 1
+                try:
+                    task = tasks.get(timeout=self.WAIT_TIMEOUT)
+                except Empty:
+                    if pending.value == 0:
+                        break
+                    continue
+                finally:
+                    with idle.get_lock():
+                        idle.value -= 1
+
+                self.__explore(self.__loads(task), tasks, results, pending, idle,
+                               stop, reported, counts)
+                with pending.get_lock():
+                    pending.value -= 1
+        except Exception:
+            results.put(('error', traceback.format_exc()))
+        results.put(('exit', tuple(counts)))
+
+    def __explore(self, task, tasks, results, pending, idle, stop, reported, counts):
+        '''
+        rozwiń w głąb poddrzewo zadania task = (Clause, kod ID węzła)
+        '''
+        stack = deque([task])
+        steps = 0
+        while stack:
+            steps += 1
+            if steps % self.STOP_CHECK_STEPS == 0 and stop.is_set():
+                return
+            if len(stack) > 1 and (idle.value > 0 or len(stack) > self.splitThreshold):
+                # oddaj najpłytszą gałąź
+                with pending.get_lock():
+                    pending.value += 1
+                tasks.put(self.__dumps(stack.popleft()))
+
+            clause, code = stack.pop()
+            newClauses = clause.convertStep(self.branching)
+            counts[0] += 1
+            counts[2] += len(newClauses)
+            if len(newClauses) > 1:
+                counts[1] += 1
+            unresolved = []
+            for direct, c in enumerate(newClauses):
+                childCode = code + (direct,)
+                if not c.isResolved():
+                    if self.transpositions is None or self.transpositions.add(c):
+                        unresolved.append((c, childCode))
+                    else:
+                        counts[3] += 1
+                    continue
+                success = c.isSuccess()
+                if success:
+                    deciding = self.endOnSuccess()
+                else:
+                    deciding = self.endOnFailure()
+                if deciding:
+                    stop.set()
+                    results.put(('decided', success, childCode, self.__dumps(c)))
+                    return
+                if not reported[success]:
+                    reported[success] = True
+                    results.put(('resolved', success, childCode, self.__dumps(c)))
+            unresolved.reverse()
+            stack.extend(unresolved)
+
+    def __dumps(self, obj):
+        '''
+        zapikluj obiekt, tablica zmiennych zastępowana jest odwołaniem
+        '''
+        buf = StringIO()
+        pickler = cPickle.Pickler(buf, cPickle.HIGHEST_PROTOCOL)
+        pickler.persistent_id = self.__persistentId
+        pickler.dump(obj)
+        return buf.getvalue()
+
+    def __loads(self, data):
+        '''
+        odpikluj obiekt, podstawiając tablicę zmiennych procesu
+        '''
+        unpickler = cPickle.Unpickler(StringIO(data))
+        unpickler.persistent_load = self.__persistentLoad
+        return unpickler.load()
+
+    def __persistentId(self, obj):
+        if obj is self.vtable:
+            return 'vtable'
+        return None
+
+    def __persistentLoad(self, pid):
+        if pid == 'vtable':
+            return self.vtable
+        raise cPickle.UnpicklingError("Nieznany obiekt " + str(pid))
+
+
+class ParallelSatisfiabilityVerifier(ParallelFormulaVerifier, SatisfiabilityVerifier):
+    '''
+    Równoległa weryfikacja spełnialności
+
+    Pierwsza znaleziona klauzula potwierdzająca tezę kończy pracę wszystkich procesów.
+    '''
+    pass
+
+
+class ParallelValidityVerifier(ParallelFormulaVerifier, ValidityVerifier):
+    '''
+    Równoległa weryfikacja czy formuła jest tautologią
+
+    Pierwsza znaleziona klauzula zaprzeczająca tezie kończy pracę wszystkich procesów.
+    '''
+    pass
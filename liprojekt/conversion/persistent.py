@@ -0,0 +1,142 @@
+# -*- coding: utf-8 -*-
+'''
+Moduł zawiera trwałe (niemutowalne) struktury danych wykorzystywane
+przez półprodukty clauses.Clause.
+
+Struktura trwała nigdy nie jest modyfikowana w miejscu. Każda operacja
+zwraca nową wersję struktury, która współdzieli niezmienioną część
+z wersją poprzednią. Dzięki temu rozgałęzienie klauzuli nie wymaga
+kopiowania jej zawartości.
+'''
+
+
+class PersistentStack(object):
+    '''
+    Trwały stos (lista jednokierunkowa)
+
+    Każdy węzeł przechowuje element szczytowy i odwołanie do reszty stosu.
+    Wstawienie i zdjęcie elementu ze szczytu działają w czasie stałym,
+    a dwa stosy powstałe z tego samego stosu współdzielą jego węzły.
+    '''
+
+    __slots__ = ('_head', '_tail', '_size')
+
+    EMPTY = None
+    '''
+    pusty stos, wspólny dla wszystkich stosów
+    '''
+
+    def __init__(self, head=None, tail=None):
+        '''
+        Konstruktor, należy podać element szczytowy i resztę stosu.
+
+        Nie należy wywoływać bezpośrednio, tylko zaczynać od PersistentStack.EMPTY
+        '''
+        self._head = head
+        self._tail = tail
+        if tail is None:
+            self._size = 0
+        else:
+            self._size = tail._size + 1
+
+    @classmethod
+    def fromIterable(cls, items):
+        '''
+        tworzy stos z elementów items, pierwszy element ląduje na szczycie
+        '''
+        stack = cls.EMPTY
+        for item in reversed(list(items)):
+            stack = stack.push(item)
+        return stack
+
+    def push(self, item):
+        '''
+        zwróć stos z elementem item na szczycie
+        '''
+        return PersistentStack(item, self)
+
+    def extend(self, items):
+        '''
+        zwróć stos z elementami items wkładanymi kolejno na szczyt
+
+        Odpowiada collections.deque.extendleft, ostatni element ląduje na szczycie
+        '''
+        stack = self
+        for item in items:
+            stack = stack.push(item)
+        return stack
+
+    def pop(self):
+        '''
+        zwróć parę (element szczytowy, reszta stosu)
+
+        Dla pustego stosu rzucany jest IndexError (tak jak deque.popleft)
+        '''
+        if self._tail is None:
+            raise IndexError("pop from an empty PersistentStack")
+        return self._head, self._tail
+
+    def take(self, index):
+        '''
+        zwróć parę (element o numerze index licząc od szczytu, stos bez tego elementu)
+
+        Elementy nad wybranym wkładane są na stos ponownie, więc koszt to O(index).
+        Dla zbyt dużego index rzucany jest IndexError
+        '''
+        above = []
+        stack = self
+        for _ in xrange(index):
+            item, stack = stack.pop()
+            above.append(item)
+        item, stack = stack.pop()
+        return item, stack.extend(reversed(above))
+
+    def peek(self):
+        '''
+        zwróć element szczytowy
+        '''
+        if self._tail is None:
+            raise IndexError("peek from an empty PersistentStack")
+        return self._head
+
+    def __iter__(self):
+        '''
+        iteruj od szczytu stosu do jego dna
+        '''
+        node = self
+        while node._tail is not None:
+            yield node._head
+            node = node._tail
+
+    def __reversed__(self):
+        '''
+        iteruj od dna stosu do jego szczytu (kolejność wstawiania)
+        '''
+        return reversed(list(self))
+
+    def __len__(self):
+        return self._size
+
+    def __nonzero__(self):
+        return self._size != 0
+
+    def __reduce__(self):
+        return (_stackFromList, (list(self),))
+
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
+
+    def __str__(self):
+        return "[" + ", ".join(map(str, self)) + "]"
+
+PersistentStack.EMPTY = PersistentStack()
+
+
+def _stackFromList(items):
+    '''
+    odtwarzanie stosu przy odpiklowaniu (metody klasy nie da się zapiklować)
+    '''
+    return PersistentStack.fromIterable(items)
@@ -43,7 +43,7 @@ class ClauseBinTreeNode(object):
                 raise ValueError("direct musi przyjmowac wartosci NodeID.LEFT "+self.LEFT + 
                                  " albo NodeID.RIGHT "+self.RIGHT)
             else:
-                self.code = array('B', parentID.code)
+                self.code = parentID.code[:]
                 self.code.append(direct)
         
         def __str__(self):
@@ -175,6 +175,27 @@ class ClauseBinTreeNode(object):
         
     def __str__(self):
         return str(self._ID) + ": " + str(self.clause)
+
+    def __getstate__(self):
+        '''
+        stan do zapiklowania, bez odwołań do sąsiednich węzłów
+        
+        Odwołania odtwarza ClauseBinTree, dzięki temu piklowanie głębokiego drzewa
+        nie wymaga głębokiej rekurencji
+        '''
+        state = self.__dict__.copy()
+        state['_parent'] = None
+        state['_leftChild'] = None
+        state['_rightChild'] = None
+        # klasy zagnieżdżonej NodeID nie da się zapiklować, wystarczy jej kod
+        state['_ID'] = self._ID.code
+        return state
+    
+    def __setstate__(self, state):
+        code = state.pop('_ID')
+        self.__dict__.update(state)
+        self._ID = ClauseBinTreeNode.NodeID()
+        self._ID.code = code
     
               
 class ClauseBinTree(object):
@@ -213,7 +234,7 @@ class ClauseBinTree(object):
         Dołącza do drzewa liść node, jeżeli nie podano wartości parent to 
         node jest ustawiany jako korzeń.
         '''
-        logging.debug("Dodaję liść \n%s\n, do ojca \n%s\n", str(node), str(parent))
+        logging.debug("Dodaję liść \n%s\n, do ojca \n%s\n", node, parent)
         if parent is None:
             if self.root is not None:
                 raise ValueError("Parent can't be 'None', the tree already has its root")
@@ -243,17 +264,45 @@ class ClauseBinTree(object):
             yield node
             
     
-    def tree2str(self, fformatter, treeNodeFromat):
+    def tree2str(self, fformatter, treeNodeFromat, minSize=0):
         '''
         wypisz węzły drzewa, zgodnie z formatem treeNodeFormat,
         przechodząc drzewo wszerz
+        
+        Jeżeli podformuły nieprzerobione wszystkich klauzul rozwinięte do drzew
+        mają razem więcej niż minSize węzłów, podformuły wspólne (DAG) wypisywane
+        są raz, jako definicje przed drzewem, a w klauzulach zastępuje je nazwa
+        (formatting.FormulaFormatter.formulas2defs).
         '''
         
+        nodes = list(self.indepthGen())
+        definitions, names = fformatter.formulas2defs(
+            [formula for node in nodes for formula in node.clause.uncFormulas], minSize)
         rtrn = StringIO()
-        for node in self.indepthGen():
+        if names:
+            fformatter = fformatter.withNames(names)
+            rtrn.write(definitions+"\n")
+        for node in nodes:
             rtrn.write(node.clause2str(fformatter, treeNodeFromat)+"\n")
         return rtrn.getvalue()
     
+    def __getstate__(self):
+        '''
+        stan do zapiklowania: lista węzłów (wszerz) i indeksy ich dzieci
+        '''
+        nodes = list(self.indepthGen()) if self.root is not None else []
+        index = dict((id(node), i) for i, node in enumerate(nodes))
+        children = [[index[id(child)] for child in node.getChildren()] 
+                    for node in nodes]
+        return {'nodes': nodes, 'children': children}
+    
+    def __setstate__(self, state):
+        nodes = state['nodes']
+        for node, children in zip(nodes, state['children']):
+            node.setChildren(*[nodes[i] for i in children])
+        self.nodes = Set(nodes)
+        self.__root = nodes[0] if nodes else None
+    
     def __contains__(self, item):
         '''
         czy drzewo zawiera obiekt item
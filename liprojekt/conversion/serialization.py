@@ -0,0 +1,211 @@
+# -*- coding: utf-8 -*-
+'''
+Moduł zawiera binarny format zapisu formuł (formulas.Formula).
+
+Formuła zapisywana jest raz (np. po sparsowaniu dużego pliku tekstowego),
+a wczytanie jej z pliku binarnego nie wymaga parsowania. Zapisywany jest graf
+DAG formuły - wspólne podformuły zapisywane są raz.
+
+Układ pliku (liczby całkowite bez znaku, little-endian, sekcje wyrównane do 4 bajtów):
+
+    nagłówek   -> MAGIC, wersja (2 B), zarezerwowane (2 B), ilość nazw zmiennych,
+                  długość tablicy nazw (B), ilość węzłów, numer korzenia (po 4 B)
+    nazwy      -> długości nazw (4 B każda), nazwy zmiennych w UTF-8 jedna za drugą
+    rodzaje    -> rodzaj każdego węzła (1 B każdy, KINDS)
+    argumenty  -> dwa argumenty każdego węzła (4 B każdy): numery podformuł,
+                  dla zmiennej numer nazwy i znak negacji
+
+Podformuła ma zawsze mniejszy numer niż formuła, która ją zawiera, więc plik
+wczytywany jest jednym przebiegiem, bez rekurencji.
+
+* writeFormula     -> zapis formuły do otwartego pliku
+* readFormula      -> odczyt formuły z bufora (łańcuch znaków albo mmap)
+* dumpFormula      -> zapis formuły do pliku o podanej nazwie
+* loadFormula      -> odczyt formuły z pliku o podanej nazwie (przez mmap)
+* isFormulaFile    -> czy plik jest w formacie binarnym
+'''
+
+import mmap
+import struct
+import sys
+from array import array
+from itertools import izip
+
+from liprojekt.conversion.formulas import LogicTruth, LogicFalse, LogicVariable, \
+    NotOperation, AndOperation, OrOperation, ImplicationOperation, EquivalenceOperation
+
+
+MAGIC = 'LIPF'
+
+VERSION = 1
+
+HEADER = struct.Struct('<4sHHIIII')
+
+KINDS = (LogicTruth, LogicFalse, LogicVariable, NotOperation,
+         AndOperation, OrOperation, ImplicationOperation, EquivalenceOperation)
+'''
+klasy formuł według rodzaju węzła zapisanego w pliku
+'''
+
+TRUE, FALSE, VARIABLE, NOT = range(4)
+
+_KIND_OF = dict((cls, kind) for kind, cls in enumerate(KINDS))
+
+
+class FormulaFormatError(Exception):
+    '''
+    Plik nie jest poprawnym plikiem formuły w formacie binarnym
+    '''
+    pass
+
+
+def _padding(size):
+    return '\0' * (-size % 4)
+
+
+def _littleEndian(arr):
+    '''
+    tablica w kolejności bajtów little-endian (kopia, jeżeli trzeba zamienić bajty)
+    '''
+    if sys.byteorder != 'little' and arr.itemsize > 1:
+        arr = array(arr.typecode, arr)
+        arr.byteswap()
+    return arr
+
+
+def writeFormula(stream, formula):
+    '''
+    zapisz formułę formula do otwartego (binarnie) pliku stream
+    '''
+    index = {}
+    names = {}
+    kinds = array('B')
+    args = array('I')
+    stack = [formula]
+    while stack:
+        top = stack[-1]
+        if id(top) in index:
+            stack.pop()
+            continue
+        pending = [f for f in top.subformulas if id(f) not in index]
+        if pending:
+            stack.extend(pending)
+            continue
+        stack.pop()
+        kind = _KIND_OF.get(top.__class__)
+        if kind is None:
+            raise TypeError("Nie można zapisać formuły klasy " + top.__class__.__name__)
+        if kind == VARIABLE:
+            args.append(names.setdefault(top.name, len(names)))
+            args.append(int(top.isNegated))
+        else:
+            subs = [index[id(f)] for f in top.subformulas]
+            args.extend(subs + [0] * (2 - len(subs)))
+        index[id(top)] = len(kinds)
+        kinds.append(kind)
+
+    encoded = [None] * len(names)
+    for name, number in names.iteritems():
+        encoded[number] = name.encode('utf-8')
+    lengths = array('I', map(len, encoded))
+    nameBytes = ''.join(encoded)
+
+    stream.write(HEADER.pack(MAGIC, VERSION, 0, len(encoded), len(nameBytes),
+                             len(kinds), index[id(formula)]))
+    stream.write(_littleEndian(lengths).tostring())
+    stream.write(nameBytes + _padding(len(nameBytes)))
+    stream.write(kinds.tostring() + _padding(len(kinds)))
+    stream.write(_littleEndian(args).tostring())
+
+
+def readFormula(data):
+    '''
+    wczytaj formułę z bufora data (łańcuch znaków albo plik mapowany do pamięci)
+    '''
+    if len(data) < HEADER.size:
+        raise FormulaFormatError("Plik jest za krótki na nagłówek formuły")
+    magic, version, _, numNames, nameSize, numNodes, root = \
+        HEADER.unpack(data[:HEADER.size])
+    if magic != MAGIC:
+        raise FormulaFormatError("Plik nie jest plikiem formuły w formacie binarnym")
+    if version != VERSION:
+        raise FormulaFormatError("Nieobsługiwana wersja formatu formuły: " + str(version))
+
+    pos = HEADER.size
+    lengths = _readArray(data, pos, 'I', numNames)
+    pos += 4 * numNames
+    names = []
+    for length in lengths:
+        names.append(data[pos:pos + length].decode('utf-8'))
+        pos += length
+    pos += len(_padding(nameSize))
+    kinds = _readArray(data, pos, 'B', numNodes)
+    pos += numNodes + len(_padding(numNodes))
+    args = _readArray(data, pos, 'I', 2 * numNodes)
+    if root >= numNodes:
+        raise FormulaFormatError("Niepoprawny numer korzenia formuły")
+
+    nodes = []
+    for number, (kind, left, right) in enumerate(izip(kinds, args[0::2], args[1::2])):
+        if kind >= len(KINDS):
+            raise FormulaFormatError("Niepoprawny rodzaj węzła formuły: " + str(kind))
+        if kind == VARIABLE:
+            if left >= numNames:
+                raise FormulaFormatError("Niepoprawny numer nazwy zmiennej: " + str(left))
+            name = names[left]
+            try:
+                name = str(name)
+            except UnicodeEncodeError:
+                pass
+            nodes.append(LogicVariable(name, bool(right)))
+        elif kind < VARIABLE:
+            nodes.append(KINDS[kind]())
+        elif max(left, right) >= number:
+            raise FormulaFormatError("Podformuła węzła %d nie poprzedza go w pliku" % number)
+        elif kind == NOT:
+            nodes.append(NotOperation(nodes[left]))
+        else:
+            nodes.append(KINDS[kind](nodes[left], nodes[right]))
+    return nodes[root]
+
+
+def _readArray(data, pos, typecode, count):
+    arr = array(typecode)
+    end = pos + arr.itemsize * count
+    if end > len(data):
+        raise FormulaFormatError("Plik formuły jest obcięty")
+    arr.fromstring(data[pos:end])
+    if sys.byteorder != 'little' and arr.itemsize > 1:
+        arr.byteswap()
+    return arr
+
+
+def dumpFormula(fileName, formula):
+    '''
+    zapisz formułę formula do pliku fileName w formacie binarnym
+    '''
+    with open(fileName, 'wb') as f:
+        writeFormula(f, formula)
+
+
+def loadFormula(fileName):
+    '''
+    wczytaj formułę z pliku fileName w formacie binarnym (plik mapowany do pamięci)
+    '''
+    with open(fileName, 'rb') as f:
+        f.seek(0, 2)
+        if f.tell() == 0:
+            raise FormulaFormatError("Plik formuły " + fileName + " jest pusty")
+        data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            return readFormula(data)
+        finally:
+            data.close()
+
+
+def isFormulaFile(fileName):
+    '''
+    czy plik fileName zaczyna się od znacznika formatu binarnego (MAGIC)
+    '''
+    with open(fileName, 'rb') as f:
+        return f.read(len(MAGIC)) == MAGIC
@@ -0,0 +1,229 @@
+# -*- coding: utf-8 -*-
+'''
+Moduł zawiera silniki SAT, czyli klasy rozstrzygające spełnialność formuły
+zapisanej w postaci CNF.
+
+CNF to lista klauzul, klauzula to ciąg literałów zapisanych jako liczby:
+id zmiennej dla zmiennej, -id dla jej negacji (patrz literals.VariableTable).
+Zmienne mają id 1..numVars.
+'''
+
+import logging
+
+
+class SatSolver(object):
+    '''
+    Klasa bazowa silników SAT
+
+    Po wywołaniu solve() dostępne są:
+    * model -> wartościowanie spełniające CNF (lista literałów, po jednym dla
+               każdej zmiennej), albo None jeżeli CNF nie jest spełnialna
+    * stats -> słownik z licznikami pracy silnika
+    '''
+
+    NAME = "SAT"
+
+    def __init__(self, clauses, numVars):
+        '''
+        clauses to lista klauzul CNF, numVars to liczba zmiennych
+
+        Klauzule są normalizowane: powtórzone literały są usuwane, a klauzule
+        zawierające zmienną i jej negację (zawsze prawdziwe) są pomijane.
+        Znormalizowane klauzule są kopiowane do list (self.clauses), także
+        z magazynu dimacs.ClauseStore.
+        '''
+        self.numVars = numVars
+        self.clauses = []
+        self.hasEmptyClause = False
+        for clause in clauses:
+            lits = set(clause)
+            if any(-lit in lits for lit in lits):
+                continue
+            if not lits:
+                self.hasEmptyClause = True
+            self.clauses.append(sorted(lits, key=abs))
+        self.model = None
+        self.stats = {}
+
+    def solve(self):
+        '''
+        rozstrzygnij spełnialność CNF, zwraca True jeżeli CNF jest spełnialna
+        '''
+        pass
+
+    def stats2str(self):
+        '''
+        liczniki pracy silnika w postaci łańcucha znaków
+        '''
+        return ", ".join(name + ": " + str(value)
+                         for name, value in sorted(self.stats.items()))
+
+
+class DPLLSolver(SatSolver):
+    '''
+    Silnik SAT oparty na algorytmie DPLL
+
+    * propagacja jednostkowa -> klauzula, w której zostaje jeden nieprzypisany
+                                literał, a reszta jest fałszywa, wymusza ten literał
+    * eliminacja czystych literałów -> zmienna występująca w niespełnionych
+                                klauzulach tylko z jednym znakiem dostaje ten znak
+    * chronologiczny nawrót -> po konflikcie odwracana jest ostatnia decyzja,
+                                która nie była jeszcze odwrócona
+
+    Dla każdej klauzuli utrzymywana jest liczba fałszywych i prawdziwych
+    literałów, a dla każdego literału liczba niespełnionych klauzul w których
+    występuje. Przeszukiwanie jest iteracyjne (bez rekurencji).
+    '''
+
+    NAME = "DPLL"
+
+    def __init__(self, clauses, numVars):
+        super(DPLLSolver, self).__init__(clauses, numVars)
+        n = numVars
+        # indeksy list po literałach: lit + n
+        self.__values = [0] * (n + 1)
+        self.__occurs = [[] for _ in xrange(2 * n + 1)]
+        self.__activeOcc = [0] * (2 * n + 1)
+        for ci, clause in enumerate(self.clauses):
+            for lit in clause:
+                self.__occurs[lit + n].append(ci)
+                self.__activeOcc[lit + n] += 1
+        self.__satCount = [0] * len(self.clauses)
+        self.__falseCount = [0] * len(self.clauses)
+        self.__numSatisfied = 0
+        self.__trail = []
+        self.__units = []
+        self.__conflict = False
+        self.stats = {'decisions': 0, 'propagations': 0, 'conflicts': 0,
+                      'pureLiterals': 0}
+
+    def solve(self):
+        if self.hasEmptyClause:
+            return False
+        decisions = []
+        self.__units = [ci for ci, clause in enumerate(self.clauses) if len(clause) == 1]
+        while True:
+            if self.__propagate():
+                if self.__numSatisfied == len(self.clauses):
+                    self.__setModel()
+                    return True
+                lit = self.__chooseLiteral()
+                self.stats['decisions'] += 1
+                decisions.append((len(self.__trail), lit, False))
+                self.__assign(lit)
+                continue
+
+            # konflikt -> chronologiczny nawrót
+            self.stats['conflicts'] += 1
+            while decisions:
+                level, lit, flipped = decisions.pop()
+                self.__undo(level)
+                if not flipped:
+                    decisions.append((level, -lit, True))
+                    self.__assign(-lit)
+                    break
+            else:
+                return False
+
+    def __assign(self, lit):
+        n = self.numVars
+        self.__values[abs(lit)] = 1 if lit > 0 else -1
+        self.__trail.append(lit)
+        clauses = self.clauses
+        for ci in self.__occurs[lit + n]:
+            self.__satCount[ci] += 1
+            if self.__satCount[ci] == 1:
+                self.__numSatisfied += 1
+                for l in clauses[ci]:
+                    self.__activeOcc[l + n] -= 1
+        for ci in self.__occurs[-lit + n]:
+            self.__falseCount[ci] += 1
+            if self.__satCount[ci] == 0:
+                remaining = len(clauses[ci]) - self.__falseCount[ci]
+                if remaining == 0:
+                    self.__conflict = True
+                elif remaining == 1:
+                    self.__units.append(ci)
+
+    def __unassign(self, lit):
+        n = self.numVars
+        self.__values[abs(lit)] = 0
+        clauses = self.clauses
+        for ci in self.__occurs[lit + n]:
+            if self.__satCount[ci] == 1:
+                self.__numSatisfied -= 1
+                for l in clauses[ci]:
+                    self.__activeOcc[l + n] += 1
+            self.__satCount[ci] -= 1
+        for ci in self.__occurs[-lit + n]:
+            self.__falseCount[ci] -= 1
+
+    def __undo(self, level):
+        trail = self.__trail
+        while len(trail) > level:
+            self.__unassign(trail.pop())
+        self.__units = []
+        self.__conflict = False
+
+    def __value(self, lit):
+        value = self.__values[abs(lit)]
+        return value if lit > 0 else -value
+
+    def __propagate(self):
+        '''
+        propagacja jednostkowa i eliminacja czystych literałów,
+        zwraca False w przypadku konfliktu
+        '''
+        while True:
+            while self.__units and not self.__conflict:
+                ci = self.__units.pop()
+                if self.__satCount[ci]:
+                    continue
+                for lit in self.clauses[ci]:
+                    if self.__values[abs(lit)] == 0:
+                        self.stats['propagations'] += 1
+                        self.__assign(lit)
+                        break
+            if self.__conflict:
+                return False
+            if not self.__assignPureLiterals():
+                return True
+
+    def __assignPureLiterals(self):
+        n = self.numVars
+        found = False
+        for var in xrange(1, n + 1):
+            if self.__values[var] != 0:
+                continue
+            pos = self.__activeOcc[var + n]
+            neg = self.__activeOcc[-var + n]
+            if pos and not neg:
+                lit = var
+            elif neg and not pos:
+                lit = -var
+            else:
+                continue
+            self.stats['pureLiterals'] += 1
+            self.__assign(lit)
+            found = True
+        return found
+
+    def __chooseLiteral(self):
+        '''
+        wybierz nieprzypisany literał występujący w największej liczbie
+        niespełnionych klauzul
+        '''
+        n = self.numVars
+        best, bestCount = None, -1
+        for var in xrange(1, n + 1):
+            if self.__values[var] != 0:
+                continue
+            for lit in (var, -var):
+                if self.__activeOcc[lit + n] > bestCount:
+                    best, bestCount = lit, self.__activeOcc[lit + n]
+        return best
+
+    def __setModel(self):
+        self.model = [var if self.__values[var] > 0 else -var
+                      for var in xrange(1, self.numVars + 1)]
+        logging.info("%s: znaleziono wartościowanie (%s)", self.NAME, self.stats2str())
@@ -0,0 +1,92 @@
+# -*- coding: utf-8 -*-
+'''
+Moduł zawiera tablicę transpozycji drzewa konwersji (recording.ClauseBinTree).
+
+Różne gałęzie drzewa konwersji często dochodzą do Clause o tych samych literałach
+i tych samych podformułach nieprzerobionych. Poddrzewa takich Clause dają te same
+klauzule rozstrzygnięte, więc wystarczy rozwinąć jedno z nich.
+
+Stan Clause opisuje odcisk:
+* maski bitowe literałów (Clause.positive, Clause.negative)
+* posortowane identyfikatory uproszczonych podformuł nieprzerobionych (wspólne
+  węzły DAG formuły, Formula.makeSimple), z powtórzeniami
+
+Clause B jest pochłaniana przez zapamiętaną Clause A, jeżeli mają te same podformuły
+nieprzerobione, a literały A są podzbiorem literałów B. W ConjunctionClause B jest
+wtedy mocniejsza od A (jeżeli B jest spełnialna, to A też), a w DisjunctionClause
+słabsza (jeżeli B nie jest tautologią, to A też nie jest), więc poddrzewo A
+rozstrzyga weryfikację tak samo jak poddrzewo B.
+
+Każdy krok konwersji zastępuje podformułę jej operandami, więc Clause nie może być
+pochłonięta przez swojego przodka - pominięte są tylko Clause z innych gałęzi.
+'''
+
+from collections import OrderedDict
+
+
+class TranspositionTable(object):
+    '''
+    Tablica transpozycji stanów Clause z usuwaniem LRU
+
+    Stany grupowane są według podformuł nieprzerobionych, a w grupie trzymane są
+    tylko maski literałów niepochłonięte przez inne. Ilość zapamiętanych stanów
+    jest ograniczona (maxEntries), przy przepełnieniu usuwane są najdawniej używane
+    grupy.
+    '''
+
+    DEFAULT_MAX_ENTRIES = 1 << 16
+
+    def __init__(self, maxEntries=DEFAULT_MAX_ENTRIES):
+        self.maxEntries = maxEntries
+        self.__groups = OrderedDict()
+        self.__size = 0
+        self.hits = 0
+
+    @staticmethod
+    def pendingKey(clause):
+        '''
+        odcisk podformuł nieprzerobionych Clause clause
+        '''
+        return tuple(sorted(id(f.makeSimple()) for f in clause.uncFormulas))
+
+    def add(self, clause):
+        '''
+        zapamiętaj stan nierozstrzygniętej Clause clause, zwraca False jeżeli stan
+        jest pochłonięty przez zapamiętany (Clause nie trzeba rozwijać)
+        '''
+        key = self.pendingKey(clause)
+        positive, negative = clause.positive, clause.negative
+        group = self.__groups.pop(key, None)
+        if group is None:
+            group = []
+        else:
+            for p, n in group:
+                if p & positive == p and n & negative == n:
+                    self.__groups[key] = group
+                    self.hits += 1
+                    return False
+            # stany pochłonięte przez nowy nie są już potrzebne
+            kept = [(p, n) for p, n in group
+                    if p & positive != positive or n & negative != negative]
+            self.__size -= len(group) - len(kept)
+            group = kept
+        group.append((positive, negative))
+        self.__groups[key] = group
+        self.__size += 1
+        self.__evict()
+        return True
+
+    def __evict(self):
+        while self.__size > self.maxEntries:
+            _, group = self.__groups.popitem(last=False)
+            self.__size -= len(group)
+
+    def __len__(self):
+        '''
+        ilość zapamiętanych stanów
+        '''
+        return self.__size
+
+    def clear(self):
+        self.__groups.clear()
+        self.__size = 0
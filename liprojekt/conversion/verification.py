@@ -7,13 +7,25 @@ Created on 20-03-2013
 
 Moduł zawiera klasy weryfikujące spełnialność formuły i
 czy formuła jest tautologią.
+
+SatisfiabilityVerifier i ValidityVerifier rozwijają drzewo konwersji formuły.
+SolverSatisfiabilityVerifier i SolverValidityVerifier kodują formułę do postaci
+CNF i przekazują ją silnikowi SAT (np. solvers.DPLLSolver).
+CombinedVerifier sprawdza jednocześnie spełnialność i czy formuła jest tautologią.
 '''
 
 import logging
+import threading
 from collections import deque
+from multiprocessing import Pool, cpu_count
 
 from liprojekt.conversion.clauses import ConjunctionClause, DisjunctionClause
 from liprojekt.conversion.recording import ClauseBinTree, ClauseBinTreeNode
+from liprojekt.conversion.transposition import TranspositionTable
+from liprojekt.conversion.literals import VariableTable
+from liprojekt.conversion.formulas import NotOperation, LogicVariable
+from liprojekt.conversion.cnf import TseitinCNFEncoder
+from liprojekt.conversion.solvers import DPLLSolver
 
 class FormulaVerifier(object):    
     '''
@@ -22,23 +34,76 @@ class FormulaVerifier(object):
     Dziedziczą z niej klasy:
     * SatisfiabilityVerifier -> do weryfikacji spełnilaności
     * ValidityVerifier       -> do weryfikacji czy formuła jest tautologią
+    
+    Drzewo konwersji może być przechodzone:
+    * BREADTH_FIRST -> wszerz, wszystkie gałęzie rozwijane są równo
+    * DEPTH_FIRST   -> w głąb, gałąź rozwijana jest aż do klauzuli rozstrzygniętej,
+                       pamięć proporcjonalna do głębokości drzewa
+    
+    Kolejność rozwijania podformuł w Clause wybiera polityka branching.BranchingPolicy,
+    a rozmiar drzewa opisują liczniki (stats2str):
+    * steps  -> ilość kroków konwersji
+    * splits -> ilość rozbić Clause na dwie
+    * nodes  -> ilość węzłów drzewa konwersji (także niezapamiętanych)
+    * merged -> ilość Clause nierozwiniętych, bo ich stan był już rozwijany
+    
+    Stany rozwijanych Clause zapamiętywane są w tablicy transpozycji
+    (transposition.TranspositionTable), Clause o stanie pochłoniętym przez
+    zapamiętany zostaje w drzewie jako liść i nie jest rozwijana.
     '''
+    
+    BREADTH_FIRST = 'BFS'
+    DEPTH_FIRST = 'DFS'
      
-    def __init__(self, formula):
+    def __init__(self, formula, vtable=None, strategy=BREADTH_FIRST, recordTree=True,
+                 branchingClass=None, transpositionSize=TranspositionTable.DEFAULT_MAX_ENTRIES):
         '''
         jako argument brana jest formuła logiczna, czyli klasa formulas.Formula.
         
         Z formuły logicznej tworzony jest półprodukt Clause i umieszczany w korzeniu drzewa
         recording.ClauseBinTree.
+        
+        vtable to tablica zmiennych (literals.VariableTable) w której kodowane są
+        literały, jeżeli nie zostanie podana tworzona jest nowa.
+        
+        strategy to sposób przechodzenia drzewa konwersji (BREADTH_FIRST, DEPTH_FIRST).
+        
+        recordTree -> czy zapamiętywać całe drzewo konwersji, jeżeli nie to drzewo
+        zawiera tylko korzeń, a z klauzul rozstrzygniętych pamiętane są tylko
+        pierwsze (potrzebne do raportu)
+        
+        branchingClass to klasa polityki wyboru podformuły (branching.BranchingPolicy),
+        domyślnie podformuły rozwijane są w kolejności w jakiej powstały z formuły
+        
+        transpositionSize to maksymalna ilość stanów Clause w tablicy transpozycji
+        (0 wyłącza tablicę)
         '''
         
+        if strategy not in (self.BREADTH_FIRST, self.DEPTH_FIRST):
+            raise ValueError("Nieznana strategia przechodzenia drzewa: " + str(strategy))
         self.formula = formula
+        if vtable is None:
+            vtable = VariableTable()
+        self.vtable = vtable
+        self.strategy = strategy
+        self.recordTree = recordTree
         self.tree = ClauseBinTree(
                         ClauseBinTreeNode(
                             self._createClause(formula)))
         self.succClauseNodes = []
         self.failClauseNodes = []
         
+        self.branching = None
+        if branchingClass is not None:
+            self.branching = branchingClass(formula)
+        self.transpositions = None
+        if transpositionSize:
+            self.transpositions = TranspositionTable(transpositionSize)
+        self.steps = 0
+        self.splits = 0
+        self.nodes = 1
+        self.merged = 0
+        
         self.resultStr = ""
         
         self.__isVerified = False
@@ -83,52 +148,119 @@ class FormulaVerifier(object):
         5)        zwróć SUKCES lub PORAŻKA
         6)    ELSE wrzuc c (lub l, p) na S
         
+        S jest kolejką FIFO (BREADTH_FIRST) albo stosem LIFO (DEPTH_FIRST), na który
+        l wrzucane jest po p, więc lewa gałąź rozwijana jest jako pierwsza.
+        Na S nie trafiają Clause, których stan był już rozwijany (_isNewState).
+        
         UWAGA!! z Clause przy wykonywaniu Clause.convertStep() mogą powstać
         dwa nowe obiekty Clause
         '''
         self._ifVerifiedAssert(False)
+        result = self.__expandTree()
+        logging.info("Drzewo konwersji (%s): %s", self.branchingName(), self.stats2str())
+        return result
+    
+    def __expandTree(self):
+        depthFirst = self.strategy == self.DEPTH_FIRST
+        if depthFirst:
+            frontier = []
+            takeNext = frontier.pop
+        else:
+            frontier = deque()
+            takeNext = frontier.popleft
         
-        queue = deque()
-        
-        queue.append(self.tree.root)
+        frontier.append(self.tree.root)
      
         # 1)
-        while queue:
+        while frontier:
             # 2)
-            parent = queue.popleft()
+            parent = takeNext()
             # 3)
-            newClauses = parent.clause.convertStep()
-            for c in newClauses:
+            newClauses = parent.clause.convertStep(self.branching)
+            self.steps += 1
+            self.nodes += len(newClauses)
+            if len(newClauses) > 1:
+                self.splits += 1
+            unresolved = []
+            for direct, c in enumerate(newClauses):
                 node  = ClauseBinTreeNode(c)
 
-                self.tree.addLeaf(node, parent)
+                self.__addNode(node, parent, direct)
                 
                 # 4)
                 if not c.isResolved():
                     # 6)
-                    queue.append(node)
+                    if self._isNewState(c):
+                        unresolved.append(node)
                 # 5)
                 else:
                     if c.isSuccess():
                         logging.debug("Znaleziono klauzulę weryfikującą")
-                        self.succClauseNodes.append(node)
+                        self.__addResolvedNode(self.succClauseNodes, node)
                         if self.endOnSuccess():
                             logging.debug("Znaleziono klauzulę weryfikującą -> "+
                                           "koniec weryfikacji")
                             return self._setResult(True)
                     else:
                         logging.debug("Znaleziono klauzulę dyskredytującą")
-                        self.failClauseNodes.append(node)
+                        self.__addResolvedNode(self.failClauseNodes, node)
                         if self.endOnFailure():
                             logging.debug("Znaleziono klauzulę dyskredytującą -> "+
                                           "koniec weryfikacji")
                             return self._setResult(False)
+            if depthFirst:
+                unresolved.reverse()
+            frontier.extend(unresolved)
         
         logging.debug("Przeanalizowano wszystkie klauzuly")
         
         return self.analyze()
     
-    def generateRaport(self, fformatter, raportFormat, treeNodeFromat=None):
+    def _isNewState(self, clause):
+        '''
+        czy stan nierozstrzygniętej Clause nie był już rozwijany (tablica transpozycji)
+        '''
+        if self.transpositions is None or self.transpositions.add(clause):
+            return True
+        self.merged += 1
+        return False
+    
+    def branchingName(self):
+        '''
+        nazwa polityki wyboru podformuły
+        '''
+        if self.branching is None:
+            return 'ORDER'
+        return self.branching.NAME
+    
+    def stats2str(self):
+        '''
+        liczniki rozwijania drzewa konwersji
+        '''
+        return "%d kroków, %d rozbić, %d węzłów, %d scalonych" % (
+            self.steps, self.splits, self.nodes, self.merged)
+    
+    def __addNode(self, node, parent, direct):
+        '''
+        dołącz węzeł node do drzewa konwersji, albo jeżeli drzewo nie jest
+        zapamiętywane, tylko nadaj mu ID (bez odwołań do ojca)
+        
+        direct to numer dziecka (ClauseBinTreeNode.NodeID.LEFT / RIGHT)
+        '''
+        if self.recordTree:
+            self.tree.addLeaf(node, parent)
+        else:
+            node.ID = ClauseBinTreeNode.NodeID(parent.ID, direct)
+    
+    def __addResolvedNode(self, nodes, node):
+        '''
+        zapamiętaj rozstrzygniętą klauzulę, jeżeli drzewo nie jest zapamiętywane
+        to tylko pierwszą
+        '''
+        if self.recordTree or not nodes:
+            nodes.append(node)
+    
+    def generateRaport(self, fformatter, raportFormat, treeNodeFromat=None, sharedSize=0):
         '''
         Generuje słowy raport z veryfikacji
         
@@ -136,7 +268,9 @@ class FormulaVerifier(object):
         {result}    -> wynik weryfikacji
         {proof}     -> dowód na wynik weryfikacji
         {valuation} -> wartościowanie przy którym potwierdza się wynik walidacji
-        {tree}      -> przebieg konwersji
+        {tree}      -> przebieg konwersji, podformuły klauzul większe (rozwinięte
+                       do drzew) niż sharedSize wypisywane są z definicjami
+                       wspólnych podformuł (ClauseBinTree.tree2str)
         '''
         self._ifVerifiedAssert(True)
         
@@ -150,7 +284,8 @@ class FormulaVerifier(object):
                 raport = raportFormat.format(**attars)
             except KeyError as e:
                 if e.args[0] == 'tree':
-                    attars['tree'] = self.__tree2str(fformatter, treeNodeFromat)
+                    attars['tree'] = self.__tree2str(fformatter, treeNodeFromat,
+                                                     sharedSize)
                 else:
                     raise Exception('Raport nie ma atrubutu `'+e.args[0]+'`')
             else:
@@ -158,8 +293,8 @@ class FormulaVerifier(object):
         
     
        
-    def __tree2str(self, fformatter, treeNodeFromat):
-        return self.tree.tree2str(fformatter, treeNodeFromat)
+    def __tree2str(self, fformatter, treeNodeFromat, sharedSize):
+        return self.tree.tree2str(fformatter, treeNodeFromat, sharedSize)
        
     def _result2str(self):
         pass
@@ -172,6 +307,23 @@ class FormulaVerifier(object):
     
  
     
+    def valuation(self):
+        '''
+        funkcja implementowana przez klasy SatisfiabilityVerifier, ValidityVerifier
+        
+        wartościowanie będące świadkiem wyniku weryfikacji: spełniające formułę
+        (dla spełnialności), albo falsyfikujące formułę (dla tautologii), w postaci
+        słownika nazwa zmiennej -> True/False. Zmienne których nie ma w słowniku
+        mogą mieć dowolną wartość. None, jeżeli wynik nie ma świadka.
+        '''
+        pass
+    
+    def _literals2valuation(self, literals, vtable, negate=False):
+        '''
+        wartościowanie przy którym literały są prawdziwe (albo fałszywe, jeżeli negate)
+        '''
+        return dict((vtable.name(lit), (lit > 0) != negate) for lit in literals)
+    
     def _createClause(self, formula):
         '''
         funkcja implementowana przez klasy SatisfiabilityVerifier, ValidityVerifier
@@ -213,7 +365,7 @@ class SatisfiabilityVerifier(FormulaVerifier):
         Operuje na ConjunctionClause
         '''
         
-        return ConjunctionClause(formula)
+        return ConjunctionClause(formula, vtable=self.vtable)
 
     def endOnSuccess(self):
         '''
@@ -234,6 +386,14 @@ class SatisfiabilityVerifier(FormulaVerifier):
         '''
         return self._setResult(self.succClauseNodes != [])
 
+    def valuation(self):
+        '''
+        literały klauzuli potwierdzającej spełnialność są prawdziwe
+        '''
+        if not self.success:
+            return None
+        return self._literals2valuation(self.succClauseNodes[0].clause.lvars, self.vtable)
+
     def _result2str(self):
         if self.success:
             return "Udowodniono spełnialność formuły"
@@ -267,7 +427,7 @@ class ValidityVerifier(FormulaVerifier):
         '''
         Operuje na DisjunctionClause
         '''
-        return DisjunctionClause(formula)
+        return DisjunctionClause(formula, vtable=self.vtable)
         
     def endOnSuccess(self):
         '''
@@ -299,6 +459,15 @@ Analiza walidacji czy formuła jest TAUTOLOGIĄ:
         len(self.failClauseNodes), "\n".join(map(str, self.failClauseNodes)))
         return self._setResult(self.failClauseNodes == [])
 
+    def valuation(self):
+        '''
+        literały klauzuli zaprzeczającej tezie są fałszywe
+        '''
+        if self.success:
+            return None
+        return self._literals2valuation(self.failClauseNodes[0].clause.lvars, 
+                                        self.vtable, negate=True)
+
     def _result2str(self):
         if self.success:
             return "Udowodniono, że formuła jest tautologią"
@@ -321,5 +490,339 @@ Analiza walidacji czy formuła jest TAUTOLOGIĄ:
         else:
             return self.failClauseNodes[0].clause2str(
                     fformatter, "{nodeId}: {clauseStatus} -> {clauseVars}, {clauseConsts}")
- 
-    
\ No newline at end of file
+
+
+class SolverVerifier(FormulaVerifier):
+    '''
+    Klasa bazowa weryfikacji silnikiem SAT
+    
+    Formuła kodowana jest do postaci CNF koderem cnf.CNFEncoder, a spełnialność
+    CNF rozstrzyga silnik SAT solvers.SatSolver. Drzewo konwersji nie jest
+    rozwijane, zawiera tylko korzeń.
+    
+    Dziedziczą z niej klasy:
+    * SolverSatisfiabilityVerifier -> do weryfikacji spełnilaności
+    * SolverValidityVerifier       -> do weryfikacji czy formuła jest tautologią
+    '''
+    
+    SOLVER = DPLLSolver
+    ENCODER = TseitinCNFEncoder
+    
+    def __init__(self, formula, vtable=None, solverClass=None, encoderClass=None):
+        '''
+        solverClass to klasa silnika SAT (domyślnie solvers.DPLLSolver),
+        encoderClass to klasa kodera CNF (domyślnie cnf.TseitinCNFEncoder)
+        '''
+        super(SolverVerifier, self).__init__(formula, vtable)
+        self.solverClass = solverClass or self.SOLVER
+        self.encoderClass = encoderClass or self.ENCODER
+        self.encoder = None
+        self.solver = None
+    
+    def verifyFormula(self):
+        '''
+        Weryfikuj formułę
+        
+        1) zakoduj formułę zwróconą przez _solverFormula do postaci CNF
+        2) rozstrzygnij spełnialność CNF silnikiem SAT
+        3) przełóż wynik silnika na wynik weryfikacji (_solverResult)
+        '''
+        self._ifVerifiedAssert(False)
+        
+        # zmienne pomocnicze kodera dodawane są do kopii tablicy zmiennych,
+        # tablica może być wspólna z innym weryfikatorem (CombinedVerifier)
+        vtable = self.vtable.copy()
+        self.encoder = self.encoderClass(self._solverFormula(), vtable)
+        clauses = self.encoder.encode()
+        self.solver = self.solverClass(clauses, len(vtable))
+        satisfiable = self.solver.solve()
+        logging.debug("Silnik %s: %s", self.solver.NAME, self.solver.stats2str())
+        return self._setResult(self._solverResult(satisfiable))
+    
+    def _model2str(self, fformatter):
+        '''
+        wartościowanie znalezione przez silnik SAT, bez zmiennych pomocniczych kodera
+        '''
+        return " , ".join(fformatter.literal2str(lit, self.encoder.vtable)
+                          for lit in self.solver.model
+                          if not self.encoder.isAuxiliary(abs(lit)))
+    
+    def valuation(self):
+        '''
+        wartościowanie znalezione przez silnik SAT (spełniające formułę albo jej
+        zaprzeczenie), bez zmiennych pomocniczych kodera
+        '''
+        if self.solver.model is None:
+            return None
+        return self._literals2valuation(
+            [lit for lit in self.solver.model if not self.encoder.isAuxiliary(abs(lit))],
+            self.encoder.vtable)
+    
+    def _solverStats2str(self):
+        return "silnik " + self.solver.NAME + ", " + \
+               str(len(self.solver.clauses)) + " klauzul CNF (" + \
+               self.solver.stats2str() + ")"
+    
+    def _solverFormula(self):
+        '''
+        funkcja implementowana przez klasy SolverSatisfiabilityVerifier, SolverValidityVerifier
+        
+        formuła, której spełnialność rozstrzyga silnik SAT
+        '''
+        pass
+    
+    def _solverResult(self, satisfiable):
+        '''
+        funkcja implementowana przez klasy SolverSatisfiabilityVerifier, SolverValidityVerifier
+        
+        wynik weryfikacji na podstawie wyniku silnika SAT
+        '''
+        pass
+
+
+class SolverSatisfiabilityVerifier(SolverVerifier, SatisfiabilityVerifier):
+    '''
+    Weryfikacja spełnialności silnikiem SAT
+    
+    Formuła jest spełnialna, jeżeli silnik SAT znajdzie wartościowanie
+    spełniające CNF formuły.
+    '''
+    
+    def _solverFormula(self):
+        return self.formula
+    
+    def _solverResult(self, satisfiable):
+        return satisfiable
+    
+    def _valuatoin2str(self, fformatter):
+        if self.success:
+            return "Formuła jest spełnialna przy wartościowaniu takim, że wszystkie literały i stałe: " +\
+                   self._model2str(fformatter) + "\n" +\
+                   "    są prawdziwe"
+        else:
+            return "Formuła nie jest spełnialna ponieważ niemożliwe jest wartościowanie, " +\
+                   "przy którym wszystkie klauzule CNF formuły są prawdziwe"
+    
+    def _proof2str(self, fformatter):
+        if self.success:
+            return "Znalezione wartościowanie spełnia wszystkie klauzule CNF formuły -> " +\
+                   self._solverStats2str()
+        else:
+            return "Każde wartościowanie prowadzi do sprzeczności w klauzulach CNF formuły -> " +\
+                   self._solverStats2str()
+
+
+class SolverValidityVerifier(SolverVerifier, ValidityVerifier):
+    '''
+    Weryfikacja czy formuła jest tautologią silnikiem SAT
+    
+    Formuła F jest tautologią wtedy i tylko wtedy gdy ~F nie jest spełnialna.
+    Wartościowanie spełniające ~F to wartościowanie przy którym F jest fałszywa.
+    '''
+    
+    def _solverFormula(self):
+        return NotOperation(self.formula)
+    
+    def _solverResult(self, satisfiable):
+        return not satisfiable
+    
+    def _valuatoin2str(self, fformatter):
+        if self.success:
+            return "Formuła jest tautologią więc jest prawdziwa dla każdego wartościowania"
+        else:
+            return "Formuła nie jest tautologią\n" +\
+                   "    nie jest prawdziwa dla wartościowania takiego że wszystkie literały i stałe: " +\
+                   self._model2str(fformatter) + '\n' +\
+                   "    są prawdziwe"
+    
+    def _proof2str(self, fformatter):
+        if self.success:
+            return "Zaprzeczenie formuły nie jest spełnialne -> " + self._solverStats2str()
+        else:
+            return "Znalezione wartościowanie spełnia zaprzeczenie formuły -> " +\
+                   self._solverStats2str()
+
+
+class ImpliedSatisfiabilityVerifier(SatisfiabilityVerifier):
+    '''
+    Spełnialność formuły wynikająca z tego, że jest tautologią
+    
+    Drzewo konwersji nie jest rozwijane, zawiera tylko korzeń (patrz CombinedVerifier).
+    '''
+    
+    def verifyFormula(self):
+        self._ifVerifiedAssert(False)
+        return self._setResult(True)
+    
+    def valuation(self):
+        '''
+        tautologia jest spełniona przy każdym wartościowaniu
+        '''
+        return {}
+    
+    def _valuatoin2str(self, fformatter):
+        return "Formuła jest tautologią więc jest spełnialna przy każdym wartościowaniu"
+    
+    def _proof2str(self, fformatter):
+        return "Formuła jest tautologią (weryfikacja tautologii)"
+
+
+def prepareFormulas(formulas, vtables):
+    '''
+    uprość formuły, dodaj ich zmienne do tablic zmiennych vtables
+    
+    Przechodzi DAG uproszczonych podformuł (bez rekurencji), od lewej do prawej,
+    więc zmienne dostają numery w kolejności wystąpienia. Zwraca ilość podformuł.
+    Wyniki makeSimple
+    zapamiętywane są w węzłach formuły, więc procesy utworzone później (fork)
+    dziedziczą uproszczone formuły, a ich tablice zmiennych nie różnią się numerami.
+    '''
+    vtables = set(vtables)
+    visited = set()
+    stack = list(reversed(formulas))
+    while stack:
+        formula = stack.pop()
+        if formula in visited:
+            continue
+        visited.add(formula)
+        simple = formula.makeSimple()
+        if simple.__class__ is LogicVariable:
+            for vtable in vtables:
+                vtable.literal(simple)
+            continue
+        stack.extend(reversed(simple.subformulas))
+    logging.debug("Uproszczono %d podformuł", len(visited))
+    return len(visited)
+
+
+def _verify(verifier):
+    '''
+    weryfikacja w procesie roboczym CombinedVerifier (metody obiektu nie da się
+    przekazać do multiprocessing.Pool), zwraca zweryfikowany obiekt albo wyjątek
+    weryfikacji (callback apply_async nie jest wywoływany dla wyjątków)
+    '''
+    try:
+        verifier.verifyFormula()
+    except Exception as e:
+        return e
+    return verifier
+
+
+def _verified(result):
+    '''
+    zweryfikowany obiekt z wyniku _verify, wyjątek weryfikacji jest zgłaszany
+    '''
+    verifier = result.get()
+    if isinstance(verifier, Exception):
+        raise verifier
+    return verifier
+
+
+class CombinedVerifier(object):
+    '''
+    Weryfikacja spełnialności i czy formuła jest tautologią w jednym przebiegu
+    
+    Łączy weryfikator spełnialności (SAT(F)) i weryfikator tautologii (SAT(~F)) tej
+    samej formuły, utworzone ze wspólną tablicą zmiennych. Przed weryfikacją formuła
+    i jej zaprzeczenie są raz upraszczane (Formula.makeSimple, Formula.negate są
+    zapamiętywane w węzłach formuły), więc obie połowy korzystają z tej samej
+    uproszczonej formuły i tych samych numerów zmiennych.
+    
+    Domyślnie weryfikacja jest sekwencyjna. Jeżeli jobs > 1, obie połowy weryfikowane
+    są równolegle w dwóch procesach (multiprocessing.Pool). Weryfikatory (razem
+    z uproszczoną formułą) są piklowane i przesyłane do procesów roboczych, a zweryfikowane
+    obiekty (z drzewami konwersji) odsyłane są do procesu głównego, więc pula opłaca
+    się tylko dla dużych formuł (przy jobs=None dopiero od PARALLEL_SIZE podformuł).
+    Wynik brany jest od połowy, która skończy pierwsza: jeżeli formuła nie jest
+    spełnialna, weryfikacja tautologii jest przerywana, a jeżeli jest tautologią,
+    przerywana jest weryfikacja spełnialności (ImpliedSatisfiabilityVerifier).
+    W razie błędu weryfikacji równoległej weryfikacja powtarzana jest sekwencyjnie.
+    
+    Po weryfikacji dostępne są:
+    * satisVerifier -> zweryfikowany weryfikator spełnialności
+    * validVerifier -> zweryfikowany weryfikator tautologii, albo None jeżeli
+                       formuła nie jest spełnialna
+    '''
+    
+    PARALLEL_SIZE = 5000
+    '''
+    ilość uproszczonych podformuł, od której przy jobs=None weryfikacja jest równoległa
+    '''
+    
+    def __init__(self, satisVerifier, validVerifier, jobs=1):
+        '''
+        satisVerifier, validVerifier -> niezweryfikowane weryfikatory tej samej formuły
+        (np. SatisfiabilityVerifier i ValidityVerifier)
+        
+        jobs -> ilość procesów, domyślnie 1 (weryfikacja sekwencyjna), None -> dwa
+        procesy dla formuł od PARALLEL_SIZE podformuł (i więcej niż jednego procesora)
+        '''
+        if satisVerifier.formula is not validVerifier.formula:
+            raise ValueError("Weryfikatory muszą dotyczyć tej samej formuły")
+        self.formula = satisVerifier.formula
+        self.satisVerifier = satisVerifier
+        self.validVerifier = validVerifier
+        self.jobs = jobs
+        self.satisfiable = None
+        self.valid = None
+    
+    def verifyFormula(self):
+        '''
+        Weryfikuj formułę, zwraca parę (czy spełnialna, czy tautologia)
+        '''
+        size = prepareFormulas([self.formula, NotOperation(self.formula)],
+                               [self.satisVerifier.vtable, self.validVerifier.vtable])
+        jobs = self.jobs
+        if jobs is None:
+            jobs = 1
+            if size >= self.PARALLEL_SIZE:
+                jobs = min(2, cpu_count())
+        if jobs > 1:
+            try:
+                self.__verifyParallel()
+            except Exception as e:
+                logging.warning("Weryfikacja równoległa nie powiodła się (%s), "+
+                                "weryfikacja sekwencyjna", e)
+                self.__verifySequential()
+        else:
+            self.__verifySequential()
+        
+        self.satisfiable = self.satisVerifier.success
+        self.valid = self.validVerifier is not None and self.validVerifier.success
+        return self.satisfiable, self.valid
+    
+    def __verifySequential(self):
+        if self.satisVerifier.verifyFormula():
+            self.validVerifier.verifyFormula()
+        else:
+            self.validVerifier = None
+    
+    def __verifyParallel(self):
+        logging.info("Weryfikacja równoległa w dwóch procesach")
+        pool = Pool(2)
+        try:
+            # ustawiane przez połowę, która skończy pierwsza
+            finished = threading.Event()
+            callback = lambda verifier: finished.set()
+            satisResult = pool.apply_async(_verify, (self.satisVerifier,), callback=callback)
+            validResult = pool.apply_async(_verify, (self.validVerifier,), callback=callback)
+            finished.wait()
+            if satisResult.ready():
+                satisVerifier = _verified(satisResult)
+                validVerifier = _verified(validResult) if satisVerifier.success else None
+            else:
+                validVerifier = _verified(validResult)
+                if validVerifier.success:
+                    # tautologia jest spełnialna
+                    satisVerifier = ImpliedSatisfiabilityVerifier(self.formula,
+                                                                  self.satisVerifier.vtable)
+                    satisVerifier.verifyFormula()
+                else:
+                    satisVerifier = _verified(satisResult)
+                    if not satisVerifier.success:
+                        validVerifier = None
+        finally:
+            pool.terminate()
+            pool.join()
+        self.satisVerifier = satisVerifier
+        self.validVerifier = validVerifier
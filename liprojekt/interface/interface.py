@@ -5,20 +5,32 @@ Created on 12-04-2013
 @author: pawel
 
 Moduł zawiera klasę Interface, która stanowi interfejs aplikacji
+
+Program często uruchamiany jest tysiące razy ze skryptów, więc moduły parsowania
+i weryfikacji (oraz pyparsing, argparse) importowane są dopiero wtedy, gdy są
+potrzebne - np. `liprojekt -l` nie importuje żadnego z nich. Silniki SAT,
+kodery CNF i weryfikatory równoległe podane są w tablicach klasy Interface
+pełnymi nazwami (importObject).
 '''
 
 import sys
-from datetime import datetime
-import argparse as argp
+import os
+import importlib
 import logging
 
-from pyparsing import ParseException
-
-from liprojekt.parsing.parsers import DefaultLogicExprParser
-from liprojekt.conversion.verification import SatisfiabilityVerifier, ValidityVerifier
-from liprojekt.conversion.formatting import FormulaFormatter
 from liprojekt.parsing.alphabets import SymbolicAlphabetMap, WordAlphabetMap
 
+
+def importObject(path):
+    '''
+    zwróć obiekt o pełnej nazwie path (`pakiet.moduł.obiekt`), moduł
+    importowany jest przy pierwszym użyciu
+    '''
+    if path is None:
+        return None
+    moduleName, name = path.rsplit('.', 1)
+    return getattr(importlib.import_module(moduleName), name)
+
     
 
 class Interface(object):
@@ -26,9 +38,16 @@ class Interface(object):
     Klasa wczytuje polecenia z klini komend i prezentuje wyniki
     weryfikacji spełnialności i czy formuła jest tautologią w rządany sposób
     
-    usage: LIProjekt [-h] (-f FORMULA | -i INPUT | -l [{DEFAULT,WORD,SYMBOLIC}])
-                 [-a {DEFAULT,WORD,SYMBOLIC}] [-o OUTPUT | -O OUTPUT]
-                 [-g GRAPH | -t] [-v] [-d] [--log LOG]
+    usage: LIProjekt [-h]
+                 (-f FORMULA | -i INPUT | -b BATCH | -D DIMACS | -l [{DEFAULT,WORD,SYMBOLIC}])
+                 [-a {DEFAULT,WORD,SYMBOLIC}] [-e {TREE,DPLL,CDCL}]
+                 [-c {TREE,TSEITIN,PG}] [--strategy {BFS,DFS}]
+                 [--branching {ORDER,SIMPLE,SMALLEST,FREQUENT}]
+                 [--transpositions TRANSPOSITIONS] [-j JOBS]
+                 [-w WORKERS] [--cache [CACHE]] [--cache-size CACHE_SIZE]
+                 [--write-dimacs WRITE_DIMACS] [--write-binary WRITE_BINARY]
+                 [--separator SEPARATOR] [-s]
+                 [-o OUTPUT | -O OUTPUT] [-g GRAPH | -t] [-v] [-d] [--log LOG]
 
     optional arguments:
       -h, --help            show this help message and exit
@@ -36,7 +55,16 @@ class Interface(object):
                             formuła do weryfikacji (jezeli zawiera spacje nalezy
                             umiescic ja w "") (default: None)
       -i INPUT, --input INPUT
-                            nazwa pliku z formula do weryfikacji (default: None)
+                            nazwa pliku z formula do weryfikacji (tekst albo
+                            format binarny z opcji --write-binary) (default: None)
+      -b BATCH, --batch BATCH
+                            nazwa pliku z wieloma formulami do weryfikacji, kazda
+                            weryfikowana jest osobno (`-` -> standardowe wejscie)
+                            (default: None)
+      -D DIMACS, --dimacs DIMACS
+                            nazwa pliku z formula w postaci CNF w formacie DIMACS
+                            (weryfikowana silnikiem SAT, przy -e TREE silnikiem
+                            CDCL) (default: None)
       -l [{DEFAULT,WORD,SYMBOLIC}], --legend [{DEFAULT,WORD,SYMBOLIC}]
                             legenda znakow alfabetu (default: None)
       -o OUTPUT, --output OUTPUT
@@ -56,6 +84,58 @@ class Interface(object):
       -a {DEFAULT,WORD,SYMBOLIC}, --alphabet {DEFAULT,WORD,SYMBOLIC}
                             zestaw znaków na do reprezentowania formuł
                             logicznych (default: DEFAULT)
+      -e {TREE,DPLL,CDCL}, --engine {TREE,DPLL,CDCL}
+                            silnik weryfikacji: TREE -> drzewo konwersji, DPLL,
+                            CDCL -> silnik SAT na postaci CNF formuły (default:
+                            TREE)
+      -c {TREE,TSEITIN,PG}, --cnf {TREE,TSEITIN,PG}
+                            kodowanie CNF dla silnika SAT: TREE -> drzewo
+                            konwersji (rownowazna, wykladnicza), TSEITIN, PG ->
+                            kodowanie Tseitina / Plaisted-Greenbaum (liniowe)
+                            (default: TSEITIN)
+      --strategy {BFS,DFS}  kolejnosc rozwijania drzewa konwersji: BFS -> wszerz,
+                            DFS -> w glab (pamiec proporcjonalna do glebokosci
+                            drzewa) (default: BFS)
+      --branching {ORDER,SIMPLE,SMALLEST,FREQUENT}
+                            kolejnosc rozwijania podformul w drzewie konwersji:
+                            ORDER -> kolejnosc z formuly, SIMPLE -> najpierw
+                            podformuly nierozbijajace, SMALLEST -> najpierw
+                            najmniejsze, FREQUENT -> najpierw z najczestsza
+                            zmienna (default: ORDER)
+      --transpositions TRANSPOSITIONS
+                            maksymalna ilosc stanow klauzul w tablicy transpozycji
+                            drzewa konwersji (klauzula o stanie juz rozwijanym nie
+                            jest rozwijana ponownie), 0 -> bez tablicy (default:
+                            65536)
+      -j JOBS, --jobs JOBS  ilosc procesow, przy wiecej niz 1 spelnialnosc i
+                            tautologia sprawdzane sa rownolegle, domyslnie
+                            rownolegle tylko duze formuly (default: None)
+      -w WORKERS, --workers WORKERS
+                            ilosc procesow rownolegle rozwijajacych drzewo
+                            konwersji (bez zapisu drzewa, nie dziala z -t)
+                            (default: None)
+      --cache [CACHE]       plik pamieci podrecznej wynikow weryfikacji (formuly
+                            rozniace sie nazwami zmiennych i kolejnoscia
+                            argumentow operacji przemiennych nie sa weryfikowane
+                            ponownie) (default: None, bez nazwy pliku:
+                            ~/.liprojekt_cache.db)
+      --cache-size CACHE_SIZE
+                            maksymalna ilosc wpisow w pamieci podrecznej
+                            (default: 10000)
+      --write-dimacs WRITE_DIMACS
+                            zapisz postac CNF formuly (kodowanie z opcji -c) do
+                            pliku w formacie DIMACS zamiast weryfikowac formule
+                            (default: None)
+      --write-binary WRITE_BINARY
+                            zapisz formule do pliku w formacie binarnym (wczytywany
+                            opcja -i bez parsowania) zamiast weryfikowac formule
+                            (default: None)
+      --separator SEPARATOR
+                            separator formul w pliku z opcja -b (sekwencje \\n, \\t
+                            sa rozwijane) (default: \\n)
+      -s, --simplify        upraszczaj formule podczas parsowania (stale, podwojne
+                            negacje, powtorzone argumenty, x & ~x), raport
+                            zawiera tez formule wejsciowa (default: False)
     
       -v, --verbose         czy wypisywac dodatkowe informacje podczas dzialania
                             programu (default: False)
@@ -66,11 +146,52 @@ class Interface(object):
     '''
     PROGRAM_NAME = "LIProjekt"
     LINELENGTH = 120
+    BATCH_FORMAT = "{number}: Spełnialna: {satisfiable}, Tautologia: {valid}\n"
+    BATCH_ERROR_FORMAT = "{number}: Niepoprawna składnia: {error}\n"
     ALPHABETS = { 
      'SYMBOLIC':    SymbolicAlphabetMap(),
      'WORD':        WordAlphabetMap(),
      'DEFAULT':     SymbolicAlphabetMap()
     }
+    ENGINES = {
+     'TREE':        None,
+     'DPLL':        'liprojekt.conversion.solvers.DPLLSolver',
+     'CDCL':        'liprojekt.conversion.cdcl.CDCLSolver'
+    }
+    PARALLEL_VERIFIERS = {
+     'SatisfiabilityVerifier':  'liprojekt.conversion.parallel.ParallelSatisfiabilityVerifier',
+     'ValidityVerifier':        'liprojekt.conversion.parallel.ParallelValidityVerifier'
+    }
+    ENCODERS = {
+     'TREE':        'liprojekt.conversion.cnf.ClauseTreeCNFEncoder',
+     'TSEITIN':     'liprojekt.conversion.cnf.TseitinCNFEncoder',
+     'PG':          'liprojekt.conversion.cnf.PlaistedGreenbaumCNFEncoder'
+    }
+    STRATEGIES = ('BFS', 'DFS')
+    '''
+    verification.FormulaVerifier.BREADTH_FIRST, verification.FormulaVerifier.DEPTH_FIRST
+    '''
+    BRANCHING = {
+     'ORDER':       None,
+     'SIMPLE':      'liprojekt.conversion.branching.BranchingPolicy',
+     'SMALLEST':    'liprojekt.conversion.branching.SmallestFirstPolicy',
+     'FREQUENT':    'liprojekt.conversion.branching.FrequentVariableFirstPolicy'
+    }
+    CACHE_PATH = os.path.join("~", ".liprojekt_cache.db")
+    CACHE_SIZE = 10000
+    '''
+    cache.ResultCache.DEFAULT_PATH, cache.ResultCache.DEFAULT_MAX_ENTRIES
+    '''
+    TRANSPOSITION_SIZE = 1 << 16
+    '''
+    transposition.TranspositionTable.DEFAULT_MAX_ENTRIES
+    '''
+    SHARED_FORMAT_SIZE = 1000
+    '''
+    formuły większe (rozwinięte do drzewa) wypisywane są z definicjami
+    wspólnych podformuł (formatting.FormulaFormatter.formula2defs), tak samo
+    podformuły klauzul drzewa konwersji w raporcie z opcją -t
+    '''
     
     ARGS = dict(           
         # czy wczytywac formule ze standardowego wejscia, czy z pliku?             
@@ -85,7 +206,22 @@ class Interface(object):
          ),
          (("-i", "--input"),
           dict(
-            help="nazwa pliku z formula do weryfikacji",
+            help="nazwa pliku z formula do weryfikacji (tekst albo format "+
+                "binarny z opcji --write-binary)",
+            type=str,
+          )
+         ),
+         (("-b", "--batch"),
+          dict(
+            help="nazwa pliku z wieloma formulami do weryfikacji, kazda "+
+                "weryfikowana jest osobno (`-` -> standardowe wejscie)",
+            type=str,
+          )
+         ),
+         (("-D", "--dimacs"),
+          dict(
+            help="nazwa pliku z formula w postaci CNF w formacie DIMACS "+
+                "(weryfikowana silnikiem SAT, przy -e TREE silnikiem CDCL)",
             type=str,
           )
          ),
@@ -109,6 +245,115 @@ class Interface(object):
             default='DEFAULT',
             choices=ALPHABETS.keys()
           )
+         ),
+         (("-e", "--engine"),
+          dict(
+            help="silnik weryfikacji: TREE -> drzewo konwersji, "+
+                "DPLL, CDCL -> silnik SAT na postaci CNF formuły",
+            type=str,
+            default='TREE',
+            choices=ENGINES.keys()
+          )
+         ),
+         (("-c", "--cnf"),
+          dict(
+            help="kodowanie CNF dla silnika SAT: TREE -> drzewo konwersji "+
+                "(rownowazna, wykladnicza), TSEITIN, PG -> kodowanie "+
+                "Tseitina / Plaisted-Greenbaum (liniowe)",
+            type=str,
+            default='TSEITIN',
+            choices=ENCODERS.keys()
+          )
+         ),
+         (("--strategy",),
+          dict(
+            help="kolejnosc rozwijania drzewa konwersji: BFS -> wszerz, "+
+                "DFS -> w glab (pamiec proporcjonalna do glebokosci drzewa)",
+            type=str,
+            default=STRATEGIES[0],
+            choices=STRATEGIES
+          )
+         ),
+         (("--branching",),
+          dict(
+            help="kolejnosc rozwijania podformul w drzewie konwersji: "+
+                "ORDER -> kolejnosc z formuly, SIMPLE -> najpierw podformuly "+
+                "nierozbijajace, SMALLEST -> najpierw najmniejsze, "+
+                "FREQUENT -> najpierw z najczestsza zmienna",
+            type=str,
+            default='ORDER',
+            choices=BRANCHING.keys()
+          )
+         ),
+         (("--transpositions",),
+          dict(
+            help="maksymalna ilosc stanow klauzul w tablicy transpozycji drzewa "+
+                "konwersji (klauzula o stanie juz rozwijanym nie jest rozwijana "+
+                "ponownie), 0 -> bez tablicy",
+            type=int,
+            default=TRANSPOSITION_SIZE
+          )
+         ),
+         (("-j", "--jobs"),
+          dict(
+            help="ilosc procesow, przy wiecej niz 1 spelnialnosc i tautologia "+
+                "sprawdzane sa rownolegle, domyslnie rownolegle tylko duze formuly",
+            type=int
+          )
+         ),
+         (("-w", "--workers"),
+          dict(
+            help="ilosc procesow rownolegle rozwijajacych drzewo konwersji "+
+                "(bez zapisu drzewa, nie dziala z -t)",
+            type=int
+          )
+         ),
+         (("--cache",),
+          dict(
+            help="plik pamieci podrecznej wynikow weryfikacji (formuly "+
+                "rozniace sie nazwami zmiennych i kolejnoscia argumentow "+
+                "operacji przemiennych nie sa weryfikowane ponownie)",
+            type=str,
+            nargs='?',
+            const=CACHE_PATH
+          )
+         ),
+         (("--cache-size",),
+          dict(
+            help="maksymalna ilosc wpisow w pamieci podrecznej",
+            type=int,
+            default=CACHE_SIZE
+          )
+         ),
+         (("--write-dimacs",),
+          dict(
+            help="zapisz postac CNF formuly (kodowanie z opcji -c) do pliku "+
+                "w formacie DIMACS zamiast weryfikowac formule",
+            type=str
+          )
+         ),
+         (("--write-binary",),
+          dict(
+            help="zapisz formule do pliku w formacie binarnym (wczytywany "+
+                "opcja -i bez parsowania) zamiast weryfikowac formule",
+            type=str
+          )
+         ),
+         (("--separator",),
+          dict(
+            help="separator formul w pliku z opcja -b "+
+                "(sekwencje \\n, \\t sa rozwijane)",
+            type=str,
+            default="\\n"
+          )
+         ),
+         (("-s", "--simplify"),
+          dict(
+            help="upraszczaj formule podczas parsowania (stale, podwojne "+
+                "negacje, powtorzone argumenty, x & ~x), raport zawiera tez "+
+                "formule wejsciowa",
+            action="store_true"
+          )
          )
         ],
                 
@@ -173,7 +418,8 @@ class Interface(object):
     
     
     def __init__(self):
-        self.__createArgParser()
+        # drzewo argumentów budowane jest dopiero przy parsowaniu argumentów
+        self.parser = None
         self.validVerif = None
         self.satisVerif = None
         
@@ -184,6 +430,9 @@ class Interface(object):
         self.alphabet = self.ALPHABETS[key]
     
     def __createArgParser(self):
+        if self.parser is not None:
+            return
+        import argparse as argp
         self.parser = argp.ArgumentParser(
                         prog=self.PROGRAM_NAME, 
                         formatter_class=argp.ArgumentDefaultsHelpFormatter)
@@ -233,6 +482,15 @@ class Interface(object):
 
     def __handleInput(self):
         
+        if self.sessionArgs.legend:
+            print self.ALPHABETS[self.sessionArgs.legend].getLegend();
+            sys.exit(0);
+        
+        from pyparsing import ParseException
+        from liprojekt.conversion.formatting import FormulaFormatter
+        from liprojekt.conversion.formulas import FormulaFactory, SimplifyingFormulaFactory
+        from liprojekt.parsing.pratt import PrattLogicExprParser
+        import liprojekt.conversion.serialization as serialization
         
         # wybiera składnię
         self.__setAlphabet(self.sessionArgs.alphabet)
@@ -241,9 +499,14 @@ class Interface(object):
         self.formulaFomratter = FormulaFormatter(self.alphabet)
         
         # wybiera parser formul
-        self.formulaParser = DefaultLogicExprParser(self.alphabet)
+        if self.sessionArgs.simplify:
+            factoryClass = SimplifyingFormulaFactory
+        else:
+            factoryClass = FormulaFactory
+        self.formulaParser = PrattLogicExprParser.forAlphabet(self.alphabet, factoryClass)
         
         self.formula = None
+        self.formulaText = None
         try:
             # czy podano formule
             if self.sessionArgs.formula is not None:
@@ -251,14 +514,22 @@ class Interface(object):
                     raise Exception("Podano pustą formułę")
                 else:
                     logging.info("formuła wczytana z wejścia")
+                    self.formulaText = self.sessionArgs.formula
                     self.formula = self.formulaParser.parseString(self.sessionArgs.formula)
             # czy podano plik
             elif self.sessionArgs.input:
                 logging.info("formula wyczytwana z `pliku` %s", self.sessionArgs.input)
-                self.formula = self.formulaParser.parseFile(self.sessionArgs.input)
-            elif self.sessionArgs.legend:
-                print self.ALPHABETS[self.sessionArgs.legend].getLegend();
-                sys.exit(0);
+                if serialization.isFormulaFile(self.sessionArgs.input):
+                    logging.info("plik z formułą w formacie binarnym")
+                    self.formula = serialization.loadFormula(self.sessionArgs.input)
+                else:
+                    self.formula = self.formulaParser.parseFile(self.sessionArgs.input)
+            # formuły czytane są kolejno w __handleBatch
+            elif self.sessionArgs.batch:
+                return
+            # plik DIMACS czytany jest w __handleDimacs
+            elif self.sessionArgs.dimacs:
+                return
             else:
                 print self.sessionArgs
                 raise Exception("Program nie ma nic do zrobienia")
@@ -282,28 +553,81 @@ class Interface(object):
             
             raise Exception("Nie udało się otworzyć pliku zawierającego formułę")
     
-        logging.info("Wyczytwana formula to:\n\t`%s`", 
-                 self.formulaFomratter.formula2str(self.formula))
-        logging.debug("[%s] => \n\t[%s]\n\t(%s)", self.sessionArgs.formula, 
-                  self.formulaFomratter.formula2str(self.formula),
-                  str(self.formula))
+        # formatowanie dużej formuły jest kosztowne, tylko gdy komunikat zostanie wypisany
+        if logging.getLogger().isEnabledFor(logging.INFO):
+            logging.info("Wyczytwana formula to:\n\t`%s`", 
+                     self.formulaFomratter.formula2str(self.formula))
+        if logging.getLogger().isEnabledFor(logging.DEBUG):
+            logging.debug("[%s] => \n\t[%s]\n\t(%s)", self.sessionArgs.formula, 
+                      self.formulaFomratter.formula2str(self.formula),
+                      str(self.formula))
 
         
+    def __parallelWorkers(self):
+        '''
+        ilość procesów rozwijających drzewo konwersji, albo None
+        '''
+        workers = self.sessionArgs.workers
+        if not workers or workers < 2 or self.ENGINES[self.sessionArgs.engine]:
+            return None
+        if self.sessionArgs.text:
+            logging.warning("Równoległe rozwijanie drzewa nie zapisuje drzewa konwersji, "+
+                            "opcja -w jest pomijana")
+            return None
+        return workers
+    
+    def __createVerifier(self, treeVerifierClass, solverVerifierClass, vtable):
+        solver = importObject(self.ENGINES[self.sessionArgs.engine])
+        branching = importObject(self.BRANCHING[self.sessionArgs.branching])
+        workers = self.__parallelWorkers()
+        if workers:
+            parallelVerifierClass = importObject(
+                self.PARALLEL_VERIFIERS[treeVerifierClass.__name__])
+            return parallelVerifierClass(self.formula, vtable, jobs=workers,
+                                         branchingClass=branching,
+                                         transpositionSize=self.sessionArgs.transpositions)
+        if solver is None:
+            # całe drzewo konwersji potrzebne jest tylko do raportu z opcją -t
+            return treeVerifierClass(self.formula, vtable, 
+                                     strategy=self.sessionArgs.strategy,
+                                     recordTree=self.sessionArgs.text,
+                                     branchingClass=branching,
+                                     transpositionSize=self.sessionArgs.transpositions)
+        encoder = importObject(self.ENCODERS[self.sessionArgs.cnf])
+        logging.info("Wybrano silnik SAT: %s, kodowanie CNF: %s", solver.NAME,
+                     self.sessionArgs.cnf)
+        return solverVerifierClass(self.formula, vtable, solverClass=solver,
+                                   encoderClass=encoder)
+        
     def __verifyFormula(self):
         
         self.satisfiable = False;
         self.valid = False;
         
-        # sprawdz czy formuła jest spełnialna
-        self.satisVerif = SatisfiabilityVerifier(self.formula)
-        if self.satisVerif.verifyFormula():
-            self.satisfiable = True;
+        cache = self.cache
+        cached = None
+        if cache is not None:
+            cached = cache.lookup(self.formula)
+        
+        if cached is not None:
+            # wynik z pamięci podręcznej, weryfikacja jest pomijana
+            from liprojekt.conversion.cache import CachedSatisfiabilityVerifier, \
+                CachedValidityVerifier
+            self.satisVerif = CachedSatisfiabilityVerifier(self.formula, cached)
+            self.satisfiable = self.satisVerif.verifyFormula()
+            if self.satisfiable:
+                self.validVerif = CachedValidityVerifier(self.formula, cached)
+                self.valid = self.validVerif.verifyFormula()
+        else:
+            self.__verifyCombined()
+            if cache is not None:
+                cache.store(self.formula, self.satisfiable, self.valid,
+                            self.satisVerif.valuation(), 
+                            self.validVerif.valuation() if self.validVerif else None)
+        
+        if self.satisfiable:
             logging.info("Formuła jest spełnialna")
-
-            # formuła jest spełnialna, sprawdz więc czy jest tautologią
-            self.validVerif = ValidityVerifier(self.formula)
-            if self.validVerif.verifyFormula():
-                self.valid = True;
+            if self.valid:
                 logging.info("Formuła jest tautologią")
             else:
                 logging.info("Formuła nie jest tautologią")
@@ -316,7 +640,7 @@ class Interface(object):
 Drzewo spelnialnosci:
 %s
 ========================================================
-""", str(self.satisVerif.tree))
+""", self.satisVerif.tree)
         
         if self.validVerif:
             logging.debug("""
@@ -324,10 +648,34 @@ Drzewo spelnialnosci:
 Drzewo pełności:
 %s
 ========================================================
-""", str(self.validVerif.tree))
+""", self.validVerif.tree)
 
 
 
+    def __verifyCombined(self):
+        from liprojekt.conversion.verification import SatisfiabilityVerifier, \
+            ValidityVerifier, SolverSatisfiabilityVerifier, SolverValidityVerifier, \
+            CombinedVerifier
+        from liprojekt.conversion.literals import VariableTable
+        
+        # spełnialność i tautologia sprawdzane są w jednym przebiegu,
+        # na wspólnej tablicy zmiennych
+        vtable = VariableTable()
+        jobs = self.sessionArgs.jobs
+        if jobs is None and self.sessionArgs.batch:
+            # pula procesów dla każdej formuły z pliku kosztuje więcej niż weryfikacja
+            jobs = 1
+        combined = CombinedVerifier(
+            self.__createVerifier(SatisfiabilityVerifier, 
+                                  SolverSatisfiabilityVerifier, vtable),
+            self.__createVerifier(ValidityVerifier,
+                                  SolverValidityVerifier, vtable),
+            # procesy rozwijające drzewo nie mogą być tworzone przez procesy robocze
+            1 if self.__parallelWorkers() else jobs)
+        self.satisfiable, self.valid = combined.verifyFormula()
+        self.satisVerif = combined.satisVerifier
+        self.validVerif = combined.validVerifier
+
     def __encapsRaport(self, raport):
         llength = self.LINELENGTH
         hline = ('='*llength) + '\n'
@@ -336,8 +684,12 @@ Drzewo pełności:
         stitle = hline + \
                 " LIPROJEKT RAPORT ".center(self.LINELENGTH, '-') + '\n' + \
                 hline
+        from datetime import datetime
         sdt = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
         sformula = self.getFormattedFormula()
+        if self.sessionArgs.simplify:
+            sformula = "Formuła wejściowa: " + self.getOriginalFormula() + '\n' + \
+                "Po uproszczeniu: " + sformula
         
         ssatis = "Spełnialna: " + \
             ("TAK" if self.satisfiable else "NIE") + '\n'
@@ -387,7 +739,7 @@ Drzewo pełności:
 
 '''
         raport += self.satisVerif.generateRaport(
-            self.formulaFomratter, raportFormat, conversionFormat)
+            self.formulaFomratter, raportFormat, conversionFormat, self.SHARED_FORMAT_SIZE)
         if self.satisfiable:
             rvalid = \
 '''
@@ -397,7 +749,7 @@ Drzewo pełności:
 
 '''
             rvalid += self.validVerif.generateRaport(
-            self.formulaFomratter, raportFormat, conversionFormat)          
+            self.formulaFomratter, raportFormat, conversionFormat, self.SHARED_FORMAT_SIZE)
             raport += '\n' + rvalid;
             
         return self.__encapsRaport(raport)
@@ -429,6 +781,143 @@ Drzewo pełności:
         
                 
     
+    def __openOutput(self):
+        '''
+        plik wyjściowy wskazany opcją -o / -O, albo None (standardowe wyjście)
+        '''
+        if self.sessionArgs.output:
+            return open(self.sessionArgs.output, 'w')
+        elif self.sessionArgs.Output:
+            return open(self.sessionArgs.Output, 'a')
+        return None
+
+    def __handleBatch(self):
+        '''
+        weryfikuj kolejno formuły z pliku -b, wynik każdej formuły zapisywany
+        jest w osobnej linii zaraz po jej weryfikacji
+        '''
+        separator = self.sessionArgs.separator.decode('string_escape')
+        try:
+            if self.sessionArgs.batch == '-':
+                logging.info("formuły wczytywane ze standardowego wejścia")
+                stream = sys.stdin
+            else:
+                logging.info("formuły wczytywane z `pliku` %s", self.sessionArgs.batch)
+                stream = open(self.sessionArgs.batch)
+            output = self.__openOutput()
+        except IOError, err:
+            logging.error("nie można otworzyć pliku"+"\n"
+                          + "Errno=" + str(err.errno)+"\n"
+                          + "Komunikat: " + str(err.strerror)+"\n")
+            raise Exception("Nie udało się otworzyć pliku z formułami")
+        
+        if output is None:
+            output = sys.stdout
+        counts = dict(verified=0, errors=0)
+        try:
+            for record in self.formulaParser.parseStream(stream, separator):
+                if not record.isValid():
+                    counts['errors'] += 1
+                    logging.error("formuła nr %d ma niepoprawną składnię: %s",
+                                  record.number, record.error)
+                    output.write(self.BATCH_ERROR_FORMAT.format(
+                        number=record.number, error=record.error))
+                    continue
+                self.formula = record.formula
+                self.formulaText = record.text
+                self.__verifyFormula()
+                counts['verified'] += 1
+                output.write(self.BATCH_FORMAT.format(
+                    number=record.number,
+                    satisfiable="TAK" if self.satisfiable else "NIE",
+                    valid="TAK" if self.valid else "NIE"))
+                output.flush()
+        finally:
+            if stream is not sys.stdin:
+                stream.close()
+            if output is not sys.stdout:
+                output.close()
+        logging.info("Zweryfikowano formuł: %d, z błędami składni: %d",
+                     counts['verified'], counts['errors'])
+
+    def __handleDimacs(self):
+        '''
+        weryfikuj CNF z pliku DIMACS silnikiem SAT, bez tworzenia formuły
+        '''
+        from liprojekt.conversion.dimacs import DimacsReader
+        solverClass = importObject(self.ENGINES[self.sessionArgs.engine] or
+                                   self.ENGINES['CDCL'])
+        try:
+            clauses = DimacsReader(self.sessionArgs.dimacs).read()
+        except IOError, err:
+            logging.error("nie można otworzyć pliku DIMACS"+"\n"
+                          + "Errno=" + str(err.errno)+"\n"
+                          + "Komunikat: " + str(err.strerror)+"\n")
+            raise Exception("Nie udało się otworzyć pliku DIMACS")
+        logging.info("Wczytano %d klauzul nad %d zmiennymi, silnik SAT: %s",
+                     len(clauses), clauses.numVars, solverClass.NAME)
+        
+        solver = solverClass(clauses, clauses.numVars)
+        self.satisfiable = solver.solve()
+        self.valid = clauses.isValid()
+        logging.debug("Silnik %s: %s", solver.NAME, solver.stats2str())
+        
+        raport = "Spełnialna: " + ("TAK" if self.satisfiable else "NIE") + "\n" + \
+                 "Tautologia: " + ("TAK" if self.valid else "NIE") + "\n"
+        if self.satisfiable:
+            raport += "Wartościowanie := " + \
+                      " ".join(str(lit) for lit in solver.model) + " 0\n"
+        output = self.__openOutput()
+        if output is None:
+            sys.stdout.write(raport)
+        else:
+            with output:
+                output.write(raport)
+
+    def __writeDimacs(self):
+        '''
+        zapisz CNF formuły w formacie DIMACS do pliku --write-dimacs
+        '''
+        from liprojekt.conversion.dimacs import formula2dimacs
+        encoderClass = importObject(self.ENCODERS[self.sessionArgs.cnf])
+        with open(self.sessionArgs.write_dimacs, 'w') as f:
+            encoder = formula2dimacs(f, self.formula, encoderClass)
+        logging.info("Zapisano %d klauzul CNF (%s) do pliku %s",
+                     len(encoder.encode()), self.sessionArgs.cnf,
+                     self.sessionArgs.write_dimacs)
+
+    def __writeBinary(self):
+        '''
+        zapisz formułę w formacie binarnym do pliku --write-binary
+        '''
+        from liprojekt.conversion.serialization import dumpFormula
+        dumpFormula(self.sessionArgs.write_binary, self.formula)
+        logging.info("Zapisano formułę w formacie binarnym do pliku %s",
+                     self.sessionArgs.write_binary)
+
+    def __runSession(self):
+        self.__handleLogging()
+        self.__handleInput()
+        self.cache = None
+        if self.sessionArgs.cache:
+            from liprojekt.conversion.cache import ResultCache
+            self.cache = ResultCache(self.sessionArgs.cache, self.sessionArgs.cache_size)
+        try:
+            if self.sessionArgs.batch:
+                self.__handleBatch()
+            elif self.sessionArgs.dimacs:
+                self.__handleDimacs()
+            elif self.sessionArgs.write_dimacs:
+                self.__writeDimacs()
+            elif self.sessionArgs.write_binary:
+                self.__writeBinary()
+            else:
+                self.__verifyFormula()
+                self.__handleOutput()
+        finally:
+            if self.cache is not None:
+                self.cache.close()
+
     def __loadArguments(self, group, name):
         for arg in self.ARGS[name]:
             group.add_argument(*arg[0], **arg[1])
@@ -442,11 +931,9 @@ Drzewo pełności:
         3)  Jeżeli formuła jest spełnialna to sprawdź czy jest tautologią
         4) Prezentuj wyniki
         '''
+        self.__createArgParser()
         self.sessionArgs = self.parser.parse_args()
-        self.__handleLogging()
-        self.__handleInput()
-        self.__verifyFormula()
-        self.__handleOutput()
+        self.__runSession()
         
         logging.debug("""
 %s
@@ -456,17 +943,24 @@ Drzewo pełności:
 
     
     def getFormattedFormula(self):
-        return self.formulaFomratter.formula2str(self.formula)
+        return self.formulaFomratter.formula2defs(self.formula, self.SHARED_FORMAT_SIZE)
+    
+    def getOriginalFormula(self):
+        '''
+        tekst formuły przed uproszczeniem (opcja -s), dla formuły z pliku
+        (może być bardzo duży) zwracana jest nazwa pliku
+        '''
+        if self.formulaText is not None:
+            return self.formulaText
+        return "plik " + self.sessionArgs.input
 
     def testRun(self, args):
         '''
         Testowe wykonanie aplikacji
         '''
+        self.__createArgParser()
         self.sessionArgs = self.parser.parse_args(args)
-        self.__handleLogging()
-        self.__handleInput()
-        self.__verifyFormula()
-        self.__handleOutput()
+        self.__runSession()
         
         logging.debug("""
 %s
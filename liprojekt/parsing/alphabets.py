@@ -71,6 +71,36 @@ class AlphabetMap(object):
     def notNeedSpace(self):
         return self.NOT_NEED_SPACE
     
+    def getDefinitions(self):
+        '''
+        zwraca mapę symboli definicji nazwanych podformuł:
+        [let] <nazwa> be <formuła> in, pusty symbol `let` jest pomijany
+        '''
+        return self.DEFINITIONS
+    
+    def getDefinitionSymbol(self, key):
+        '''
+        zwraca rządany symbol definicji, jeżeli nie ma takiego symbolu
+        w alfabecie, rzucany jest wyjątek
+        '''
+        try:
+            return self.getDefinitions()[key]
+        except KeyError:
+            raise Exception("Alfabet nie ma symbolu definicji o kodzie `"+key+"`")
+    
+    def getDefinitionFormat(self):
+        '''
+        zwraca format definicji nazwanej podformuły
+        '''
+        return self.DEFINITION_FORMAT
+    
+    def getReservedWords(self):
+        '''
+        zwraca zbiór symboli, które nie mogą być nazwami definicji
+        '''
+        return set(self.OPERATORS.values()) | set(self.CONSTANTS.values()) | \
+            set(symbol for symbol in self.DEFINITIONS.values() if symbol)
+    
     
     
     def getLegend(self):
@@ -94,6 +124,12 @@ class AlphabetMap(object):
         legend += "Nawiasy:\n"
         for name, symbol in self.PARENTHESIS.items():
             legend += " "*3+name.ljust(6)+" ".rjust(10, '-')+symbol+"\n"
+        legend+= "\n"
+        
+        legend += "-"*20 + "\n"
+        legend += "Definicje:\n"
+        legend += " "*3+self.getDefinitionFormat().format(
+            name="<nazwa>", formula="<formuła>", **self.DEFINITIONS).strip()+" <formuła>\n"
         return legend;
         
         def __str__(self):
@@ -125,6 +161,14 @@ class SymbolicAlphabetMap(AlphabetMap):
     NOT_FORMAT = "{not}{subformula}"
     NOT_NEED_SPACE = False
     
+    DEFINITIONS = {
+        'let':      '',
+        'be':       ':=',
+        'in':       ';'
+    }
+    
+    DEFINITION_FORMAT = "{name} {be} {formula}{in} "
+    
 class WordAlphabetMap(AlphabetMap):
     '''
     Składnia oparta na słowach
@@ -150,4 +194,12 @@ class WordAlphabetMap(AlphabetMap):
     }
     
     NOT_FORMAT = "{not} {subformula}"
-    NOT_NEED_SPACE = True
\ No newline at end of file
+    NOT_NEED_SPACE = True
+    
+    DEFINITIONS = {
+        'let':      'let',
+        'be':       'be',
+        'in':       'in'
+    }
+    
+    DEFINITION_FORMAT = "{let} {name} {be} {formula} {in} "
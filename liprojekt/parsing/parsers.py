@@ -7,20 +7,68 @@ Created on 02-03-2013
 
 Moduł zawiera narzędzia do parsowania łańcuchów znaków na
 formuły logiczne klasy fomulas.Formula
+
+Parsery są budowane raz na proces dla każdej klasy alfabetu
+(LogicExprParser.forAlphabet), gramatyka pyparsing jest kompilowana raz
+dla klasy alfabetu, a pamięć podręczna packrat ma ograniczony rozmiar
+(PACKRAT_CACHE_SIZE) i jest czyszczona po każdej formule.
 '''
 
 
-from pyparsing import Literal, Keyword, Word, ParserElement, \
-    opAssoc, StringEnd, alphas, alphanums
+from pyparsing import Literal, Keyword, Word, ParserElement, ParseException, \
+    ParseFatalException, Suppress, ZeroOrMore, opAssoc, StringEnd, alphas, alphanums
 
 from liprojekt.conversion.formulas import FormulaFactory
 import liprojekt.parsing.myparsing as myparsing
+import liprojekt.parsing.streams as streams
+
+
+PACKRAT_CACHE_SIZE = 4096
+'''
+maksymalna ilość wpisów pamięci podręcznej packrat biblioteki pyparsing
+'''
+
+def enablePackrat():
+    '''
+    włącz (raz na proces) pamięć podręczną packrat o rozmiarze PACKRAT_CACHE_SIZE
+
+    Starsze wersje pyparsing nie ograniczają rozmiaru pamięci, wtedy jest ona
+    tylko czyszczona po każdej formule.
+    '''
+    try:
+        ParserElement.enablePackrat(PACKRAT_CACHE_SIZE)
+    except TypeError:
+        ParserElement.enablePackrat()
 
 class LogicExprParser(object):
     '''
     Klasa wirtualna, bazowa dla parserów formuł logicznych 
     '''
-    pass
+    
+    _instances = {}
+    '''
+    parsery wspólne dla procesu, według (klasa parsera, klasa alfabetu, klasa fabryki)
+    '''
+    
+    @classmethod
+    def forAlphabet(cls, alphabet, factoryClass=FormulaFactory):
+        '''
+        Zwraca parser klasy cls dla alfabetu alphabet, tworzony raz na proces
+        dla każdej klasy alfabetu (alphabets.AlphabetMap) i klasy fabryki formuł
+        factoryClass (formulas.FormulaFactory)
+        '''
+        key = (cls, alphabet.__class__, factoryClass)
+        parser = LogicExprParser._instances.get(key)
+        if parser is None:
+            parser = LogicExprParser._instances[key] = cls(alphabet, factoryClass)
+        return parser
+    
+    def parseStream(self, stream, separator=streams.DEFAULT_SEPARATOR):
+        '''
+        Zwraca strumień formuł (streams.FormulaStream) czytanych kolejno
+        z otwartego pliku stream, rekordy rozdzielone są separatorem
+        '''
+        return streams.FormulaStream(self, stream, separator)
 
 class DefaultLogicExprParser(LogicExprParser):
     '''
@@ -42,6 +90,8 @@ class DefaultLogicExprParser(LogicExprParser):
     
     BNF
     
+    <text>       ::= <definition>* <expression>
+    <definition> ::= [LET] <variable> BE <expression> IN
     <expression> ::= <imp-term> [EQL <imp-term>]*
     <imp-term>   ::= <or-term> [EQL <or-term>]*
     <or-term>    ::= <and-term> [EQL <and-term>]*
@@ -54,16 +104,42 @@ class DefaultLogicExprParser(LogicExprParser):
     <alpha>      ::= 'A'..'Z' 'a'..'z'
     <uscore>     ::= '_'
     <digit>      ::= '0'..'9'
+    
+    Nazwa definicji (LET, BE, IN -> alphabet.getDefinitions()) użyta w dalszej
+    części tekstu oznacza zdefiniowaną formułę, więc wynik jest grafem DAG.
+    
+    Skompilowana gramatyka jest wspólna dla wszystkich parserów tej samej
+    klasy alfabetu i klasy fabryki formuł.
+    '''
+    
+    _grammars = {}
+    '''
+    skompilowane gramatyki (fabryka formuł, gramatyka, definicje) według
+    (klasa alfabetu, klasa fabryki formuł)
     '''
     
-    def __init__(self, alphabet):
+    def __init__(self, alphabet, factoryClass=FormulaFactory):
+        '''
+        factoryClass to klasa fabryki formuł (formulas.FormulaFactory),
+        np. formulas.SimplifyingFormulaFactory
+        '''
         self.operators = alphabet.getOperators()
         self.constants = alphabet.getConstants()
         self.notNeedSpace = alphabet.notNeedSpace()
+        self.definitionSymbols = alphabet.getDefinitions()
+        self.reserved = alphabet.getReservedWords()
         
-        self.ffactory = FormulaFactory()
-        self.__createGram()
-        ParserElement.enablePackrat()
+        key = (alphabet.__class__, factoryClass)
+        grammar = self._grammars.get(key)
+        if grammar is None:
+            enablePackrat()
+            self.ffactory = factoryClass()
+            # definicje wczytane w bieżącym tekście, wspólne z akcjami gramatyki
+            self.definitions = {}
+            self.__createGram()
+            self._grammars[key] = (self.ffactory, self.final, self.definitions)
+        else:
+            self.ffactory, self.final, self.definitions = grammar
         
         
     def __createGram(self):
@@ -83,7 +159,7 @@ class DefaultLogicExprParser(LogicExprParser):
         
         lVar = Word(alphas, alphanums+'_')
         
-        lVar.setParseAction(self.ffactory.createLogicVariable)
+        lVar.setParseAction(self.__createVariable)
         lTrue.setParseAction(self.ffactory.createLogicTruth)
         lFalse.setParseAction(self.ffactory.createLogicFalse)
 
@@ -100,14 +176,49 @@ class DefaultLogicExprParser(LogicExprParser):
         [('(', ')'), ('[', ']'), ('{', '}')])
     
 
-        self.final = expression + StringEnd()
+        definition = Word(alphas, alphanums+'_') + \
+            Suppress(self.__symbol(self.definitionSymbols['be'])) + expression + \
+            Suppress(self.__symbol(self.definitionSymbols['in']))
+        if self.definitionSymbols['let']:
+            definition = Suppress(self.__symbol(self.definitionSymbols['let'])) + definition
+        definition.setParseAction(self.__define)
+
+        self.final = ZeroOrMore(definition) + expression + StringEnd()
+    
+    @staticmethod
+    def __symbol(symbol):
+        if symbol[-1].isalnum():
+            return Keyword(symbol)
+        return Literal(symbol)
+    
+    def __createVariable(self, tokens):
+        formula = self.definitions.get(tokens[0])
+        if formula is None:
+            return self.ffactory.createLogicVariable(tokens)
+        return formula
+    
+    def __define(self, text, loc, tokens):
+        name, formula = tokens[0], tokens[1]
+        loc = text.find(name, loc)
+        if name in self.reserved:
+            raise ParseFatalException(text, loc, "Nazwa `" + name + "` jest zarezerwowana")
+        if name in self.definitions:
+            raise ParseFatalException(text, loc, "Nazwa `" + name + "` jest już zdefiniowana")
+        self.definitions[name] = formula
+        return []
         
     def parseString(self, logicExprStr):
         '''
         Zwraca formułę logiczną klasy formulas.Formula,
         po sparsowaniu łańcucha logicExprStr
         '''
-        return self.final.parseString(logicExprStr)[0]
+        try:
+            return self.final.parseString(logicExprStr)[0]
+        except ParseFatalException, err:
+            raise ParseException(err.pstr, err.loc, err.msg)
+        finally:
+            self.definitions.clear()
+            ParserElement.resetCache()
     
     def parseFile(self, logicExprFileName):
         '''
@@ -115,7 +226,13 @@ class DefaultLogicExprParser(LogicExprParser):
         po sparsowaniu łańcucha znajdującego się w pliku o nazwie
         logicExprFileName
         '''
-        return self.final.parseFile(logicExprFileName)[0]
+        try:
+            return self.final.parseFile(logicExprFileName)[0]
+        except ParseFatalException, err:
+            raise ParseException(err.pstr, err.loc, err.msg)
+        finally:
+            self.definitions.clear()
+            ParserElement.resetCache()
     
     
 
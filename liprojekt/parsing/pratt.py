@@ -0,0 +1,438 @@
+# -*- coding: utf-8 -*-
+
+'''
+Moduł zawiera parser formuł logicznych bez biblioteki pyparsing:
+* LogicExprLexer        -> lekser sterowany tablicami symboli alfabetu
+* PrattLogicExprParser  -> parser z hierarchią operatorów (precedence climbing)
+* MappedParseException  -> błąd składni w pliku mapowanym do pamięci
+
+Gramatyka jest taka sama jak w parsers.DefaultLogicExprParser (ta sama hierarchia
+operatorów, trzy rodzaje nawiasów, słowa kluczowe), ale każdy znak tekstu
+czytany jest raz, więc czas parsowania jest liniowy względem długości formuły.
+Parser nie używa rekurencji (jawny stos), więc formuły mogą być zagnieżdżone
+na dowolną głębokość (nawiasy, negacje, ciągi implikacji).
+Formuły tworzone są tą samą fabryką (formulas.FormulaFactory), a błędy składni
+zgłaszane są wyjątkiem pyparsing.ParseException z pozycją błędu.
+
+Plik z formułą (parseFile) mapowany jest do pamięci (mmap), lekser czyta
+symbole wprost z mapowanego bufora, bez wczytywania całego tekstu do pamięci.
+
+Formułę mogą poprzedzać definicje nazwanych podformuł (alphabets.AlphabetMap.getDefinitions),
+np. `a := p & q; b := a | ~a; a => b` albo `let a be p and q in a or not a`.
+Nazwa definicji użyta dalej w tekście oznacza zdefiniowaną formułę (ten sam
+obiekt), więc wynik jest grafem DAG, a tekst nie musi powtarzać podformuł.
+'''
+
+import mmap
+import re
+
+from pyparsing import ParseException
+
+from liprojekt.conversion.formulas import FormulaFactory
+from liprojekt.parsing.parsers import LogicExprParser
+
+
+class LogicExprLexer(object):
+    '''
+    Lekser formuł logicznych zapisanych w alfabecie (alphabets.AlphabetMap)
+
+    Symbol jest rozpoznawany w zależności od miejsca w formule:
+    * na miejscu argumentu (operand) -> negacja, nawias otwierający, stała, zmienna
+    * na miejscu operatora (operator) -> operator dwuargumentowy, nawias zamykający
+
+    Dzięki temu, tak jak w gramatyce pyparsing, słowo `and` na miejscu argumentu
+    jest nazwą zmiennej, a na miejscu operatora koniunkcją. Stałe (i negacja
+    jeżeli alphabet.notNeedSpace()) są słowami kluczowymi - nie mogą być
+    początkiem dłuższej nazwy zmiennej.
+
+    Token to krotka (rodzaj, wartość, początek, koniec). Tekst może być łańcuchem
+    znaków albo plikiem mapowanym do pamięci (mmap), lekser używa tylko
+    wycinków i wyrażeń regularnych.
+    '''
+
+    NOT, TRUE, FALSE, VARIABLE, OPEN, CLOSE, BINARY = range(7)
+
+    PARENTHESES = (('(', ')'), ('[', ']'), ('{', '}'))
+    '''
+    pary nawiasów, takie same jak w gramatyce parsers.DefaultLogicExprParser
+    '''
+
+    BINARY_OPERATORS = ('and', 'or', 'impL', 'equ')
+
+    IDENT_CHARS = frozenset('abcdefghijklmnopqrstuvwxyz'
+                            'ABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789_$')
+    '''
+    znaki, które nie mogą następować po słowie kluczowym (jak pyparsing.Keyword)
+    '''
+
+    WHITESPACE = re.compile(r'[ \t\r\n]*')
+    VARIABLE_RE = re.compile(r'[A-Za-z][A-Za-z0-9_]*')
+
+    def __init__(self, alphabet):
+        operators = alphabet.getOperators()
+        constants = alphabet.getConstants()
+
+        # (symbol, rodzaj, wartość, czy słowo kluczowe)
+        self.operandTable = [
+            (operators['not'], self.NOT, operators['not'], alphabet.notNeedSpace()),
+            (constants['true'], self.TRUE, constants['true'], True),
+            (constants['false'], self.FALSE, constants['false'], True)
+        ]
+        self.operandTable.extend((opening, self.OPEN, closing, False)
+                                 for opening, closing in self.PARENTHESES)
+
+        # dłuższe symbole przed krótszymi, np. `<=>` przed `=>`
+        self.operatorTable = sorted(
+            ((operators[name], self.BINARY, name) for name in self.BINARY_OPERATORS),
+            key=lambda entry: -len(entry[0]))
+        self.operatorTable.extend((closing, self.CLOSE, closing)
+                                  for _, closing in self.PARENTHESES)
+
+        # symbole według pierwszego znaku, sprawdzane są tylko pasujące wpisy
+        self.operandIndex = self.__index(self.operandTable)
+        self.operatorIndex = self.__index(self.operatorTable)
+        
+        definitions = alphabet.getDefinitions()
+        self.letSymbol = definitions['let']
+        self.beSymbol = definitions['be']
+        self.inSymbol = definitions['in']
+
+    @staticmethod
+    def __index(table):
+        index = {}
+        for entry in table:
+            index.setdefault(entry[0][0], []).append(entry)
+        return index
+
+    def skip(self, text, pos):
+        '''
+        zwróć pozycję pierwszego znaku po białych znakach od pozycji pos
+        '''
+        return self.WHITESPACE.match(text, pos).end()
+
+    def operand(self, text, pos):
+        '''
+        token na miejscu argumentu od pozycji pos (po białych znakach),
+        albo None jeżeli na tej pozycji nie zaczyna się argument
+        '''
+        pos = self.skip(text, pos)
+        for symbol, kind, value, keyword in self.operandIndex.get(text[pos:pos + 1], ()):
+            end = pos + len(symbol)
+            if text[pos:end] == symbol:
+                if keyword and end < len(text) and text[end] in self.IDENT_CHARS:
+                    continue
+                return (kind, value, pos, end)
+        match = self.VARIABLE_RE.match(text, pos)
+        if match is not None:
+            return (self.VARIABLE, match.group(), pos, match.end())
+        return None
+
+    def symbol(self, text, pos, symbol):
+        '''
+        koniec symbolu symbol od pozycji pos (po białych znakach), albo None;
+        symbol kończący się literą jest słowem kluczowym
+        '''
+        pos = self.skip(text, pos)
+        end = pos + len(symbol)
+        if text[pos:end] != symbol:
+            return None
+        if symbol[-1:] in self.IDENT_CHARS and text[end:end + 1] in self.IDENT_CHARS:
+            return None
+        return end
+    
+    def definition(self, text, pos):
+        '''
+        początek definicji `[let] nazwa be` od pozycji pos, zwraca krotkę
+        (nazwa, początek nazwy, koniec symbolu be) albo None
+        '''
+        if self.letSymbol:
+            pos = self.symbol(text, pos, self.letSymbol)
+            if pos is None:
+                return None
+        start = self.skip(text, pos)
+        match = self.VARIABLE_RE.match(text, start)
+        if match is None:
+            return None
+        end = self.symbol(text, match.end(), self.beSymbol)
+        if end is None:
+            return None
+        return (match.group(), start, end)
+    
+    def operator(self, text, pos):
+        '''
+        token na miejscu operatora od pozycji pos (po białych znakach),
+        albo None jeżeli na tej pozycji nie ma operatora ani nawiasu zamykającego
+        '''
+        pos = self.skip(text, pos)
+        for symbol, kind, value in self.operatorIndex.get(text[pos:pos + 1], ()):
+            end = pos + len(symbol)
+            if text[pos:end] == symbol:
+                return (kind, value, pos, end)
+        return None
+
+
+class PrattLogicExprParser(LogicExprParser):
+    '''
+    Parser formuł logicznych z hierarchią operatorów (precedence climbing)
+
+    Kolejność operatorów (od najsilniej wiążącego) i łączność jak w
+    parsers.DefaultLogicExprParser:
+    1) NOT
+    2) AND  (lewostronnie łączny)
+    3) OR   (lewostronnie łączny)
+    4) IMP  (prawostronnie łączny)
+    5) EQU  (lewostronnie łączny)
+
+    Ciąg operatorów tego samego poziomu, np. `p & q & r`, przekazywany jest
+    fabryce formuł w całości, tak jak robią to akcje gramatyki pyparsing.
+    '''
+
+    LEVELS = {
+        'equ':  1,
+        'impL': 2,
+        'or':   3,
+        'and':  4
+    }
+
+    def __init__(self, alphabet, factoryClass=FormulaFactory):
+        '''
+        factoryClass to klasa fabryki formuł (formulas.FormulaFactory),
+        np. formulas.SimplifyingFormulaFactory
+        '''
+        self.operators = alphabet.getOperators()
+        self.reserved = alphabet.getReservedWords()
+        self.ffactory = factoryClass()
+        self.lexer = LogicExprLexer(alphabet)
+        self.builders = {
+            'and':  self.ffactory.createAndOperation,
+            'or':   self.ffactory.createOrOperation,
+            'impL': self.ffactory.createImpicationOperation,
+            'equ':  self.ffactory.createEquvalenceOperation
+        }
+
+    def parseString(self, logicExprStr):
+        '''
+        Zwraca formułę logiczną klasy formulas.Formula,
+        po sparsowaniu łańcucha logicExprStr
+        '''
+        return self.__parse(logicExprStr)
+
+    def parseFile(self, logicExprFileName):
+        '''
+        Zwraca formułę logiczną klasy formulas.Formula,
+        po sparsowaniu łańcucha znajdującego się w pliku o nazwie
+        logicExprFileName
+        
+        Plik jest mapowany do pamięci, a błąd składni zgłaszany jest wyjątkiem
+        MappedParseException.
+        '''
+        with open(logicExprFileName, 'rb') as f:
+            f.seek(0, 2)
+            if f.tell() == 0:
+                return self.parseString('')
+            data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            try:
+                return self.__parse(data)
+            finally:
+                data.close()
+
+    def __parse(self, text):
+        '''
+        parsowanie bez rekurencji, z jawnym stosem
+
+        Stos zawiera niedokończone elementy formuły:
+        * _Expression -> wyrażenie z operatorami poziomu co najmniej minLevel
+        * _Negation   -> negacja czekająca na argument
+        * _Bracket    -> nawias czekający na nawias zamykający
+        Parser na przemian czyta argument (odkładając na stos negacje i nawiasy
+        otwierające) i przekazuje gotową formułę w dół stosu, dopóki któreś
+        wyrażenie nie wczyta operatora i nie zacznie czekać na kolejny argument.
+        Pamięć rośnie liniowo z głębokością zagnieżdżenia formuły.
+        Stan parsowania jest lokalny, więc jeden parser może być współdzielony
+        (LogicExprParser.forAlphabet).
+        
+        Definicja nazwanej podformuły parsowana jest tak jak cała formuła, ale
+        po jej zakończeniu oczekiwany jest symbol `in`, a potem kolejna definicja
+        albo formuła główna.
+        '''
+        lexer = self.lexer
+        definitions = {}
+        defining, pos = self.__definition(text, 0, definitions)
+        stack = [_Expression(0)]
+        while True:
+            token = lexer.operand(text, pos)
+            if token is None:
+                self.__error(text, lexer.skip(text, pos),
+                             "Oczekiwano zmiennej, stałej, negacji albo nawiasu")
+            kind, value, start, pos = token
+            if kind == LogicExprLexer.NOT:
+                if not LogicExprLexer.VARIABLE_RE.match(value) or \
+                        lexer.operand(text, pos) is not None:
+                    stack.append(_Negation(value))
+                    continue
+                # słowo kluczowe negacji bez argumentu jest nazwą zmiennej (jak w pyparsing)
+                kind = LogicExprLexer.VARIABLE
+            if kind == LogicExprLexer.OPEN:
+                stack.append(_Bracket(value))
+                stack.append(_Expression(0))
+                continue
+            if kind == LogicExprLexer.TRUE:
+                formula = self.ffactory.createLogicTruth([value])
+            elif kind == LogicExprLexer.FALSE:
+                formula = self.ffactory.createLogicFalse([value])
+            else:
+                formula = definitions.get(value)
+                if formula is None:
+                    formula = self.ffactory.createLogicVariable([value])
+
+            # przekaż gotową formułę w dół stosu
+            while stack:
+                top = stack[-1]
+                if top.__class__ is _Negation:
+                    stack.pop()
+                    formula = self.ffactory.createNotOperation([[top.symbol, formula]])
+                    continue
+                token = lexer.operator(text, pos)
+                if top.__class__ is _Bracket:
+                    if token is None or token[0] != LogicExprLexer.CLOSE or \
+                            token[1] != top.closing:
+                        self.__error(text, lexer.skip(text, pos),
+                                     "Oczekiwano `" + top.closing + "`")
+                    stack.pop()
+                    pos = token[3]
+                    continue
+                if self.__receive(top, formula, token):
+                    pos = token[3]
+                    stack.append(_Expression(top.level + 1))
+                    break
+                stack.pop()
+                formula = top.left
+            else:
+                if defining is not None:
+                    end = lexer.symbol(text, pos, lexer.inSymbol)
+                    if end is None:
+                        self.__error(text, lexer.skip(text, pos),
+                                     "Oczekiwano `" + lexer.inSymbol + "`")
+                    definitions[defining] = formula
+                    defining, pos = self.__definition(text, end, definitions)
+                    stack = [_Expression(0)]
+                    continue
+                pos = lexer.skip(text, pos)
+                if pos < len(text):
+                    self.__error(text, pos, "Oczekiwano końca tekstu")
+                return formula
+
+    def __definition(self, text, pos, definitions):
+        '''
+        wczytaj początek definicji od pozycji pos, zwraca (nazwa, pozycja za
+        symbolem be) albo (None, pos) jeżeli od pozycji pos nie zaczyna się definicja
+        '''
+        token = self.lexer.definition(text, pos)
+        if token is None:
+            return None, pos
+        name, start, end = token
+        if name in self.reserved:
+            self.__error(text, start, "Nazwa `" + name + "` jest zarezerwowana")
+        if name in definitions:
+            self.__error(text, start, "Nazwa `" + name + "` jest już zdefiniowana")
+        return name, end
+    
+    def __receive(self, expression, formula, token):
+        '''
+        przekaż wyrażeniu expression kolejny argument formula, token to operator
+        za argumentem. Zwraca True jeżeli wyrażenie przyjęło operator i czeka na
+        następny argument, False jeżeli wyrażenie jest gotowe (expression.left)
+        '''
+        if expression.tokens is None:
+            expression.left = formula
+        else:
+            expression.tokens.extend((self.operators[expression.name], formula))
+            if token is not None and token[0] == LogicExprLexer.BINARY and \
+                    token[1] == expression.name:
+                return True
+            # koniec ciągu operatorów tego samego poziomu
+            expression.left = self.builders[expression.name]([expression.tokens])
+            expression.tokens = None
+        if token is not None and token[0] == LogicExprLexer.BINARY and \
+                self.LEVELS[token[1]] >= expression.minLevel:
+            expression.name = token[1]
+            expression.level = self.LEVELS[token[1]]
+            expression.tokens = [expression.left]
+            return True
+        return False
+
+    def __error(self, text, pos, msg):
+        if isinstance(text, basestring):
+            raise ParseException(text, pos, msg)
+        raise MappedParseException(text, pos, msg)
+
+
+class MappedParseException(ParseException):
+    '''
+    Błąd składni formuły czytanej z pliku mapowanego do pamięci
+
+    Wyjątek nie trzyma odwołania do pliku, tylko fragment linii z błędem
+    (line, co najwyżej CONTEXT znaków przed i za błędem), column to pozycja
+    błędu w tym fragmencie. Pozycja loc i numer linii lineno liczone są
+    od początku pliku.
+    '''
+
+    CONTEXT = 40
+
+    LINE_COUNT_CHUNK = 1 << 20
+
+    def __init__(self, data, loc, msg):
+        lineStart = data.rfind('\n', 0, loc) + 1
+        lineEnd = data.find('\n', loc)
+        if lineEnd < 0:
+            lineEnd = len(data)
+        start = max(lineStart, loc - self.CONTEXT)
+        line = data[start:min(lineEnd, loc + self.CONTEXT)]
+        ParseException.__init__(self, line, loc - start, msg)
+        self.loc = loc
+        self.line = line
+        self.column = self.col = loc - start + 1
+        self.lineno = self.__countLines(data, lineStart) + 1
+        self.lineColumn = loc - lineStart + 1
+        if loc >= len(data):
+            self.found = 'end of text'
+        else:
+            self.found = repr(data[loc])
+
+    def __countLines(self, data, end):
+        return sum(data[pos:min(pos + self.LINE_COUNT_CHUNK, end)].count('\n')
+                   for pos in xrange(0, end, self.LINE_COUNT_CHUNK))
+
+    def __str__(self):
+        return "%s, found %s  (at char %d), (line:%d, col:%d)" % \
+            (self.msg, self.found, self.loc, self.lineno, self.lineColumn)
+
+
+class _Expression(object):
+    '''
+    niedokończone wyrażenie na stosie parsera: lewy argument albo ciąg
+    argumentów rozdzielonych operatorem name (poziomu level)
+    '''
+
+    __slots__ = ('minLevel', 'left', 'name', 'level', 'tokens')
+
+    def __init__(self, minLevel):
+        self.minLevel = minLevel
+        self.left = None
+        self.name = None
+        self.level = None
+        self.tokens = None
+
+
+class _Negation(object):
+    __slots__ = ('symbol',)
+
+    def __init__(self, symbol):
+        self.symbol = symbol
+
+
+class _Bracket(object):
+    __slots__ = ('closing',)
+
+    def __init__(self, closing):
+        self.closing = closing
@@ -0,0 +1,115 @@
+# -*- coding: utf-8 -*-
+
+'''
+Moduł zawiera narzędzia do strumieniowego wczytywania wielu formuł
+z jednego pliku (albo ze standardowego wejścia).
+
+Plik czytany jest kawałkami (CHUNK_SIZE znaków) i dzielony na rekordy
+separatorem (domyślnie znak nowej linii). W pamięci trzymany jest tylko
+bieżący rekord, a formuły parsowane są dopiero przy pobieraniu ich ze strumienia.
+'''
+
+import logging
+
+from pyparsing import ParseException
+
+
+CHUNK_SIZE = 64 * 1024
+'''
+ilość znaków czytanych z pliku jednorazowo
+'''
+
+DEFAULT_SEPARATOR = '\n'
+
+
+def readRecords(stream, separator=DEFAULT_SEPARATOR, chunkSize=CHUNK_SIZE):
+    '''
+    generator rekordów (łańcuchów znaków) z pliku stream, rozdzielonych separatorem
+
+    Separator może być dłuższy niż jeden znak i może zostać rozcięty między
+    kawałki pliku. Puste rekordy (same białe znaki) są pomijane.
+    '''
+    if not separator:
+        raise ValueError("Separator rekordów nie może być pusty")
+    overlap = len(separator) - 1
+    pieces = []
+    tail = ''
+    while True:
+        chunk = stream.read(chunkSize)
+        if not chunk:
+            break
+        parts = (tail + chunk).split(separator)
+        if len(parts) > 1:
+            pieces.append(parts[0])
+            for record in [''.join(pieces)] + parts[1:-1]:
+                if record.strip():
+                    yield record
+            pieces = []
+        # końcówka może być początkiem separatora, zostaje do następnego kawałka
+        last = parts[-1]
+        keep = max(0, len(last) - overlap)
+        pieces.append(last[:keep])
+        tail = last[keep:]
+    record = ''.join(pieces) + tail
+    if record.strip():
+        yield record
+
+
+class FormulaRecord(object):
+    '''
+    Rekord strumienia formuł
+
+    * number  -> numer rekordu w strumieniu (od 1)
+    * text    -> tekst rekordu
+    * formula -> sparsowana formuła (formulas.Formula) albo None przy błędzie
+    * error   -> błąd składni (pyparsing.ParseException) albo None
+    '''
+
+    def __init__(self, number, text, formula=None, error=None):
+        self.number = number
+        self.text = text
+        self.formula = formula
+        self.error = error
+
+    def isValid(self):
+        return self.error is None
+
+
+class FormulaStream(object):
+    '''
+    Strumień formuł logicznych czytanych z pliku
+
+    Iteracja po strumieniu zwraca kolejne rekordy (FormulaRecord), każdy jest
+    parsowany dopiero przy pobraniu. Błąd składni jednego rekordu zapisywany
+    jest w rekordzie i nie przerywa czytania pozostałych.
+    '''
+
+    def __init__(self, parser, stream, separator=DEFAULT_SEPARATOR, chunkSize=CHUNK_SIZE):
+        '''
+        parser to parser formuł (parsers.LogicExprParser), stream to otwarty plik
+        '''
+        self.parser = parser
+        self.stream = stream
+        self.separator = separator
+        self.chunkSize = chunkSize
+
+    def __iter__(self):
+        for number, text in enumerate(readRecords(self.stream, self.separator,
+                                                  self.chunkSize), 1):
+            try:
+                yield FormulaRecord(number, text, formula=self.parser.parseString(text))
+            except ParseException as err:
+                logging.debug("Błąd składni w rekordzie %d: %s", number, err)
+                yield FormulaRecord(number, text, error=err)
+
+    def formulas(self):
+        '''
+        generator poprawnie sparsowanych formuł, rekordy z błędami składni są
+        pomijane (błąd zapisywany jest w logu)
+        '''
+        for record in self:
+            if record.isValid():
+                yield record.formula
+            else:
+                logging.error("Rekord %d ma niepoprawną składnię: %s",
+                              record.number, record.error)
@@ -12,11 +12,73 @@ Testy reprezentatywne formuł spełnialnych, NIE tautologii
 Testy reprezentatywne tautologii
 Testy dodatkowe       tautologii
 Testy reprezentatywne formuł niespełnialnych
+Testy reprezentatywne powtórzone dla silników DPLL i CDCL
+Testy reprezentatywne powtórzone dla przechodzenia drzewa w głąb
+Testy reprezentatywne powtórzone dla równoległego rozwijania drzewa
+Testy reprezentatywne powtórzone dla polityki wyboru podformuł FREQUENT
+Testy struktur wewnętrznych konwersji
+Testy strategii przechodzenia drzewa konwersji
+Testy propagacji literałów przy rozbijaniu klauzul
+Testy polityk wyboru rozwijanej podformuły
+Testy tablicy transpozycji drzewa konwersji
+Testy łącznej weryfikacji spełnialności i tautologii
+Testy równoległego rozwijania drzewa konwersji
+Testy silników SAT
+Testy koderów CNF
+Testy pamięci podręcznej wyników weryfikacji
+Testy parsera z hierarchią operatorów (także bez rekurencji dla głębokich formuł)
+Testy strumieniowego wczytywania wielu formuł
+Testy odczytu i zapisu formatu DIMACS
+Testy parserów wspólnych dla procesu
+Testy upraszczania formuł podczas parsowania
+Testy binarnego formatu formuł
+Testy definicji nazwanych podformuł
+Testy leniwego importu modułów przy uruchamianiu programu
 '''
+import cPickle
+import itertools
+import os
+import re
+import struct
+import subprocess
+import sys
+import time
+import tempfile
+from cStringIO import StringIO
 import unittest
 
+from pyparsing import ParseException, ParserElement
 
-from liprojekt.interface.interface import Interface
+
+from liprojekt.interface.interface import Interface, importObject
+from liprojekt.parsing.alphabets import SymbolicAlphabetMap, WordAlphabetMap
+from liprojekt.parsing.parsers import DefaultLogicExprParser
+from liprojekt.parsing.pratt import PrattLogicExprParser
+from liprojekt.parsing.streams import readRecords
+from liprojekt.conversion.clauses import Clause, ConjunctionClause, DisjunctionClause, ClauseState, \
+    ClauseUnresolved, ClauseHasTruth, ClauseHasOppositeLVars
+from liprojekt.conversion.literals import VariableTable, literalMask, maskLiterals
+from liprojekt.conversion.verification import FormulaVerifier, SatisfiabilityVerifier, \
+    ValidityVerifier, CombinedVerifier, ImpliedSatisfiabilityVerifier
+from liprojekt.conversion.formatting import FormulaFormatter
+from liprojekt.conversion.formulas import LogicTruth, LogicVariable, NotOperation, AndOperation, \
+    OrOperation, SimplifyingFormulaFactory
+from liprojekt.conversion.parallel import ParallelSatisfiabilityVerifier, \
+    ParallelValidityVerifier
+from liprojekt.conversion.solvers import DPLLSolver
+from liprojekt.conversion.cdcl import CDCLSolver
+from liprojekt.conversion.cnf import ClauseTreeCNFEncoder, TseitinCNFEncoder, \
+    PlaistedGreenbaumCNFEncoder
+from liprojekt.conversion.cache import ResultCache, fingerprint
+from liprojekt.conversion.persistent import PersistentStack
+from liprojekt.conversion.recording import ClauseBinTreeNode
+from liprojekt.conversion.transposition import TranspositionTable
+from liprojekt.conversion.branching import BranchingPolicy, SmallestFirstPolicy, \
+    FrequentVariableFirstPolicy
+from liprojekt.conversion.serialization import FormulaFormatError, writeFormula, \
+    readFormula, dumpFormula, loadFormula, isFormulaFile
+from liprojekt.conversion.dimacs import ClauseStore, DimacsReader, writeDimacs, \
+    formula2dimacs
 
 
 TEST_FILE_NAME = "test_output.txt"
@@ -107,6 +169,16 @@ class RepresentativeTestCase(FromInputTestCase):
     spełnialną / tautologię
     '''
     
+    ENGINE_ARGS = []
+    '''
+    dodatkowe argumenty wybierające silnik weryfikacji
+    '''
+    
+    TEXT_ARGS = ['-t']
+    '''
+    argumenty wypisywania przebiegu konwersji
+    '''
+    
     def _setArgs(self, formula, name):
         '''
         ustaw parametry wykonania na 
@@ -114,7 +186,7 @@ class RepresentativeTestCase(FromInputTestCase):
         -O -> dopisanie wyników do pliku
         '''
         self.formulaString = formula
-        self.args = ['-f', formula, '-O', TEST_FILE_NAME, '-t']
+        self.args = ['-f', formula, '-O', TEST_FILE_NAME] + self.TEXT_ARGS + self.ENGINE_ARGS
     
     def _testForTautology(self, tautology, name):
         '''
@@ -383,6 +455,1522 @@ class RepresentativeNotSatisfiableTestCase(RepresentativeTestCase):
                                     '( p | ~q | ~r) &'+
                                     '(~p | ~q | ~r)', 'NS3')
     
+class DPLLTautologyTestCase(RepresentativeTautologyTestCase):
+    '''
+    Testy dla formuł będących tautologiami, silnik DPLL
+    '''
+    ENGINE_ARGS = ['-e', 'DPLL']
+
+class DPLLAdditionalTautologyTestCase(RepresentativeAdditionalTautologyTestCase):
+    '''
+    Dodatkowe testy dla formuł będących tautologiami, silnik DPLL
+    '''
+    ENGINE_ARGS = ['-e', 'DPLL']
+
+class DPLLSatisfiableNotTautologyTestCase(RepresentativeSatisfiableNotTautologyTestCase):
+    '''
+    Testy dla formuł spełnialnych NIE będących tautologiami, silnik DPLL
+    '''
+    ENGINE_ARGS = ['-e', 'DPLL']
+
+class DPLLNotSatisfiableTestCase(RepresentativeNotSatisfiableTestCase):
+    '''
+    Testy dla formuł NIEspełnialnych, silnik DPLL
+    '''
+    ENGINE_ARGS = ['-e', 'DPLL']
+
+class CDCLTautologyTestCase(RepresentativeTautologyTestCase):
+    '''
+    Testy dla formuł będących tautologiami, silnik CDCL
+    '''
+    ENGINE_ARGS = ['-e', 'CDCL']
+
+class CDCLAdditionalTautologyTestCase(RepresentativeAdditionalTautologyTestCase):
+    '''
+    Dodatkowe testy dla formuł będących tautologiami, silnik CDCL
+    '''
+    ENGINE_ARGS = ['-e', 'CDCL']
+
+class CDCLSatisfiableNotTautologyTestCase(RepresentativeSatisfiableNotTautologyTestCase):
+    '''
+    Testy dla formuł spełnialnych NIE będących tautologiami, silnik CDCL
+    '''
+    ENGINE_ARGS = ['-e', 'CDCL']
+
+class CDCLNotSatisfiableTestCase(RepresentativeNotSatisfiableTestCase):
+    '''
+    Testy dla formuł NIEspełnialnych, silnik CDCL
+    '''
+    ENGINE_ARGS = ['-e', 'CDCL']
+
+class DFSTautologyTestCase(RepresentativeTautologyTestCase):
+    '''
+    Testy dla formuł będących tautologiami, drzewo przechodzone w głąb
+    '''
+    ENGINE_ARGS = ['--strategy', 'DFS']
+
+class DFSAdditionalTautologyTestCase(RepresentativeAdditionalTautologyTestCase):
+    '''
+    Dodatkowe testy dla formuł będących tautologiami, drzewo przechodzone w głąb
+    '''
+    ENGINE_ARGS = ['--strategy', 'DFS']
+
+class DFSSatisfiableNotTautologyTestCase(RepresentativeSatisfiableNotTautologyTestCase):
+    '''
+    Testy dla formuł spełnialnych NIE będących tautologiami, drzewo przechodzone w głąb
+    '''
+    ENGINE_ARGS = ['--strategy', 'DFS']
+
+class DFSNotSatisfiableTestCase(RepresentativeNotSatisfiableTestCase):
+    '''
+    Testy dla formuł NIEspełnialnych, drzewo przechodzone w głąb
+    '''
+    ENGINE_ARGS = ['--strategy', 'DFS']
+
+class ParallelTautologyTestCase(RepresentativeTautologyTestCase):
+    '''
+    Testy dla formuł będących tautologiami, drzewo rozwijane równolegle
+    '''
+    ENGINE_ARGS = ['-w', '2']
+    TEXT_ARGS = []
+
+class ParallelAdditionalTautologyTestCase(RepresentativeAdditionalTautologyTestCase):
+    '''
+    Dodatkowe testy dla formuł będących tautologiami, drzewo rozwijane równolegle
+    '''
+    ENGINE_ARGS = ['-w', '2']
+    TEXT_ARGS = []
+
+class ParallelSatisfiableNotTautologyTestCase(RepresentativeSatisfiableNotTautologyTestCase):
+    '''
+    Testy dla formuł spełnialnych NIE będących tautologiami, drzewo rozwijane równolegle
+    '''
+    ENGINE_ARGS = ['-w', '2']
+    TEXT_ARGS = []
+
+class ParallelNotSatisfiableTestCase(RepresentativeNotSatisfiableTestCase):
+    '''
+    Testy dla formuł NIEspełnialnych, drzewo rozwijane równolegle
+    '''
+    ENGINE_ARGS = ['-w', '2']
+    TEXT_ARGS = []
+
+class BranchingTautologyTestCase(RepresentativeTautologyTestCase):
+    '''
+    Testy dla formuł będących tautologiami, polityka wyboru podformuł FREQUENT
+    '''
+    ENGINE_ARGS = ['--branching', 'FREQUENT']
+
+class BranchingAdditionalTautologyTestCase(RepresentativeAdditionalTautologyTestCase):
+    '''
+    Dodatkowe testy dla formuł będących tautologiami, polityka wyboru podformuł FREQUENT
+    '''
+    ENGINE_ARGS = ['--branching', 'FREQUENT']
+
+class BranchingSatisfiableNotTautologyTestCase(RepresentativeSatisfiableNotTautologyTestCase):
+    '''
+    Testy dla formuł spełnialnych NIE będących tautologiami, polityka wyboru podformuł FREQUENT
+    '''
+    ENGINE_ARGS = ['--branching', 'FREQUENT']
+
+class BranchingNotSatisfiableTestCase(RepresentativeNotSatisfiableTestCase):
+    '''
+    Testy dla formuł NIEspełnialnych, polityka wyboru podformuł FREQUENT
+    '''
+    ENGINE_ARGS = ['--branching', 'FREQUENT']
+
+
+class ClauseSharingTestCase(unittest.TestCase):
+    '''
+    Testy współdzielenia struktur przez półprodukty clauses.Clause
+    
+    Kroki konwersji nie mogą zmieniać Clause, z której powstały nowe Clause
+    '''
+    
+    def setUp(self):
+        self.parser = DefaultLogicExprParser(SymbolicAlphabetMap())
+    
+    def test_branchesDoNotChangeParent(self):
+        '''
+        (p | q) & r -> rozbicie na dwie klauzule, ojciec pozostaje bez zmian
+        '''
+        parent = ConjunctionClause(self.parser.parseString('(p | q) & r'))
+        clause, = parent.convertStep()
+        left, right = clause.convertStep()
+        self.assertEqual(len(parent.uncFormulas), 1)
+        self.assertEqual(len(parent.cFormulas), 0)
+        self.assertEqual(len(clause.uncFormulas), 1)
+        self.assertEqual(len(clause.cFormulas), 1)
+        self.assertEqual(len(left.lvars), 2)
+        self.assertEqual(len(right.lvars), 2)
+        self.assertTrue(left.isSuccess() and right.isSuccess())
+        self.assertTrue(left.cFormulas.pop()[1] is right.cFormulas.pop()[1])
+    
+    def test_resolvedStatus(self):
+        '''
+        p & ~p -> klauzula niespełnialna, ojciec nierozstrzygnięty
+        '''
+        parent = ConjunctionClause(self.parser.parseString('p & ~p'))
+        clause, = parent.convertStep()
+        self.assertFalse(clause.isResolved())
+        clause, = clause.convertStep()
+        self.assertFalse(parent.isResolved())
+        self.assertTrue(clause.isResolved())
+        self.assertTrue(clause.isFailure())
+    
+    def test_compactClause(self):
+        '''
+        Clause nie ma słownika atrybutów, status tworzony jest przy odczycie,
+        klauzula po zapiklowaniu ma ten sam stan
+        '''
+        vtable = VariableTable()
+        clause = ConjunctionClause(self.parser.parseString('p & ~p'), vtable=vtable)
+        self.assertFalse(hasattr(clause, '__dict__'))
+        self.assertEqual(str(clause.status), str(ClauseUnresolved()))
+        clause, = clause.convertStep()
+        clause, = clause.convertStep()
+        self.assertTrue(isinstance(clause.status, ClauseHasOppositeLVars))
+        self.assertEqual(clause.status.state, ClauseState.FAILURE)
+        self.assertTrue(clause.status.lit in (vtable.variableId('p'), -vtable.variableId('p')))
+        copy = cPickle.loads(cPickle.dumps(clause, cPickle.HIGHEST_PROTOCOL))
+        self.assertTrue(copy.isFailure())
+        self.assertEqual(copy.lvars, clause.lvars)
+        self.assertEqual(str(copy.status), str(clause.status))
+        clause = DisjunctionClause(self.parser.parseString('p | T'))
+        clause, = clause.convertStep()
+        clause, = clause.convertStep()
+        self.assertTrue(clause.isSuccess())
+        self.assertTrue(isinstance(clause.status, ClauseHasTruth))
+
+class PropagationTestCase(unittest.TestCase):
+    '''
+    Testy propagacji literałów przy rozbijaniu półproduktów clauses.Clause
+    '''
+    
+    FORMULAS = [
+        'p & (~p | q)', 'p & (~p | ~p)', '(p | q) & ~p & ~q', 'p & (p | q & r) & ~r',
+        '~p | (p & q)', 'p => (q => p)', '(p & q) | (~p & q) | ~q', '~~(p <=> q) & (p | ~q)',
+        '(p <=> q) & (q <=> r) & (p | ~r)', 'p & (~p | F) | q & (~q | T)'
+    ]
+    
+    def setUp(self):
+        self.parser = PrattLogicExprParser(SymbolicAlphabetMap())
+    
+    def _pigeonhole(self, holes):
+        pigeons = range(holes + 1)
+        text = " & ".join("(" + " | ".join("x%d_%d" % (p, h) for h in range(holes)) + ")"
+                          for p in pigeons)
+        return text + " & " + " & ".join("(~x%d_%d | ~x%d_%d)" % (p, h, q, h)
+                                         for h in range(holes)
+                                         for p in pigeons for q in pigeons if p < q)
+    
+    def _treeSize(self, verifierClass, text, limit):
+        # bez tablicy transpozycji, żeby mierzyć tylko propagację
+        saved = Clause.PROPAGATION_LIMIT
+        Clause.PROPAGATION_LIMIT = limit
+        try:
+            verifier = verifierClass(self.parser.parseString(text), transpositionSize=0)
+            return verifier.verifyFormula(), len(verifier.tree)
+        finally:
+            Clause.PROPAGATION_LIMIT = saved
+    
+    def test_sameResult(self):
+        '''
+        propagacja nie zmienia wyniku weryfikacji ani poprawności wartościowania
+        '''
+        for text in self.FORMULAS:
+            formula = self.parser.parseString(text)
+            valuations = [dict(zip('pqr', values))
+                          for values in itertools.product((False, True), repeat=3)]
+            satisfiable = any(formula.evaluate(v) for v in valuations)
+            valid = all(formula.evaluate(v) for v in valuations)
+            verifier = SatisfiabilityVerifier(formula)
+            self.assertEqual(verifier.verifyFormula(), satisfiable, text)
+            if satisfiable:
+                valuation = verifier.valuation()
+                self.assertTrue(all(formula.evaluate(dict(v, **valuation)) for v in valuations),
+                                text)
+            verifier = ValidityVerifier(formula)
+            self.assertEqual(verifier.verifyFormula(), valid, text)
+            for limit in (0, Clause.PROPAGATION_LIMIT):
+                self.assertEqual(self._treeSize(SatisfiabilityVerifier, text, limit)[0],
+                                 satisfiable, text)
+    
+    def test_smallerTree(self):
+        '''
+        zasada szufladkowa: gałęzie sprzeczne z literałami klauzuli nie są tworzone
+        '''
+        text = self._pigeonhole(2)
+        pruned = self._treeSize(SatisfiabilityVerifier, text, Clause.PROPAGATION_LIMIT)
+        full = self._treeSize(SatisfiabilityVerifier, text, 0)
+        self.assertEqual(pruned[0], False)
+        self.assertEqual(full[0], False)
+        self.assertTrue(pruned[1] * 3 < full[1])
+        pruned = self._treeSize(ValidityVerifier, '~(' + text + ')', Clause.PROPAGATION_LIMIT)
+        full = self._treeSize(ValidityVerifier, '~(' + text + ')', 0)
+        self.assertEqual(pruned[0], True)
+        self.assertTrue(pruned[1] * 3 < full[1])
+    
+    def test_pendingConflict(self):
+        '''
+        p & (q | r) & (s | t) & (u | v) & ~p -> podformuła nieprzerobiona sprzeczna
+        z literałami obsługiwana jest przed rozbiciem, rozbić nie ma wcale
+        '''
+        text = 'p & (q | r) & (s | t) & (u | v) & ~p'
+        for verifierClass, text, result in ((SatisfiabilityVerifier, text, False),
+                                            (ValidityVerifier, '~(' + text + ')', True)):
+            verifier = verifierClass(self.parser.parseString(text), transpositionSize=0)
+            self.assertEqual(verifier.verifyFormula(), result)
+            self.assertEqual(verifier.splits, 0)
+    
+    def test_cnfEquivalent(self):
+        '''
+        CNF z drzewa konwersji z propagacją jest równoważna formule
+        '''
+        for text in self.FORMULAS:
+            formula = self.parser.parseString(text)
+            encoder = ClauseTreeCNFEncoder(formula)
+            clauses = encoder.encode()
+            for values in itertools.product((False, True), repeat=3):
+                valuation = dict(zip('pqr', values))
+                value = all(any((lit > 0) == valuation[encoder.vtable.name(lit)]
+                                for lit in clause) for clause in clauses)
+                self.assertEqual(value, formula.evaluate(valuation), text)
+
+class BranchingPolicyTestCase(unittest.TestCase):
+    '''
+    Testy polityk wyboru rozwijanej podformuły (branching)
+    '''
+    
+    POLICIES = [None, BranchingPolicy, SmallestFirstPolicy, FrequentVariableFirstPolicy]
+    
+    FORMULAS = [
+        '(p | q) & (q | r) & ~q & (p | r | s)', '((p & q) | r) & (~r | ~p) & (q => r)',
+        '~a & ~c & ~e & (a | b) & (c | d) & (e | f)', 'p <=> (q <=> (p <=> q))',
+        '((p | q) & (~p | q)) & ((p | ~q) & (~p | ~q))'
+    ]
+    
+    def setUp(self):
+        self.parser = PrattLogicExprParser(SymbolicAlphabetMap())
+    
+    def _verify(self, verifierClass, text, policy):
+        verifier = verifierClass(self.parser.parseString(text), branchingClass=policy)
+        return verifier.verifyFormula(), verifier
+    
+    def test_take(self):
+        '''
+        wyjęcie elementu ze środka trwałego stosu nie zmienia oryginału
+        '''
+        stack = PersistentStack.fromIterable([1, 2, 3, 4])
+        item, rest = stack.take(2)
+        self.assertEqual(item, 3)
+        self.assertEqual(list(rest), [1, 2, 4])
+        self.assertEqual(list(stack), [1, 2, 3, 4])
+        self.assertEqual(stack.take(0)[0], 1)
+        self.assertRaises(IndexError, stack.take, 4)
+        self.assertRaises(IndexError, PersistentStack.EMPTY.take, 0)
+    
+    def test_sameResult(self):
+        '''
+        każda polityka daje ten sam wynik weryfikacji
+        '''
+        for text in self.FORMULAS:
+            for verifierClass in (SatisfiabilityVerifier, ValidityVerifier):
+                results = set(self._verify(verifierClass, text, policy)[0]
+                              for policy in self.POLICIES)
+                self.assertEqual(len(results), 1, text)
+    
+    def test_fewerSplits(self):
+        '''
+        ~a & ~c & ~e & (a | b) & (c | d) & (e | f) -> literały przed rozbiciami, dzięki
+        propagacji rozbić nie ma wcale
+        '''
+        text = self.FORMULAS[2]
+        ordered = self._verify(SatisfiabilityVerifier, text, None)[1]
+        simple = self._verify(SatisfiabilityVerifier, text, BranchingPolicy)[1]
+        self.assertEqual(simple.splits, 0)
+        self.assertTrue(ordered.splits > 0)
+        self.assertTrue(simple.nodes < ordered.nodes)
+        self.assertEqual(simple.nodes, len(simple.tree))
+        self.assertEqual(simple.steps + 1, simple.nodes)
+        self.assertEqual(simple.branchingName(), 'SIMPLE')
+        self.assertEqual(ordered.branchingName(), 'ORDER')
+    
+    def test_policyOrder(self):
+        '''
+        SMALLEST wybiera najmniejszą podformułę rozbijającą, FREQUENT tę z najczęstszą zmienną
+        '''
+        formula = self.parser.parseString('((p & q) | (r & s)) & (t | u) & (q | t) & (q | r)')
+        policy = BranchingPolicy(formula)
+        clause = ConjunctionClause(formula)
+        while any(f.makeSimple().__class__ is AndOperation for f in clause.uncFormulas):
+            clause, = clause.convertStep(policy)
+        self.assertEqual(len(clause.uncFormulas), 4)
+        chosen = SmallestFirstPolicy(formula).select(clause)[0]
+        self.assertTrue(chosen is self.parser.parseString('t | u'))
+        chosen = FrequentVariableFirstPolicy(formula).select(clause)[0]
+        self.assertTrue(chosen is self.parser.parseString('q | t'))
+    
+    def test_interface(self):
+        '''
+        opcja --branching
+        '''
+        for name in Interface.BRANCHING:
+            interface = Interface()
+            interface.testRun(['--branching', name, '-f', self.FORMULAS[1],
+                               '-O', TEST_FILE_NAME])
+            self.assertTrue(interface.satisfiable)
+            self.assertEqual(interface.satisVerif.branchingName(), name)
+
+class TranspositionTestCase(unittest.TestCase):
+    '''
+    Testy tablicy transpozycji stanów Clause
+    '''
+    
+    def setUp(self):
+        self.parser = PrattLogicExprParser(SymbolicAlphabetMap())
+        self.vtable = VariableTable()
+    
+    def _clause(self, text, positive=0, negative=0):
+        clause = ConjunctionClause(self.parser.parseString(text), self.vtable)
+        clause.positive, clause.negative = positive, negative
+        return clause
+    
+    def test_subsumed(self):
+        '''
+        ten sam stan i stan z dodatkowymi literałami są pochłaniane
+        '''
+        table = TranspositionTable()
+        self.assertTrue(table.add(self._clause('p | q', 0b10, 0b100)))
+        self.assertFalse(table.add(self._clause('p | q', 0b10, 0b100)))
+        self.assertFalse(table.add(self._clause('p | q', 0b1010, 0b100)))
+        self.assertTrue(table.add(self._clause('p | q', 0b1000, 0b100)))
+        self.assertTrue(table.add(self._clause('q | p', 0b10, 0b100)))
+        self.assertEqual(table.hits, 2)
+        self.assertEqual(len(table), 3)
+        # stan pochłaniający zastępuje pochłonięte
+        self.assertTrue(table.add(self._clause('p | q', 0, 0b100)))
+        self.assertEqual(len(table), 2)
+    
+    def test_lru(self):
+        '''
+        przy przepełnieniu usuwane są najdawniej używane stany
+        '''
+        table = TranspositionTable(2)
+        for text in ('p | q', 'q | r', 'p | q', 'r | s'):
+            table.add(self._clause(text))
+        self.assertEqual(len(table), 2)
+        self.assertFalse(table.add(self._clause('p | q')))
+        self.assertTrue(table.add(self._clause('q | r')))
+    
+    def test_smallerTree(self):
+        '''
+        zasada szufladkowa: scalone stany nie są rozwijane, wynik się nie zmienia
+        '''
+        text = PropagationTestCase('test_smallerTree')._pigeonhole(2)
+        for verifierClass, text in ((SatisfiabilityVerifier, text),
+                                    (ValidityVerifier, '~(' + text + ')')):
+            for strategy in (FormulaVerifier.BREADTH_FIRST, FormulaVerifier.DEPTH_FIRST):
+                full = verifierClass(self.parser.parseString(text), strategy=strategy,
+                                     transpositionSize=0)
+                merged = verifierClass(self.parser.parseString(text), strategy=strategy)
+                self.assertEqual(full.verifyFormula(), merged.verifyFormula())
+                self.assertEqual(full.merged, 0)
+                self.assertTrue(merged.merged > 0)
+                self.assertTrue(merged.steps < full.steps)
+                self.assertEqual(merged.nodes, len(merged.tree))
+    
+    def test_parallel(self):
+        '''
+        scalanie stanów w procesach roboczych
+        
+        Podział drzewa między procesy zależy od ich tempa, dla 3 szufladek każdy
+        proces rozwija poddrzewo z powtarzającymi się stanami.
+        '''
+        text = '~(' + PropagationTestCase('test_smallerTree')._pigeonhole(3) + ')'
+        verifier = ParallelValidityVerifier(self.parser.parseString(text), jobs=2)
+        self.assertTrue(verifier.verifyFormula())
+        self.assertTrue(verifier.merged > 0)
+
+class FormulaSharingTestCase(unittest.TestCase):
+    '''
+    Testy współdzielenia formuł (hash-consing)
+    
+    Formuły identyczne strukturalnie muszą być tym samym obiektem
+    '''
+    
+    def setUp(self):
+        self.parser = DefaultLogicExprParser(SymbolicAlphabetMap())
+    
+    def test_identicalSubformulas(self):
+        '''
+        (p & q) | (p & q) -> obie strony OR to ten sam obiekt
+        '''
+        formula = self.parser.parseString('(p & q) | (p & q)')
+        self.assertTrue(formula.getLeftSubformula() is formula.getRightSubformula())
+        self.assertTrue(formula is self.parser.parseString('(p & q) | (p & q)'))
+    
+    def test_negationMemoized(self):
+        '''
+        ~(p & q) liczona raz, ~~p to p
+        '''
+        formula = self.parser.parseString('p & q')
+        self.assertTrue(formula.negate() is formula.negate())
+        lvar = formula.getLeftSubformula()
+        self.assertTrue(lvar.negate().negate() is lvar)
+    
+    def test_doubleNegationSimple(self):
+        '''
+        ~~(p <=> q), ~~(p => q) -> uproszczona formuła nie ma równoważności ani implikacji
+        '''
+        for text in ('~~(p <=> q)', '~~(p => q)', '~~~~(p <=> q)'):
+            formula = self.parser.parseString(text)
+            self.assertTrue(formula.makeSimple().__class__ in (AndOperation, OrOperation), text)
+            self.assertTrue(formula.makeSimple() is formula.subformula.subformula.makeSimple())
+        formula = self.parser.parseString('~~(p <=> q) | ~(p <=> q)')
+        self.assertTrue(ValidityVerifier(formula).verifyFormula())
+    
+    def test_deepSimple(self):
+        '''
+        uproszczenie i zaprzeczenie formuły głębszej niż limit rekurencji, także tekst
+        formuły (str)
+        '''
+        depth = 5 * sys.getrecursionlimit()
+        parser = PrattLogicExprParser(SymbolicAlphabetMap())
+        valuation = dict(('x%d' % i, i % 3 == 0) for i in range(depth))
+        for text in (' => '.join('x%d' % i for i in range(depth)) + ' => y',
+                     ' <=> '.join('x%d' % i for i in range(depth))):
+            formula = parser.parseString(text)
+            simple = formula.makeSimple()
+            self.assertTrue(simple.__class__ is OrOperation)
+            self.assertEqual(simple.evaluate(valuation), formula.evaluate(valuation))
+            self.assertEqual(formula.negate().evaluate(valuation), not formula.evaluate(valuation))
+            self.assertTrue(NotOperation(formula).makeSimple() is formula.negate())
+        self.assertEqual(str(formula).count(' EQL '), depth - 1)
+
+class SearchStrategyTestCase(unittest.TestCase):
+    '''
+    Testy strategii przechodzenia drzewa konwersji
+    '''
+    
+    def setUp(self):
+        self.parser = DefaultLogicExprParser(SymbolicAlphabetMap())
+    
+    def test_depthFirstFindsLeftmost(self):
+        '''
+        (p & q) | ((r | s) & t) -> w głąb pierwsza znaleziona klauzula pochodzi
+        z lewej gałęzi C0 (p & q)
+        '''
+        formula = self.parser.parseString('(p & q) | ((r | s) & t)')
+        verifier = SatisfiabilityVerifier(formula, strategy=FormulaVerifier.DEPTH_FIRST)
+        self.assertTrue(verifier.verifyFormula())
+        self.assertTrue(str(verifier.succClauseNodes[0].ID).startswith('C0'))
+        vtable = verifier.vtable
+        self.assertEqual(verifier.succClauseNodes[0].clause.lvars,
+                         frozenset([vtable.variableId('p'), vtable.variableId('q')]))
+    
+    def test_withoutTree(self):
+        '''
+        bez zapamiętywania drzewa wynik i ID węzłów są takie same, drzewo ma tylko korzeń
+        '''
+        formula = self.parser.parseString('((p | q) & (~p | q)) & ((p | ~q) & (~p | ~q))')
+        for strategy in (FormulaVerifier.BREADTH_FIRST, FormulaVerifier.DEPTH_FIRST):
+            recorded = ValidityVerifier(formula, strategy=strategy)
+            bounded = ValidityVerifier(formula, strategy=strategy, recordTree=False)
+            self.assertEqual(recorded.verifyFormula(), bounded.verifyFormula())
+            self.assertEqual(len(bounded.tree), 1)
+            self.assertEqual(str(recorded.failClauseNodes[0].ID),
+                             str(bounded.failClauseNodes[0].ID))
+        verifier = SatisfiabilityVerifier(formula, strategy=FormulaVerifier.DEPTH_FIRST,
+                                          recordTree=False)
+        self.assertFalse(verifier.verifyFormula())
+        self.assertEqual(len(verifier.failClauseNodes), 1)
+
+class SlowSatisfiabilityVerifier(SatisfiabilityVerifier):
+    '''
+    weryfikator spełnialności kończący się po weryfikatorze tautologii
+    (klasa modułu, żeby dało się ją zapiklować)
+    '''
+    
+    def verifyFormula(self):
+        time.sleep(30)
+        return super(SlowSatisfiabilityVerifier, self).verifyFormula()
+
+class CombinedVerifierTestCase(unittest.TestCase):
+    '''
+    Testy łącznej weryfikacji spełnialności i tautologii (verification.CombinedVerifier)
+    '''
+    
+    FORMULAS = [('(p => q) <=> (~q => ~p)', True, True),
+                ('((p | q) & (~p | q)) | (r & ~r)', True, False),
+                ('(p & ~p) | (q & ~q)', False, False)]
+    
+    def setUp(self):
+        self.parser = DefaultLogicExprParser(SymbolicAlphabetMap())
+        self.formatter = FormulaFormatter(SymbolicAlphabetMap())
+    
+    def _combined(self, formula, jobs):
+        vtable = VariableTable()
+        return CombinedVerifier(SatisfiabilityVerifier(formula, vtable),
+                                ValidityVerifier(formula, vtable), jobs)
+    
+    def test_results(self):
+        '''
+        wyniki sekwencyjne i równoległe są takie same jak oczekiwane
+        '''
+        for text, satisfiable, valid in self.FORMULAS:
+            formula = self.parser.parseString(text)
+            for jobs in (1, 2):
+                combined = self._combined(formula, jobs)
+                self.assertEqual(combined.verifyFormula(), (satisfiable, valid), text)
+                self.assertEqual(combined.validVerifier is None, not satisfiable)
+    
+    def test_parallelTree(self):
+        '''
+        drzewa konwersji odesłane z procesów roboczych są takie same jak sekwencyjne
+        '''
+        fmt = "{nodeId}: {clauseVars} {clauseStatus}"
+        formula = self.parser.parseString(self.FORMULAS[1][0])
+        sequential, parallel = self._combined(formula, 1), self._combined(formula, 2)
+        sequential.verifyFormula()
+        parallel.verifyFormula()
+        for verifiers in ((sequential.satisVerifier, parallel.satisVerifier),
+                          (sequential.validVerifier, parallel.validVerifier)):
+            first, second = [v.generateRaport(self.formatter, "{proof}\n{tree}", fmt)
+                             for v in verifiers]
+            self.assertEqual(first, second)
+    
+    def test_sequentialDefault(self):
+        '''
+        domyślnie, i dla małych formuł przy jobs=None, weryfikacja jest sekwencyjna
+        (weryfikatory nie są zastępowane kopiami z procesów roboczych)
+        '''
+        formula = self.parser.parseString(self.FORMULAS[0][0])
+        vtable = VariableTable()
+        satisVerifier = SatisfiabilityVerifier(formula, vtable)
+        combined = CombinedVerifier(satisVerifier, ValidityVerifier(formula, vtable))
+        self.assertEqual(combined.jobs, 1)
+        self.assertEqual(combined.verifyFormula(), (True, True))
+        self.assertTrue(combined.satisVerifier is satisVerifier)
+        combined = self._combined(formula, None)
+        satisVerifier = combined.satisVerifier
+        combined.verifyFormula()
+        self.assertTrue(combined.satisVerifier is satisVerifier)
+    
+    def test_tautologyFirst(self):
+        '''
+        tautologia rozstrzyga spełnialność bez czekania na weryfikator spełnialności
+        '''
+        formula = self.parser.parseString(self.FORMULAS[0][0])
+        vtable = VariableTable()
+        combined = CombinedVerifier(SlowSatisfiabilityVerifier(formula, vtable),
+                                    ValidityVerifier(formula, vtable), 2)
+        start = time.time()
+        self.assertEqual(combined.verifyFormula(), (True, True))
+        self.assertTrue(time.time() - start < 30)
+        self.assertTrue(isinstance(combined.satisVerifier, ImpliedSatisfiabilityVerifier))
+        self.assertEqual(combined.satisVerifier.valuation(), {})
+        raport = combined.satisVerifier.generateRaport(self.formatter, "{result}\n{proof}")
+        self.assertTrue(raport.startswith("Udowodniono spełnialność"))
+
+class ParallelVerifierTestCase(unittest.TestCase):
+    '''
+    Testy równoległego rozwijania drzewa konwersji (parallel.ParallelFormulaVerifier)
+    '''
+    
+    def setUp(self):
+        self.parser = DefaultLogicExprParser(SymbolicAlphabetMap())
+    
+    def _chain(self, n):
+        '''
+        (a0 <=> b0) & (a1 <=> b1) & ... -> drzewo konwersji ma 2^n gałęzi
+        '''
+        formula = '(a0 <=> b0)'
+        for i in range(1, n):
+            formula = '(' + formula + ' & (a%d <=> b%d))' % (i, i)
+        return formula
+    
+    def test_sharedWork(self):
+        '''
+        przy małym progu gałęzie oddawane są innym procesom, wynik jest taki sam
+        jak sekwencyjny (tautologia wymaga rozwinięcia całego drzewa)
+        '''
+        chain = self._chain(5)
+        for text in ['(' + chain + ') | ~(' + chain + ')',
+                     '~((' + chain + ') | ~(' + chain + '))']:
+            formula = self.parser.parseString(text)
+            for parallelClass, sequentialClass in (
+                    (ParallelSatisfiabilityVerifier, SatisfiabilityVerifier),
+                    (ParallelValidityVerifier, ValidityVerifier)):
+                verifier = parallelClass(formula, jobs=3, splitThreshold=2)
+                self.assertEqual(verifier.verifyFormula(),
+                                 sequentialClass(formula).verifyFormula(), text)
+                self.assertEqual(len(verifier.tree), 1)
+    
+    def test_earlyTermination(self):
+        '''
+        klauzula rozstrzygająca kończy weryfikację, jej ID wskazuje węzeł drzewa
+        '''
+        formula = self.parser.parseString(self._chain(8))
+        verifier = ParallelSatisfiabilityVerifier(formula, jobs=2)
+        self.assertTrue(verifier.verifyFormula())
+        node = verifier.succClauseNodes[-1]
+        self.assertTrue(node.clause.isSuccess())
+        self.assertTrue(str(node.ID).startswith('C'))
+        self.assertEqual(len(node.clause.lvars), 16)
+
+class LiteralEncodingTestCase(unittest.TestCase):
+    '''
+    Testy kodowania literałów jako liczb (literals.VariableTable)
+    '''
+    
+    def setUp(self):
+        self.parser = DefaultLogicExprParser(SymbolicAlphabetMap())
+    
+    def test_literals(self):
+        '''
+        p, q, ~p -> 1, 2, -1
+        '''
+        vtable = VariableTable()
+        formula = self.parser.parseString('p & q')
+        p, q = formula.subformulas
+        self.assertEqual(vtable.literal(p), 1)
+        self.assertEqual(vtable.literal(q), 2)
+        self.assertEqual(vtable.literal(p.negate()), -1)
+        self.assertTrue(vtable.variable(-1) is p.negate())
+        self.assertEqual(len(vtable), 2)
+    
+    def test_clauseLiterals(self):
+        '''
+        ConjunctionClause(p & ~q) przechowuje literały id(p) i -id(q)
+        '''
+        vtable = VariableTable()
+        clause = ConjunctionClause(self.parser.parseString('p & ~q'), vtable=vtable)
+        while not clause.isResolved():
+            clause, = clause.convertStep()
+        self.assertEqual(clause.lvars, frozenset([vtable.variableId('p'),
+                                                  -vtable.variableId('q')]))
+    
+    def test_literalMasks(self):
+        '''
+        literały klauzuli zapisane są w parze masek bitowych, sprzeczność wykrywana
+        jest koniunkcją masek
+        '''
+        self.assertEqual(maskLiterals(literalMask(3) | literalMask(70), literalMask(-2)),
+                         [-2, 3, 70])
+        self.assertEqual(maskLiterals(0, 0), [])
+        vtable = VariableTable()
+        clause = ConjunctionClause(self.parser.parseString('p & ~q & r'), vtable=vtable)
+        while not clause.isResolved():
+            clause, = clause.convertStep()
+        p, q, r = [vtable.variableId(name) for name in 'pqr']
+        self.assertEqual(clause.positive, literalMask(p) | literalMask(r))
+        self.assertEqual(clause.negative, literalMask(q))
+        self.assertEqual(clause.literals(), sorted([p, -q, r], key=abs))
+        self.assertTrue(clause.isSuccess())
+        clause = ConjunctionClause(self.parser.parseString('p & ~q & r & q'), vtable=vtable)
+        while not clause.isResolved():
+            clause, = clause.convertStep()
+        self.assertTrue(clause.isFailure())
+        self.assertEqual(abs(clause.status.lit), q)
+
+def _pigeonholeCNF(holes):
+    '''
+    CNF zasady szufladkowej: holes+1 gołębi w holes dziurach (niespełnialna)
+    '''
+    var = lambda pigeon, hole: pigeon * holes + hole + 1
+    clauses = [[var(p, h) for h in range(holes)] for p in range(holes + 1)]
+    for h in range(holes):
+        for p in range(holes + 1):
+            for q in range(p + 1, holes + 1):
+                clauses.append([-var(p, h), -var(q, h)])
+    return clauses, (holes + 1) * holes
+
+class SatSolverTestCase(unittest.TestCase):
+    '''
+    Testy silników SAT działających na CNF
+    '''
+    SOLVER = DPLLSolver
+    
+    def _assertModel(self, clauses, model):
+        '''
+        asercja 'wartościowanie spełnia wszystkie klauzule'
+        '''
+        model = set(model)
+        for clause in clauses:
+            self.assertTrue(any(lit in model for lit in clause), 
+                            'Klauzula '+str(clause)+' jest fałszywa')
+    
+    def test_satisfiable(self):
+        '''
+        (1 | 2) & (~1 | 3) & (~3 | ~2) & (2 | 3)
+        '''
+        clauses = [[1, 2], [-1, 3], [-3, -2], [2, 3]]
+        solver = self.SOLVER(clauses, 3)
+        self.assertTrue(solver.solve())
+        self._assertModel(clauses, solver.model)
+    
+    def test_pigeonhole(self):
+        '''
+        zasada szufladkowa dla 4 dziur jest niespełnialna
+        '''
+        clauses, numVars = _pigeonholeCNF(4)
+        self.assertFalse(self.SOLVER(clauses, numVars).solve())
+    
+    def test_emptyClause(self):
+        '''
+        CNF z klauzulą pustą jest niespełnialna, pusta CNF jest spełnialna
+        '''
+        self.assertFalse(self.SOLVER([[1], []], 1).solve())
+        self.assertTrue(self.SOLVER([], 0).solve())
+
+class CDCLSolverTestCase(SatSolverTestCase):
+    '''
+    Testy silnika CDCL
+    '''
+    SOLVER = CDCLSolver
+    
+    def test_pigeonholeLearning(self):
+        '''
+        zasada szufladkowa dla 5 dziur, silnik uczy się klauzul
+        '''
+        clauses, numVars = _pigeonholeCNF(5)
+        solver = self.SOLVER(clauses, numVars)
+        self.assertFalse(solver.solve())
+        self.assertTrue(solver.stats['learnedClauses'] > 0)
+
+class CNFEncoderTestCase(unittest.TestCase):
+    '''
+    Testy koderów CNF (cnf.CNFEncoder)
+    '''
+    
+    def setUp(self):
+        self.parser = DefaultLogicExprParser(SymbolicAlphabetMap())
+    
+    def _dnf(self, n):
+        '''
+        formuła (a0 & b0) | (a1 & b1) | ... -> CNF równoważna ma 2^n klauzul
+        '''
+        formula = '(a0 & b0)'
+        for i in range(1, n):
+            formula = '(' + formula + ' | (a%d & b%d))' % (i, i)
+        return formula
+    
+    def _solve(self, encoderClass, formula):
+        vtable = VariableTable()
+        encoder = encoderClass(formula, vtable)
+        solver = CDCLSolver(encoder.encode(), len(vtable))
+        return solver.solve(), encoder, solver
+    
+    def test_linearSize(self):
+        '''
+        kodowanie Tseitina formuły w postaci DNF ma liniową liczbę klauzul
+        '''
+        formula = self.parser.parseString(self._dnf(8))
+        clauses = TseitinCNFEncoder(formula).encode()
+        self.assertTrue(len(clauses) <= 3 * (2 * 8 - 1) + 1)
+        self.assertEqual(len(ClauseTreeCNFEncoder(formula).encode()), 2 ** 8)
+    
+    def test_polarity(self):
+        '''
+        kodowanie Plaisted-Greenbaum generuje mniej klauzul niż Tseitina
+        '''
+        formula = self.parser.parseString('((p | q) & (q => r)) & ~(r & s)')
+        tseitin = TseitinCNFEncoder(formula).encode()
+        pg = PlaistedGreenbaumCNFEncoder(formula).encode()
+        self.assertTrue(len(pg) < len(tseitin))
+    
+    def test_equisatisfiable(self):
+        '''
+        wszystkie kodery dają ten sam wynik, zmienne pomocnicze nie są zmiennymi formuły
+        '''
+        for text, expected in [('((p | q) & ~p) & ~q', False),
+                               ('((p => q) & (q => r)) & (p & ~r)', False),
+                               ('((p <=> ~q) & (q | T)) & ~(p & F)', True),
+                               ('~((p => q) | (q => p))', False)]:
+            formula = self.parser.parseString(text)
+            for encoderClass in (ClauseTreeCNFEncoder, TseitinCNFEncoder,
+                                 PlaistedGreenbaumCNFEncoder):
+                result, encoder, solver = self._solve(encoderClass, formula)
+                self.assertEqual(result, expected, text + ' ' + encoderClass.__name__)
+                if result:
+                    for lit in solver.model:
+                        if encoder.isAuxiliary(abs(lit)):
+                            self.assertTrue(encoder.vtable.name(lit).startswith('_'))
+
+class ResultCacheTestCase(unittest.TestCase):
+    '''
+    Testy pamięci podręcznej wyników weryfikacji (cache.ResultCache)
+    '''
+    
+    def setUp(self):
+        self.parser = DefaultLogicExprParser(SymbolicAlphabetMap())
+        handle, self.path = tempfile.mkstemp(suffix='.db')
+        os.close(handle)
+    
+    def tearDown(self):
+        os.remove(self.path)
+    
+    def _fingerprint(self, text):
+        return fingerprint(self.parser.parseString(text))[0]
+    
+    def test_fingerprint(self):
+        '''
+        odcisk nie zależy od nazw zmiennych i kolejności argumentów operacji przemiennych
+        '''
+        self.assertEqual(self._fingerprint('(p & q) | r'), self._fingerprint('x | (y & z)'))
+        self.assertEqual(self._fingerprint('((p | q) & (~p | q)) | (r & ~r)'),
+                         self._fingerprint('(r & ~r) | ((b | a) & (b | ~a))'))
+        self.assertNotEqual(self._fingerprint('p => (q & p)'),
+                            self._fingerprint('p => (q & q)'))
+        self.assertNotEqual(self._fingerprint('p => q'), self._fingerprint('p & ~q'))
+    
+    def test_roundtrip(self):
+        '''
+        wynik zapisany dla formuły jest odczytywany dla formuły jej równoważnej
+        z dokładnością do nazw zmiennych
+        '''
+        cache = ResultCache(self.path)
+        formula = self.parser.parseString('(p & ~q) | r')
+        cache.store(formula, True, False, {'p': True, 'q': False, 'r': False},
+                    {'p': False, 'q': False, 'r': False})
+        cache.close()
+        
+        cache = ResultCache(self.path)
+        other = self.parser.parseString('c | (a & ~b)')
+        result = cache.lookup(other)
+        self.assertTrue(result is not None)
+        self.assertTrue(result.satisfiable)
+        self.assertFalse(result.valid)
+        self.assertTrue(other.evaluate(result.satValuation))
+        self.assertFalse(other.evaluate(result.falsValuation))
+        self.assertTrue(cache.lookup(self.parser.parseString('c & (a | ~b)')) is None)
+        cache.close()
+    
+    def test_inconsistentWitness(self):
+        '''
+        wpis, którego świadek nie spełnia formuły, jest usuwany
+        '''
+        cache = ResultCache(self.path)
+        formula = self.parser.parseString('p & q')
+        cache.store(formula, True, False, {'p': True, 'q': False}, {'p': False, 'q': False})
+        self.assertTrue(cache.lookup(formula) is None)
+        self.assertEqual(len(cache), 0)
+        cache.close()
+    
+    def test_eviction(self):
+        '''
+        po przekroczeniu limitu usuwane są najdawniej używane wpisy
+        '''
+        cache = ResultCache(self.path, maxEntries=2)
+        first, second, third = [self.parser.parseString(text)
+                                for text in ('p', 'p & q', '(p & q) & r')]
+        cache.store(first, True, False, {'p': True}, {'p': False})
+        cache.store(second, True, False, {'p': True, 'q': True}, {'p': False})
+        self.assertTrue(cache.lookup(first) is not None)
+        cache.store(third, True, False, {'p': True, 'q': True, 'r': True}, {'p': False})
+        self.assertEqual(len(cache), 2)
+        self.assertTrue(cache.lookup(first) is not None)
+        self.assertTrue(cache.lookup(second) is None)
+        self.assertTrue(cache.lookup(third) is not None)
+        cache.close()
+
+class PrattParserTestCase(unittest.TestCase):
+    '''
+    Testy parsera z hierarchią operatorów (pratt.PrattLogicExprParser)
+    '''
+    
+    SYMBOLIC_FORMULAS = [
+        'p & q & r', 'p | q | r & s', 'p => q => r', 'p <=> q <=> r', '~~p', '~ p',
+        '[p & {q}] | (r)', 'Tx & T', 'F=>T', 'p&q',
+        '((p | q) & (~p | q)) | (r & ~r)', 'p & q | r & s => t <=> u'
+    ]
+    
+    WORD_FORMULAS = [
+        'not p and q', 'notp', 'p andq', 'true and x', 'nottrue', 'not true',
+        'and or p', 'p or not not q', 'not', 'p imp q equ r'
+    ]
+    
+    INVALID_FORMULAS = [('(p]', 2), ('p &', 3), ('p q', 2), ('', 0), (')', 0)]
+    
+    def _assertSameFormulas(self, alphabet, formulas):
+        expected = DefaultLogicExprParser(alphabet)
+        parser = PrattLogicExprParser(alphabet)
+        for text in formulas:
+            self.assertTrue(parser.parseString(text) is expected.parseString(text), text)
+    
+    def test_symbolicAlphabet(self):
+        '''
+        parser tworzy te same formuły co parser pyparsing (składnia znakowa)
+        '''
+        self._assertSameFormulas(SymbolicAlphabetMap(), self.SYMBOLIC_FORMULAS)
+    
+    def test_wordAlphabet(self):
+        '''
+        parser tworzy te same formuły co parser pyparsing (składnia słowna)
+        '''
+        self._assertSameFormulas(WordAlphabetMap(), self.WORD_FORMULAS)
+    
+    def test_errorPosition(self):
+        '''
+        błąd składni zgłaszany jest wyjątkiem ParseException z pozycją błędu
+        '''
+        parser = PrattLogicExprParser(SymbolicAlphabetMap())
+        for text, loc in self.INVALID_FORMULAS:
+            try:
+                parser.parseString(text)
+                self.fail(text)
+            except ParseException as err:
+                self.assertEqual(err.loc, loc, text)
+                self.assertEqual(err.column, loc + 1, text)
+    
+    def test_largeFormula(self):
+        '''
+        długa formuła parsowana jest w jednym przebiegu
+        '''
+        text = ' & '.join('(x%d | ~y%d)' % (i, i) for i in range(5000))
+        formula = PrattLogicExprParser(SymbolicAlphabetMap()).parseString(text)
+        self.assertEqual(formula.getRightSubformula().getLeftSubformula().name, 'x4999')
+    
+    def test_deepNesting(self):
+        '''
+        zagnieżdżenie głębsze niż limit rekurencji -> parsowanie i formatowanie
+        bez rekurencji
+        '''
+        depth = 20 * sys.getrecursionlimit()
+        parser = PrattLogicExprParser(SymbolicAlphabetMap())
+        formatter = FormulaFormatter(SymbolicAlphabetMap())
+        
+        formula = parser.parseString('(' * depth + 'p' + ')' * depth)
+        self.assertTrue(formula is parser.parseString('p'))
+        
+        formula = parser.parseString('~' * depth + 'p')
+        self.assertEqual(formatter.formula2str(formula), '~' * depth + 'p')
+        
+        text = ''.join('(x%d => ' % i for i in range(depth)) + 'y' + ')' * depth
+        formula = parser.parseString(text)
+        self.assertEqual(formatter.formula2str(formula), text)
+        self.assertTrue(formula is parser.parseString(
+            ' => '.join('x%d' % i for i in range(depth)) + ' => y'))
+    
+    def test_deepVerification(self):
+        '''
+        -i z formułą zagnieżdżoną na 10^4 poziomów -> weryfikacja bez rekurencji
+        '''
+        fd, path = tempfile.mkstemp()
+        os.close(fd)
+        try:
+            with open(path, 'w') as f:
+                f.write(' & '.join('x%d' % i for i in range(10000)))
+            interface = Interface()
+            interface.testRun(['-i', path, '-O', TEST_FILE_NAME])
+            self.assertTrue(interface.satisfiable)
+            self.assertFalse(interface.valid)
+        finally:
+            os.remove(path)
+    
+    def test_mappedFile(self):
+        '''
+        plik mapowany do pamięci daje tę samą formułę co łańcuch znaków,
+        błąd składni ma pozycję liczoną od początku pliku
+        '''
+        parser = PrattLogicExprParser(SymbolicAlphabetMap())
+        fd, path = tempfile.mkstemp()
+        os.close(fd)
+        try:
+            text = '\n'.join('(x%d | ~y%d) &' % (i, i) for i in range(1000)) + ' z\n'
+            with open(path, 'w') as f:
+                f.write(text)
+            self.assertTrue(parser.parseFile(path) is parser.parseString(text))
+            
+            with open(path, 'w') as f:
+                f.write('p &\nq &\n  (r | ) & s\n')
+            try:
+                parser.parseFile(path)
+                self.fail()
+            except ParseException as err:
+                self.assertEqual(err.loc, 15)
+                self.assertEqual(err.lineno, 3)
+                self.assertEqual(err.line, '  (r | ) & s')
+                self.assertEqual(err.column, 8)
+                self.assertTrue('(line:3, col:8)' in str(err))
+            
+            open(path, 'w').close()
+            self.assertRaises(ParseException, parser.parseFile, path)
+        finally:
+            os.remove(path)
+
+class FormulaStreamTestCase(unittest.TestCase):
+    '''
+    Testy strumieniowego wczytywania wielu formuł (streams.FormulaStream)
+    '''
+    
+    def test_records(self):
+        '''
+        separator rozcięty między kawałki pliku, puste rekordy są pomijane
+        '''
+        text = 'p & q;;;;~p;;  ;;(p => q);;'
+        for chunkSize in (1, 2, 3, 5, 64):
+            records = list(readRecords(StringIO(text), ';;', chunkSize))
+            self.assertEqual(records, ['p & q', '~p', '(p => q)'], str(chunkSize))
+    
+    def test_parseErrors(self):
+        '''
+        błąd składni jednego rekordu nie przerywa czytania pozostałych
+        '''
+        parser = PrattLogicExprParser(SymbolicAlphabetMap())
+        records = list(parser.parseStream(StringIO('p & q\n(p | \n~p\n')))
+        self.assertEqual([r.number for r in records], [1, 2, 3])
+        self.assertEqual([r.isValid() for r in records], [True, False, True])
+        self.assertEqual(records[1].error.loc, 5)
+        self.assertTrue(records[2].formula is parser.parseString('~p'))
+        formulas = list(parser.parseStream(StringIO('p\n&\nq')).formulas())
+        self.assertEqual(len(formulas), 2)
+    
+    def test_batch(self):
+        '''
+        opcja -b -> wynik każdej formuły z pliku w osobnej linii
+        '''
+        handle, inputPath = tempfile.mkstemp()
+        os.close(handle)
+        handle, outputPath = tempfile.mkstemp()
+        os.close(handle)
+        try:
+            with open(inputPath, 'w') as f:
+                f.write('p & ~p\np | ~p\n(p &\np => q\n')
+            Interface().testRun(['-b', inputPath, '-o', outputPath])
+            with open(outputPath) as f:
+                lines = f.read().splitlines()
+        finally:
+            os.remove(inputPath)
+            os.remove(outputPath)
+        self.assertEqual(len(lines), 4)
+        self.assertEqual(lines[0], '1: Spełnialna: NIE, Tautologia: NIE')
+        self.assertEqual(lines[1], '2: Spełnialna: TAK, Tautologia: TAK')
+        self.assertTrue(lines[2].startswith('3: Niepoprawna składnia'))
+        self.assertEqual(lines[3], '4: Spełnialna: TAK, Tautologia: NIE')
+
+class DimacsTestCase(unittest.TestCase):
+    '''
+    Testy odczytu i zapisu formatu DIMACS (dimacs.DimacsReader, dimacs.writeDimacs)
+    '''
+    
+    def setUp(self):
+        handle, self.path = tempfile.mkstemp(suffix='.cnf')
+        os.close(handle)
+    
+    def tearDown(self):
+        os.remove(self.path)
+    
+    def _write(self, text):
+        with open(self.path, 'w') as f:
+            f.write(text)
+    
+    def test_reader(self):
+        '''
+        komentarze, klauzule w kilku liniach, `%` kończy formułę,
+        niezależnie od wielkości kawałków pliku
+        '''
+        self._write('c opis\np cnf 4 3\n1 -2\n 3 0\n-1 0\nc dalej\n2 4 0\n%\n0\n')
+        for chunkSize in (1, 3, 100):
+            clauses = DimacsReader(self.path, chunkSize).read()
+            self.assertEqual(list(clauses), [(1, -2, 3), (-1,), (2, 4)])
+            self.assertEqual(len(clauses), 3)
+            self.assertEqual(clauses.numVars, 4)
+    
+    def test_roundtrip(self):
+        '''
+        klauzule zapisane w formacie DIMACS są odczytywane bez zmian
+        '''
+        store = ClauseStore()
+        for clause in [(1, 2, -3), (-1,), (3, -2), ()]:
+            store.append(clause)
+        with open(self.path, 'w') as f:
+            writeDimacs(f, store, store.numVars, ["test"])
+        clauses = DimacsReader(self.path).read()
+        self.assertEqual(list(clauses), list(store))
+        self.assertEqual(clauses.numVars, 3)
+        self.assertFalse(clauses.isValid())
+    
+    def test_formula(self):
+        '''
+        CNF formuły zapisana w formacie DIMACS ma tę samą spełnialność co formuła
+        '''
+        parser = PrattLogicExprParser(SymbolicAlphabetMap())
+        for text, expected in [('((p => q) & (q => r)) & ~(p => r)', False),
+                               ('(p <=> ~q) & (q | r)', True)]:
+            with open(self.path, 'w') as f:
+                formula2dimacs(f, parser.parseString(text))
+            clauses = DimacsReader(self.path).read()
+            self.assertEqual(CDCLSolver(clauses, clauses.numVars).solve(), expected, text)
+    
+    def test_interface(self):
+        '''
+        opcja -D -> weryfikacja pliku DIMACS silnikiem SAT
+        '''
+        self._write('p cnf 2 2\n1 -1 0\n2 -2 1 0\n')
+        interface = Interface()
+        interface.testRun(['-D', self.path, '-O', TEST_FILE_NAME])
+        self.assertTrue(interface.satisfiable)
+        self.assertTrue(interface.valid)
+
+class ParserCacheTestCase(unittest.TestCase):
+    '''
+    Testy parserów wspólnych dla procesu (parsers.LogicExprParser.forAlphabet)
+    '''
+    
+    def test_sharedParser(self):
+        '''
+        parser tworzony jest raz dla klasy alfabetu
+        '''
+        for parserClass in (DefaultLogicExprParser, PrattLogicExprParser):
+            parser = parserClass.forAlphabet(SymbolicAlphabetMap())
+            self.assertTrue(isinstance(parser, parserClass))
+            self.assertTrue(parser is parserClass.forAlphabet(SymbolicAlphabetMap()))
+            self.assertFalse(parser is parserClass.forAlphabet(WordAlphabetMap()))
+    
+    def test_sharedGrammar(self):
+        '''
+        gramatyka pyparsing kompilowana jest raz dla klasy alfabetu
+        '''
+        first = DefaultLogicExprParser(WordAlphabetMap())
+        second = DefaultLogicExprParser(WordAlphabetMap())
+        self.assertTrue(first.final is second.final)
+        self.assertTrue(first.parseString('p and q') is second.parseString('p and q'))
+    
+    def test_packratCleared(self):
+        '''
+        pamięć podręczna packrat jest pusta po parsowaniu formuły
+        '''
+        parser = DefaultLogicExprParser.forAlphabet(SymbolicAlphabetMap())
+        parser.parseString('(p | q) & ~(r => s) <=> t')
+        self.assertEqual(ParserElement.packrat_cache.__len__(), 0)
+        self.assertRaises(ParseException, parser.parseString, 'p & (q')
+        self.assertEqual(ParserElement.packrat_cache.__len__(), 0)
+
+class SimplifyingFactoryTestCase(unittest.TestCase):
+    '''
+    Testy upraszczania formuł podczas parsowania (formulas.SimplifyingFormulaFactory)
+    '''
+    
+    SIMPLIFIED = [
+        ('~~p', 'p'), ('p & T', 'p'), ('p | F', 'p'), ('p & F', 'F'), ('p | T', 'T'),
+        ('p => p', 'T'), ('T => p', 'p'), ('p => T', 'T'), ('F => p', 'T'),
+        ('p & q & p', 'p & q'), ('p | q | p | F', 'p | q'), ('p & ~p', 'F'),
+        ('(p | q) | ~(p | q)', 'T'), ('(p | q) & r & ~(p | q)', 'F'),
+        ('p <=> p', 'T'), ('p <=> ~p', 'F'), ('T <=> p', 'p'), ('p <=> q', 'p <=> q'),
+        ('(p => q) => (p => q)', 'T')
+    ]
+    
+    EQUIVALENT = [
+        'p => F', 'F <=> p', '~p => p', 'p => ~p', '~(T & ~~q) | p & T & p',
+        '(p & ~q) <=> (p & ~q) <=> r', 'p => q => F => r', '~~~(p | F) & q'
+    ]
+    
+    def setUp(self):
+        self.plain = PrattLogicExprParser(SymbolicAlphabetMap())
+        self.parser = PrattLogicExprParser(SymbolicAlphabetMap(), SimplifyingFormulaFactory)
+    
+    def test_simplified(self):
+        '''
+        stałe, podwójne negacje, powtórzenia i pary x, ~x są usuwane
+        '''
+        for text, expected in self.SIMPLIFIED:
+            self.assertTrue(self.parser.parseString(text) is self.plain.parseString(expected),
+                            text)
+        self.assertTrue(self.parser.parseString('~p') is LogicVariable('p', True))
+        self.assertTrue(self.parser.parseString('p => F') is LogicVariable('p', True))
+    
+    def test_equivalent(self):
+        '''
+        uproszczona formuła ma tę samą wartość przy każdym wartościowaniu
+        '''
+        for text in self.EQUIVALENT:
+            simplified = self.parser.parseString(text)
+            formula = self.plain.parseString(text)
+            for values in itertools.product((False, True), repeat=3):
+                valuation = dict(zip('pqr', values))
+                self.assertEqual(simplified.evaluate(valuation), formula.evaluate(valuation),
+                                 text)
+    
+    def test_pyparsingFactory(self):
+        '''
+        parser pyparsing z fabryką upraszczającą tworzy te same formuły
+        '''
+        parser = DefaultLogicExprParser(SymbolicAlphabetMap(), SimplifyingFormulaFactory)
+        self.assertFalse(parser.final is DefaultLogicExprParser(SymbolicAlphabetMap()).final)
+        for text, _ in self.SIMPLIFIED:
+            self.assertTrue(parser.parseString(text) is self.parser.parseString(text), text)
+    
+    def test_interface(self):
+        '''
+        opcja -s, raport zawiera formułę wejściową
+        '''
+        interface = Interface()
+        interface.testRun(['-s', '-f', 'p | ~(p & T)', '-O', TEST_FILE_NAME])
+        self.assertTrue(interface.formula is LogicTruth())
+        self.assertTrue(interface.valid)
+        self.assertEqual(interface.getOriginalFormula(), 'p | ~(p & T)')
+
+class SerializationTestCase(unittest.TestCase):
+    '''
+    Testy binarnego formatu formuł (serialization)
+    '''
+    
+    FORMULAS = [
+        '((p | q) & (~p | q)) | ((p | q) & r)', 'T & ~F', '~~p => (q <=> ~r)',
+        'p & q | r & s => t <=> u', 'x_1 | ~[y_2 & {z}]'
+    ]
+    
+    def setUp(self):
+        self.parser = PrattLogicExprParser(SymbolicAlphabetMap())
+        fd, self.path = tempfile.mkstemp()
+        os.close(fd)
+    
+    def tearDown(self):
+        os.remove(self.path)
+    
+    def test_roundtrip(self):
+        '''
+        wczytana formuła jest tym samym obiektem co zapisana
+        '''
+        for text in self.FORMULAS:
+            formula = self.parser.parseString(text)
+            dumpFormula(self.path, formula)
+            self.assertTrue(isFormulaFile(self.path))
+            self.assertTrue(loadFormula(self.path) is formula, text)
+    
+    def test_sharedSubformulas(self):
+        '''
+        wspólne podformuły zapisywane są raz
+        '''
+        text = '(p & q) | (p & q) | (p & q)'
+        buf = StringIO()
+        writeFormula(buf, self.parser.parseString(text))
+        # p, q, p & q, dwa węzły OR
+        self.assertTrue(readFormula(buf.getvalue()) is self.parser.parseString(text))
+        self.assertEqual(struct.unpack('<I', buf.getvalue()[16:20])[0], 5)
+    
+    def test_deepNesting(self):
+        '''
+        zapis i odczyt formuły głębszej niż limit rekurencji
+        '''
+        depth = 20 * sys.getrecursionlimit()
+        formula = self.parser.parseString(
+            ' => '.join('x%d' % i for i in range(depth)) + ' => y')
+        dumpFormula(self.path, formula)
+        self.assertTrue(loadFormula(self.path) is formula)
+    
+    def test_invalidFile(self):
+        '''
+        plik tekstowy i obcięty plik binarny są odrzucane
+        '''
+        with open(self.path, 'w') as f:
+            f.write('p & q')
+        self.assertFalse(isFormulaFile(self.path))
+        self.assertRaises(FormulaFormatError, loadFormula, self.path)
+        buf = StringIO()
+        writeFormula(buf, self.parser.parseString(self.FORMULAS[0]))
+        self.assertRaises(FormulaFormatError, readFormula, buf.getvalue()[:-4])
+    
+    def test_interface(self):
+        '''
+        --write-binary zapisuje formułę, -i wczytuje plik binarny bez parsowania
+        '''
+        interface = Interface()
+        interface.testRun(['-f', self.FORMULAS[2], '--write-binary', self.path])
+        formula = interface.formula
+        interface = Interface()
+        interface.testRun(['-i', self.path, '-O', TEST_FILE_NAME])
+        self.assertTrue(interface.formula is formula)
+        self.assertTrue(interface.satisfiable)
+        self.assertFalse(interface.valid)
+
+class DefinitionsTestCase(unittest.TestCase):
+    '''
+    Testy definicji nazwanych podformuł (wspólne podformuły, formuła jako DAG)
+    '''
+    
+    TEXTS = [
+        ('x := p & q; x => (x | r)', '(p & q) => ((p & q) | r)', SymbolicAlphabetMap),
+        ('x := p; y := ~x | q; y & ~y', '(~p | q) & ~(~p | q)', SymbolicAlphabetMap),
+        ('let x be p and q in x imp (x or r)', '(p and q) imp ((p and q) or r)',
+         WordAlphabetMap),
+        ('let lettuce be p in let x be not lettuce in x and (x or q)',
+         'not p and (not p or q)', WordAlphabetMap)
+    ]
+    
+    ERRORS = [
+        ('x := p & q x', SymbolicAlphabetMap),
+        ('x := p; x := q; x', SymbolicAlphabetMap),
+        ('T := p; T', SymbolicAlphabetMap),
+        ('x := p & q;', SymbolicAlphabetMap),
+        ('let not be p in p', WordAlphabetMap),
+        ('let x be p in let x be q in x', WordAlphabetMap)
+    ]
+    
+    def _chain(self, depth):
+        '''
+        formuła definiowana łańcuchem depth definicji, rozwinięta do drzewa
+        ma ponad 2^depth węzłów
+        '''
+        return "d0 := p;" + "".join("d%d := (d%d | q%d) & ~(d%d & r);" % (i, i - 1, i, i - 1)
+                                     for i in range(1, depth + 1)) + \
+            "d%d => (d%d | s)" % (depth, depth)
+    
+    def test_definitions(self):
+        '''
+        nazwa definicji oznacza zdefiniowaną formułę, oba parsery tworzą tę samą formułę
+        '''
+        for text, expanded, alphabetClass in self.TEXTS:
+            pratt = PrattLogicExprParser(alphabetClass())
+            formula = pratt.parseString(text)
+            self.assertTrue(formula is pratt.parseString(expanded), text)
+            self.assertTrue(formula is DefaultLogicExprParser(alphabetClass()).parseString(text),
+                            text)
+        formula = PrattLogicExprParser(SymbolicAlphabetMap()).parseString('x := p & q; x => x')
+        self.assertTrue(formula.subformulas[0] is formula.subformulas[1])
+    
+    def test_errors(self):
+        '''
+        brak końca definicji, powtórzona albo zarezerwowana nazwa są błędami składni
+        '''
+        for text, alphabetClass in self.ERRORS:
+            for parser in (PrattLogicExprParser(alphabetClass()),
+                           DefaultLogicExprParser(alphabetClass())):
+                self.assertRaises(ParseException, parser.parseString, text)
+        # definicje nie przechodzą do następnej formuły
+        parser = DefaultLogicExprParser(SymbolicAlphabetMap())
+        self.assertTrue(parser.parseString('x := p; x') is parser.parseString('p'))
+        self.assertFalse(parser.parseString('x') is parser.parseString('p'))
+    
+    def test_sharedFormula(self):
+        '''
+        formuła rozwinięta do drzewa wykładniczej wielkości jest parsowana,
+        kodowana (Tseitin) i formatowana w czasie liniowym względem tekstu
+        '''
+        text = self._chain(40)
+        formula = PrattLogicExprParser(SymbolicAlphabetMap()).parseString(text)
+        self.assertTrue(formula is DefaultLogicExprParser(SymbolicAlphabetMap()).parseString(text))
+        clauses = TseitinCNFEncoder(formula).encode()
+        self.assertTrue(len(clauses) < 10 * 40)
+        formatter = FormulaFormatter(SymbolicAlphabetMap())
+        formatted = formatter.formula2defs(formula)
+        self.assertTrue(len(formatted) < 2 * len(text))
+        self.assertTrue(PrattLogicExprParser(SymbolicAlphabetMap()).parseString(formatted)
+                        is formula)
+    
+    def test_formatting(self):
+        '''
+        formatowanie z definicjami i ponowne parsowanie daje tę samą formułę,
+        nazwy definicji nie kolidują ze zmiennymi, mała formuła formatowana jest bez definicji
+        '''
+        for text, _, alphabetClass in self.TEXTS + [('d1 := d2 & d3; d1 | ~d1 | d1 & d4', None,
+                                                     SymbolicAlphabetMap)]:
+            parser = PrattLogicExprParser(alphabetClass())
+            formatter = FormulaFormatter(alphabetClass())
+            formula = parser.parseString(text)
+            self.assertTrue(parser.parseString(formatter.formula2defs(formula)) is formula, text)
+            self.assertEqual(formatter.formula2defs(formula, 100), formatter.formula2str(formula))
+        self.assertEqual(formatter.formula2defs(parser.parseString('p & q')), '(p & q)')
+    
+    def test_verification(self):
+        '''
+        łańcuch równoważności z definicjami weryfikowany jest na DAG, podformuły klauzul
+        w raporcie drzewa konwersji wypisywane są nazwami definicji
+        '''
+        text = "x1 := (p | q) <=> (r | s);" + "".join(
+            "x%d := (x%d <=> (a%d | x%d));" % (i, i - 1, i, i - 1) for i in range(2, 7)) + "x6"
+        formula = PrattLogicExprParser(SymbolicAlphabetMap()).parseString(text)
+        formatter = FormulaFormatter(SymbolicAlphabetMap())
+        nodeFormat = "[{nodeId}] {clauseUnconvertedFomrulas}"
+        for verifier in (SatisfiabilityVerifier(formula), ValidityVerifier(formula)):
+            # bez komunikatów DEBUG węzły drzewa nie są zamieniane na tekst
+            nodeStr = ClauseBinTreeNode.__str__
+            ClauseBinTreeNode.__str__ = lambda node: self.fail(node.ID)
+            try:
+                verifier.verifyFormula()
+            finally:
+                ClauseBinTreeNode.__str__ = nodeStr
+            raport = verifier.generateRaport(formatter, "{tree}", nodeFormat)
+            lines = raport.splitlines()
+            self.assertTrue(lines[0].startswith('d1 := '))
+            self.assertTrue(max(len(line) for line in lines[1:]) < 4 * len(text))
+            self.assertEqual(len(lines), len(verifier.tree) + 1)
+            self.assertTrue(re.match(r'\[C\] \(d\d+ <=> d\d+\)$', lines[1]), lines[1])
+        self.assertTrue(verifier.success is False)
+    
+    def test_interface(self):
+        '''
+        formuła z definicjami podana opcją -f
+        '''
+        interface = Interface()
+        interface.testRun(['-a', 'WORD', '-f', 'let x be p and q in x imp (x or r)',
+                           '-O', TEST_FILE_NAME])
+        self.assertTrue(interface.valid)
+
+class StartupTestCase(unittest.TestCase):
+    '''
+    Testy leniwego importu modułów przy uruchamianiu programu
+    
+    Program uruchamiany jest w osobnym procesie. Czas uruchamiania mierzy
+    skrypt bin/liprojekt-startup (pomiar nie jest testem).
+    '''
+    
+    LAZY_MODULES = ['pyparsing', 'liprojekt.conversion.formulas',
+                    'liprojekt.conversion.verification', 'liprojekt.parsing.pratt',
+                    'multiprocessing', 'sqlite3']
+    '''
+    moduły, które nie są potrzebne do wypisania legendy (opcja -l)
+    '''
+    
+    LEGEND_SCRIPT = '''
+import sys
+from liprojekt.interface.interface import Interface
+try:
+    Interface().testRun(['-l', 'WORD'])
+except SystemExit:
+    pass
+print(' '.join(name for name, module in sys.modules.items() if module is not None))
+'''
+    
+    def _run(self, args):
+        '''
+        uruchom interpreter z argumentami args, zwraca wyjście
+        '''
+        env = dict(os.environ)
+        env['PYTHONPATH'] = os.path.dirname(os.path.dirname(os.path.dirname(
+            os.path.abspath(__file__))))
+        process = subprocess.Popen([sys.executable] + args, env=env,
+                                   stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+        out, _ = process.communicate()
+        self.assertEqual(process.returncode, 0)
+        return out
+    
+    def test_lazyImports(self):
+        '''
+        legenda alfabetu nie importuje parsera ani modułów weryfikacji
+        '''
+        out = self._run(['-c', self.LEGEND_SCRIPT])
+        modules = set(out.splitlines()[-1].split())
+        for name in self.LAZY_MODULES:
+            self.assertFalse(name in modules, name)
+    
+    def test_lazyTables(self):
+        '''
+        pełne nazwy w tablicach Interface wskazują istniejące klasy, wartości
+        domyślne są takie same jak w modułach weryfikacji
+        '''
+        for table in (Interface.ENGINES, Interface.ENCODERS, Interface.PARALLEL_VERIFIERS,
+                      Interface.BRANCHING):
+            for path in table.values():
+                self.assertTrue(path is None or isinstance(importObject(path), type), path)
+        self.assertEqual(Interface.STRATEGIES,
+                         (FormulaVerifier.BREADTH_FIRST, FormulaVerifier.DEPTH_FIRST))
+        self.assertEqual(Interface.CACHE_PATH, ResultCache.DEFAULT_PATH)
+        self.assertEqual(Interface.CACHE_SIZE, ResultCache.DEFAULT_MAX_ENTRIES)
+        self.assertEqual(Interface.TRANSPOSITION_SIZE, TranspositionTable.DEFAULT_MAX_ENTRIES)
+
 def runTests():
     '''
     Uruchom pulę testów, zapisz wyniki to pliku TEST_FILE_NAME
@@ -396,5 +1984,52 @@ def runTests():
     suite_AT = unittest.TestLoader().loadTestsFromTestCase(RepresentativeAdditionalTautologyTestCase)
     suite_RSNT = unittest.TestLoader().loadTestsFromTestCase(RepresentativeSatisfiableNotTautologyTestCase)
     suite_RNS = unittest.TestLoader().loadTestsFromTestCase(RepresentativeNotSatisfiableTestCase)
-    alltests = unittest.TestSuite([suite_RT, suite_AT, suite_RSNT, suite_RNS])
+    suite_CS = unittest.TestLoader().loadTestsFromTestCase(ClauseSharingTestCase)
+    suite_FS = unittest.TestLoader().loadTestsFromTestCase(FormulaSharingTestCase)
+    suite_PRP = unittest.TestLoader().loadTestsFromTestCase(PropagationTestCase)
+    suite_BP = unittest.TestSuite(
+        [unittest.TestLoader().loadTestsFromTestCase(testCase) for testCase in 
+         (BranchingTautologyTestCase, BranchingAdditionalTautologyTestCase,
+          BranchingSatisfiableNotTautologyTestCase, BranchingNotSatisfiableTestCase,
+          BranchingPolicyTestCase)])
+    suite_TT = unittest.TestLoader().loadTestsFromTestCase(TranspositionTestCase)
+    suite_LE = unittest.TestLoader().loadTestsFromTestCase(LiteralEncodingTestCase)
+    suite_DPLL = unittest.TestSuite(
+        [unittest.TestLoader().loadTestsFromTestCase(testCase) for testCase in 
+         (DPLLTautologyTestCase, DPLLAdditionalTautologyTestCase,
+          DPLLSatisfiableNotTautologyTestCase, DPLLNotSatisfiableTestCase)])
+    suite_CDCL = unittest.TestSuite(
+        [unittest.TestLoader().loadTestsFromTestCase(testCase) for testCase in 
+         (CDCLTautologyTestCase, CDCLAdditionalTautologyTestCase,
+          CDCLSatisfiableNotTautologyTestCase, CDCLNotSatisfiableTestCase)])
+    suite_DFS = unittest.TestSuite(
+        [unittest.TestLoader().loadTestsFromTestCase(testCase) for testCase in 
+         (DFSTautologyTestCase, DFSAdditionalTautologyTestCase,
+          DFSSatisfiableNotTautologyTestCase, DFSNotSatisfiableTestCase)])
+    suite_SS = unittest.TestLoader().loadTestsFromTestCase(SearchStrategyTestCase)
+    suite_CV = unittest.TestLoader().loadTestsFromTestCase(CombinedVerifierTestCase)
+    suite_PAR = unittest.TestSuite(
+        [unittest.TestLoader().loadTestsFromTestCase(testCase) for testCase in 
+         (ParallelTautologyTestCase, ParallelAdditionalTautologyTestCase,
+          ParallelSatisfiableNotTautologyTestCase, ParallelNotSatisfiableTestCase,
+          ParallelVerifierTestCase)])
+    suite_SAT = unittest.TestSuite(
+        [unittest.TestLoader().loadTestsFromTestCase(testCase) for testCase in 
+         (SatSolverTestCase, CDCLSolverTestCase)])
+    suite_CNF = unittest.TestLoader().loadTestsFromTestCase(CNFEncoderTestCase)
+    suite_RC = unittest.TestLoader().loadTestsFromTestCase(ResultCacheTestCase)
+    suite_PP = unittest.TestLoader().loadTestsFromTestCase(PrattParserTestCase)
+    suite_FST = unittest.TestLoader().loadTestsFromTestCase(FormulaStreamTestCase)
+    suite_DIM = unittest.TestLoader().loadTestsFromTestCase(DimacsTestCase)
+    suite_PC = unittest.TestLoader().loadTestsFromTestCase(ParserCacheTestCase)
+    suite_SF = unittest.TestLoader().loadTestsFromTestCase(SimplifyingFactoryTestCase)
+    suite_SER = unittest.TestLoader().loadTestsFromTestCase(SerializationTestCase)
+    suite_DEF = unittest.TestLoader().loadTestsFromTestCase(DefinitionsTestCase)
+    suite_ST = unittest.TestLoader().loadTestsFromTestCase(StartupTestCase)
+    alltests = unittest.TestSuite([suite_RT, suite_AT, suite_RSNT, suite_RNS, suite_CS,
+                                   suite_FS, suite_LE, suite_DPLL, suite_CDCL, suite_SAT,
+                                   suite_CNF, suite_DFS, suite_SS, suite_CV, suite_PAR,
+                                   suite_RC, suite_PP, suite_FST, suite_DIM, suite_PC,
+                                   suite_SF, suite_SER, suite_DEF, suite_PRP, suite_BP,
+                                   suite_TT, suite_ST])
     unittest.TextTestRunner(verbosity=3).run(alltests)